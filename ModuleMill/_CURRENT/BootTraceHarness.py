@@ -7,17 +7,24 @@ Deterministic diagnostics for ModuleKit bootstrapping docs:
 - validates DefaultLoad module doc pointers for Manifest + QuickRef
 - prints a traceable boot decision flow
 - optionally checks remote URL reachability
+- reads the bootstrapping docs from the git index or any commit (--staged / --rev) without a checkout
 """
 
 from __future__ import annotations
 
 import argparse
+import http.client
+import json
+import os
 import re
-import urllib.error
-import urllib.request
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
 
 
 @dataclass
@@ -27,15 +34,74 @@ class ModuleEntry:
     default_load: str = "no"
     single_emoji_activate: str = "no"
     docs: Dict[str, str] = field(default_factory=dict)
+    aliases: List[str] = field(default_factory=list)
+    mission: str = ""
+    engage_policy: str = ""
+    need_signals: Dict[str, List[str]] = field(default_factory=dict)
+    auto_run_scope: str = ""
+    version: str = ""
+    compatibility: str = ""
 
 
 DOC_KEYS = ("Manifest", "Install", "QuickRef", "MachineManual", "UserGuide")
+NEED_SIGNAL_KEYS = ("Keywords", "Intents", "Formats", "DoNotFireIf")
+# `- Key: value` entry lines; an optional emoji label (for example `🎛️ EngagePolicy`) is dropped.
+REGISTRY_FIELD_RE = re.compile(r"^-\s+(?:[^\w\s`]+\s*)?([A-Za-z]+):\s*(.*)$")
+REGISTRY_SUBFIELD_RE = re.compile(r"^\s+-\s+([A-Za-z]+):\s*(.*)$")
+URL_CHECK_WORKERS = 8
+URL_CACHE_DEFAULT = Path(".modulemill_cache") / "boottrace-url-cache.json"
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+# Some hosts reject or mishandle HEAD; retry those with GET.
+HEAD_FALLBACK_STATUSES = {403, 405, 501}
+MAX_REDIRECTS = 5
 
 
 def read_text(path: Path) -> str:
     return path.read_text(encoding="utf-8", errors="replace")
 
 
+class GitError(RuntimeError):
+    """
+    A git read failed. trace_boot callers can catch it; only main() turns it into an exit message.
+    """
+
+
+def read_git_texts(work_dir: Path, paths: List[Path], rev: Optional[str]) -> Dict[Path, Optional[str]]:
+    """
+    Reads paths from a commit (`rev`) or the index (`rev=None`) through one `git cat-file --batch`
+    call, in the worktree that contains work_dir (or its nearest existing parent). Paths missing
+    from that snapshot map to None.
+    """
+    cwd = next((d for d in (work_dir, *work_dir.parents) if d.is_dir()), work_dir)
+    try:
+        top = subprocess.run(
+            ["git", "-C", str(cwd), "rev-parse", "--show-toplevel"], capture_output=True, check=True, text=True
+        ).stdout.strip()
+        names = [f"{rev or ''}:{Path(os.path.relpath(p.resolve(), top)).as_posix()}" for p in paths]
+        proc = subprocess.run(
+            ["git", "-C", top, "cat-file", "--batch"],
+            input="".join(f"{name}\n" for name in names).encode("utf-8"),
+            capture_output=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError) as exc:
+        raise GitError(f"git failed: {exc}") from exc
+    out = proc.stdout
+    pos = 0
+    texts: Dict[Path, Optional[str]] = {}
+    for path in paths:
+        end = out.index(b"\n", pos)
+        header = out[pos:end].split()
+        pos = end + 1
+        if len(header) != 3 or header[1] != b"blob":
+            texts[path] = None
+            continue
+        size = int(header[2])
+        texts[path] = out[pos : pos + size].decode("utf-8", errors="replace")
+        pos += size + 1
+    return texts
+
+
 def extract_boot_warning_from_global(text: str) -> str:
     patterns = (
         r'Reply 1:\s*"([^"]+)"',
@@ -74,51 +140,61 @@ def extract_supported_modules(global_text: str) -> List[str]:
 
 
 def parse_registry_modules(text: str) -> List[ModuleEntry]:
-    parts = re.split(r"^###\s+Module:\s*", text, flags=re.MULTILINE)
+    """
+    One pass over the registry: `### Module:` opens an entry, top-level `- Key: value` lines
+    fill its KitRegistry §1 schema fields, and indented `- Key: value` lines belong to the
+    last list field (Docs or NeedSignals). A `## ` heading closes the entry.
+    """
     entries: List[ModuleEntry] = []
-    if len(parts) <= 1:
-        return entries
-
-    for block in parts[1:]:
-        lines = block.splitlines()
-        if not lines:
+    entry = None
+    parent = ""
+
+    for raw in text.splitlines():
+        if raw.startswith("### Module:"):
+            entry = ModuleEntry(name=raw[len("### Module:") :].strip())
+            entries.append(entry)
+            parent = ""
+            continue
+        if entry is None:
+            continue
+        if raw.startswith("## "):
+            entry = None
             continue
 
-        name = lines[0].strip()
-        entry = ModuleEntry(name=name)
-        in_docs = False
-
-        for raw in lines[1:]:
-            if raw.startswith("## "):
-                break
-
-            line = raw.strip()
-            if not line:
-                continue
-
-            if line.startswith("- Docs:"):
-                in_docs = True
-                continue
-
-            if in_docs:
-                m_doc = re.match(r"^\s*-\s*(\w+):\s*`([^`]+)`\s*$", line)
-                if m_doc and m_doc.group(1) in DOC_KEYS:
-                    entry.docs[m_doc.group(1)] = m_doc.group(2).strip()
-                    continue
-
-                if line.startswith("- ") and not line.startswith("- Version:"):
-                    in_docs = False
-                elif line.startswith("- Version:"):
-                    in_docs = False
-
-            if line.startswith("- ModuleEmoji:"):
-                entry.emoji = extract_backtick_value(line)
-            elif line.startswith("- DefaultLoad:"):
-                entry.default_load = extract_backtick_value(line).lower()
-            elif line.startswith("- SingleEmojiActivate:"):
-                entry.single_emoji_activate = extract_backtick_value(line).lower()
+        m_sub = REGISTRY_SUBFIELD_RE.match(raw)
+        if m_sub:
+            key, value = m_sub.group(1), m_sub.group(2)
+            if parent == "Docs" and key in DOC_KEYS:
+                url = extract_backtick_value(value)
+                if url:
+                    entry.docs[key] = url
+            elif parent == "NeedSignals":
+                entry.need_signals[key] = extract_backtick_values(value)
+            continue
 
-        entries.append(entry)
+        m_field = REGISTRY_FIELD_RE.match(raw.strip())
+        if not m_field:
+            continue
+        key, value = m_field.group(1), m_field.group(2).strip()
+        parent = key
+        if key == "ModuleEmoji":
+            entry.emoji = extract_backtick_value(value)
+        elif key == "ModuleAliases":
+            entry.aliases = extract_backtick_values(value)
+        elif key == "Mission":
+            entry.mission = value
+        elif key == "EngagePolicy":
+            entry.engage_policy = extract_backtick_value(value)
+        elif key == "AutoRunScope":
+            entry.auto_run_scope = extract_backtick_value(value)
+        elif key == "DefaultLoad":
+            entry.default_load = extract_backtick_value(value).lower()
+        elif key == "SingleEmojiActivate":
+            entry.single_emoji_activate = extract_backtick_value(value).lower()
+        elif key == "Version":
+            entry.version = extract_backtick_value(value)
+        elif key == "Compatibility":
+            entry.compatibility = strip_outer_backticks(value)
 
     return entries
 
@@ -128,63 +204,266 @@ def extract_backtick_value(line: str) -> str:
     return m.group(1).strip() if m else ""
 
 
-def check_url(url: str, timeout: int) -> Tuple[bool, str]:
-    req = urllib.request.Request(url=url, method="GET")
+def extract_backtick_values(line: str) -> List[str]:
+    return [v.strip() for v in re.findall(r"`([^`]+)`", line) if v.strip()]
+
+
+def strip_outer_backticks(value: str) -> str:
+    # Compatibility prose may itself contain inline code, so only the wrapping pair is removed.
+    if len(value) >= 2 and value.startswith("`") and value.endswith("`"):
+        return value[1:-1].strip()
+    return value
+
+
+class UrlCache:
+    """
+    On-disk ETag / Last-Modified validators per URL, so repeat runs send conditional requests.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.entries: Dict[str, Dict[str, str]] = {}
+        self.lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Path) -> "UrlCache":
+        cache = cls(path)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cache
+        if isinstance(data, dict):
+            cache.entries = {k: v for k, v in data.items() if isinstance(v, dict)}
+        return cache
+
+    def get(self, url: str) -> Dict[str, str]:
+        with self.lock:
+            return dict(self.entries.get(url, {}))
+
+    def put(self, url: str, validators: Dict[str, str]) -> None:
+        with self.lock:
+            if validators:
+                self.entries[url] = validators
+            else:
+                self.entries.pop(url, None)
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # A unique temp file per writer, so concurrent runs never rename each other's file away.
+        fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                fh.write(json.dumps(self.entries, indent=2, sort_keys=True))
+            os.replace(tmp_name, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+
+
+class HostConnections:
+    """
+    One persistent HTTP(S) connection per host, owned by a single worker thread.
+    """
+
+    def __init__(self, timeout: float) -> None:
+        self.timeout = timeout
+        self.conns: Dict[Tuple[str, str], http.client.HTTPConnection] = {}
+
+    def _connect(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        if scheme == "https":
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout)
+        return http.client.HTTPConnection(netloc, timeout=self.timeout)
+
+    def request(self, method: str, url: str, headers: Dict[str, str]) -> Tuple[int, Dict[str, str]]:
+        parts = urlsplit(url)
+        if parts.scheme not in {"http", "https"}:
+            raise ValueError(f"unsupported URL scheme '{parts.scheme}'")
+        key = (parts.scheme, parts.netloc)
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+
+        # A kept-alive connection may have been closed by the server; reconnect once.
+        for attempt in range(2):
+            conn = self.conns.get(key)
+            if conn is None:
+                conn = self._connect(parts.scheme, parts.netloc)
+                self.conns[key] = conn
+            try:
+                conn.request(method, target, headers=headers)
+                resp = conn.getresponse()
+                resp.read()
+                if resp.will_close:
+                    conn.close()
+                    self.conns.pop(key, None)
+                return resp.status, {k.lower(): v for k, v in resp.getheaders()}
+            except (http.client.HTTPException, OSError) as exc:
+                # Never keep a connection that failed mid-request, timeouts included.
+                conn.close()
+                self.conns.pop(key, None)
+                # A timed-out host is not a stale keep-alive; retrying would only double the wait.
+                if attempt or isinstance(exc, TimeoutError):
+                    raise
+        raise RuntimeError("unreachable")
+
+    def close(self) -> None:
+        for conn in self.conns.values():
+            conn.close()
+        self.conns.clear()
+
+
+def fetch_status(conns: HostConnections, method: str, url: str, headers: Dict[str, str]) -> Tuple[int, Dict[str, str]]:
+    target = url
+    for _ in range(MAX_REDIRECTS + 1):
+        status, resp_headers = conns.request(method, target, headers)
+        location = resp_headers.get("location")
+        if status not in REDIRECT_STATUSES or not location:
+            return status, resp_headers
+        target = urljoin(target, location)
+    return status, resp_headers
+
+
+def check_url_with(conns: HostConnections, url: str, cache: Optional[UrlCache] = None) -> Tuple[bool, str]:
+    headers = {"User-Agent": "boottrace"}
+    validators = cache.get(url) if cache else {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+
     try:
-        with urllib.request.urlopen(req, timeout=timeout) as resp:
-            return True, str(resp.status)
-    except urllib.error.HTTPError as err:
-        return False, f"HTTP {err.code}"
+        status, resp_headers = fetch_status(conns, "HEAD", url, headers)
+        if status in HEAD_FALLBACK_STATUSES:
+            status, resp_headers = fetch_status(conns, "GET", url, headers)
     except Exception as err:  # pragma: no cover
         return False, f"{type(err).__name__}: {err}"
 
+    if status == 304:
+        return True, "304 not modified"
+    if status >= 400:
+        return False, f"HTTP {status}"
+
+    if cache is not None:
+        fresh: Dict[str, str] = {}
+        if resp_headers.get("etag"):
+            fresh["etag"] = resp_headers["etag"]
+        if resp_headers.get("last-modified"):
+            fresh["last_modified"] = resp_headers["last-modified"]
+        cache.put(url, fresh)
+    return True, str(status)
+
+
+def check_url(url: str, timeout: int) -> Tuple[bool, str]:
+    conns = HostConnections(timeout)
+    try:
+        return check_url_with(conns, url)
+    finally:
+        conns.close()
+
+
+def check_urls(
+    urls: List[str],
+    timeout: float,
+    workers: int = URL_CHECK_WORKERS,
+    cache: Optional[UrlCache] = None,
+) -> Dict[str, Tuple[bool, str]]:
+    """
+    Check URLs on a bounded thread pool. Each worker thread keeps its own per-host
+    keep-alive connections, so URLs on the same host reuse a socket.
+    """
+    local = threading.local()
+    opened: List[HostConnections] = []
+    opened_lock = threading.Lock()
+
+    def worker_conns() -> HostConnections:
+        conns = getattr(local, "conns", None)
+        if conns is None:
+            conns = HostConnections(timeout)
+            local.conns = conns
+            with opened_lock:
+                opened.append(conns)
+        return conns
+
+    def run(url: str) -> Tuple[bool, str]:
+        return check_url_with(worker_conns(), url, cache)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            return dict(zip(urls, pool.map(run, urls)))
+    finally:
+        for conns in opened:
+            conns.close()
+
 
 def collect_all_doc_urls(entries: List[ModuleEntry]) -> List[str]:
-    urls: List[str] = []
+    # dict keeps first-seen order while de-duplicating in O(1) per URL.
+    urls: Dict[str, None] = {}
     for entry in entries:
         for key in DOC_KEYS:
             url = entry.docs.get(key, "").strip()
-            if url and url not in urls:
-                urls.append(url)
-    return urls
+            if url:
+                urls.setdefault(url, None)
+    return list(urls)
 
 
-def main() -> int:
-    ap = argparse.ArgumentParser(prog="boottrace")
-    ap.add_argument(
-        "--repo-root",
-        default=str(Path(__file__).resolve().parents[3]),
-        help="Path to repository root (default: inferred from script location)",
-    )
-    ap.add_argument(
-        "--check-urls",
-        action="store_true",
-        help="Check remote reachability for module doc URLs in KitRegistry",
-    )
-    ap.add_argument(
-        "--timeout",
-        type=int,
-        default=10,
-        help="URL check timeout seconds (default: 10)",
-    )
-    args = ap.parse_args()
+@dataclass
+class BootIssue:
+    rule: str
+    path: Path
+    message: str
 
-    repo_root = Path(args.repo_root).resolve()
-    kitregistry_path = repo_root / "ModKits" / "KitRegistry" / "_CURRENT" / "KitRegistry.md"
-    global_path = repo_root / "ModKits" / "KitRegistry" / "_CURRENT" / "ChatGPT_GlobalInstructions.md"
-    enterprise_path = (
-        repo_root / "ModKits" / "KitRegistry" / "_CURRENT" / "ChatGPT_GlobalInstructions_Enterprise.md"
-    )
 
-    missing = [p for p in (kitregistry_path, global_path, enterprise_path) if not p.exists()]
-    if missing:
-        for path in missing:
-            print(f"ERROR missing file: {path}")
-        return 1
+@dataclass
+class BootTrace:
+    """
+    Result of trace_boot: the parsed boot flow plus every failed check. `missing` is set (and
+    nothing else is) when one of the three bootstrapping docs cannot be read.
+    """
+
+    registry_path: Path
+    global_path: Path
+    enterprise_path: Path
+    missing: List[Path] = field(default_factory=list)
+    standard_boot: str = ""
+    modules: List[ModuleEntry] = field(default_factory=list)
+    default_modules: List[ModuleEntry] = field(default_factory=list)
+    emoji_map: Dict[str, str] = field(default_factory=dict)
+    url_results: Dict[str, Tuple[bool, str]] = field(default_factory=dict)
+    issues: List[BootIssue] = field(default_factory=list)
+
+
+def trace_boot(
+    repo_root: Path,
+    rev: Optional[str] = None,
+    staged: bool = False,
+    check_urls_enabled: bool = False,
+    timeout: float = 10,
+    url_workers: int = URL_CHECK_WORKERS,
+    url_cache: Optional[UrlCache] = None,
+) -> BootTrace:
+    registry_dir = repo_root / "ModKits" / "KitRegistry" / "_CURRENT"
+    trace = BootTrace(
+        registry_dir / "KitRegistry.md",
+        registry_dir / "ChatGPT_GlobalInstructions.md",
+        registry_dir / "ChatGPT_GlobalInstructions_Enterprise.md",
+    )
+    boot_paths = [trace.registry_path, trace.global_path, trace.enterprise_path]
+    if staged or rev:
+        # repo_root is the folder holding the ModKits checkout, which is usually not a git worktree itself.
+        texts = read_git_texts(registry_dir, boot_paths, rev)
+        snapshot = f" (in {rev})" if rev else " (in the git index)"
+    else:
+        texts = {p: read_text(p) if p.exists() else None for p in boot_paths}
+        snapshot = ""
+    trace.missing = [p for p in boot_paths if texts[p] is None]
+    if trace.missing:
+        trace.issues = [BootIssue("missing-file", p, f"missing file: {p}{snapshot}") for p in trace.missing]
+        return trace
 
-    kitregistry_text = read_text(kitregistry_path)
-    global_text = read_text(global_path)
-    enterprise_text = read_text(enterprise_path)
+    kitregistry_text = texts[trace.registry_path]
+    global_text = texts[trace.global_path]
+    enterprise_text = texts[trace.enterprise_path]
 
     registry_boot = extract_boot_warning_from_registry(kitregistry_text)
     standard_boot = extract_boot_warning_from_global(global_text)
@@ -193,61 +472,144 @@ def main() -> int:
     modules = parse_registry_modules(kitregistry_text)
     module_names = [m.name for m in modules]
     default_modules = [m for m in modules if m.default_load == "yes"]
-    emoji_map = {m.emoji: m.name for m in modules if m.emoji}
+    trace.standard_boot = standard_boot
+    trace.modules = modules
+    trace.default_modules = default_modules
+    trace.emoji_map = {m.emoji: m.name for m in modules if m.emoji}
 
     standard_supported = extract_supported_modules(global_text)
     enterprise_supported = extract_supported_modules(enterprise_text)
 
-    issues: List[str] = []
+    issues = trace.issues
+
+    def issue(rule: str, path: Path, message: str) -> None:
+        issues.append(BootIssue(rule, path, message))
+
     if not registry_boot:
-        issues.append("Could not parse boot warning from KitRegistry.md")
+        issue("boot-warning", trace.registry_path, "Could not parse boot warning from KitRegistry.md")
     if not standard_boot:
-        issues.append("Could not parse boot warning from ChatGPT_GlobalInstructions.md")
+        issue("boot-warning", trace.global_path, "Could not parse boot warning from ChatGPT_GlobalInstructions.md")
     if not enterprise_boot:
-        issues.append("Could not parse boot warning from ChatGPT_GlobalInstructions_Enterprise.md")
+        issue("boot-warning", trace.enterprise_path, "Could not parse boot warning from ChatGPT_GlobalInstructions_Enterprise.md")
 
     if registry_boot and standard_boot and registry_boot != standard_boot:
-        issues.append("Boot warning mismatch: KitRegistry vs ChatGPT_GlobalInstructions")
+        issue("boot-warning", trace.global_path, "Boot warning mismatch: KitRegistry vs ChatGPT_GlobalInstructions")
     if registry_boot and enterprise_boot and registry_boot != enterprise_boot:
-        issues.append("Boot warning mismatch: KitRegistry vs ChatGPT_GlobalInstructions_Enterprise")
+        issue("boot-warning", trace.enterprise_path, "Boot warning mismatch: KitRegistry vs ChatGPT_GlobalInstructions_Enterprise")
 
     if not default_modules:
-        issues.append("No DefaultLoad=yes modules found in KitRegistry")
+        issue("default-load", trace.registry_path, "No DefaultLoad=yes modules found in KitRegistry")
 
     for entry in default_modules:
         if "Manifest" not in entry.docs:
-            issues.append(f"DefaultLoad module '{entry.name}' is missing Docs.Manifest")
+            issue("default-load", trace.registry_path, f"DefaultLoad module '{entry.name}' is missing Docs.Manifest")
         if "QuickRef" not in entry.docs:
-            issues.append(f"DefaultLoad module '{entry.name}' is missing Docs.QuickRef")
+            issue("default-load", trace.registry_path, f"DefaultLoad module '{entry.name}' is missing Docs.QuickRef")
 
     if standard_supported:
         registry_set = set(module_names)
         supported_set = set(standard_supported)
         if supported_set != registry_set:
-            issues.append(
+            issue(
+                "supported-modules",
+                trace.global_path,
                 "Supported module list mismatch in ChatGPT_GlobalInstructions.md "
-                f"(global={sorted(supported_set)} registry={sorted(registry_set)})"
+                f"(global={sorted(supported_set)} registry={sorted(registry_set)})",
             )
 
     if enterprise_supported:
         registry_set = set(module_names)
         supported_set = set(enterprise_supported)
         if supported_set != registry_set:
-            issues.append(
+            issue(
+                "supported-modules",
+                trace.enterprise_path,
                 "Supported module list mismatch in ChatGPT_GlobalInstructions_Enterprise.md "
-                f"(enterprise={sorted(supported_set)} registry={sorted(registry_set)})"
+                f"(enterprise={sorted(supported_set)} registry={sorted(registry_set)})",
             )
 
+    if check_urls_enabled:
+        urls = collect_all_doc_urls(modules)
+        trace.url_results = check_urls(urls, timeout=timeout, workers=url_workers, cache=url_cache)
+        for url in urls:
+            ok, status = trace.url_results[url]
+            if not ok:
+                issue("url", trace.registry_path, f"Unreachable doc URL: {url} ({status})")
+
+    return trace
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(prog="boottrace")
+    ap.add_argument(
+        "--repo-root",
+        default=str(Path(__file__).resolve().parents[3]),
+        help="Path to repository root (default: inferred from script location)",
+    )
+    ap.add_argument(
+        "--check-urls",
+        action="store_true",
+        help="Check remote reachability for module doc URLs in KitRegistry",
+    )
+    ap.add_argument(
+        "--timeout",
+        type=int,
+        default=10,
+        help="URL check timeout seconds (default: 10)",
+    )
+    ap.add_argument(
+        "--url-workers",
+        type=int,
+        default=URL_CHECK_WORKERS,
+        help=f"maximum concurrent URL checks (default: {URL_CHECK_WORKERS})",
+    )
+    ap.add_argument(
+        "--url-cache",
+        default=str(URL_CACHE_DEFAULT),
+        help=f"ETag/Last-Modified cache file for conditional URL checks (default: {URL_CACHE_DEFAULT})",
+    )
+    ap.add_argument(
+        "--no-url-cache",
+        action="store_true",
+        help="send unconditional requests and do not update the URL cache",
+    )
+    source = ap.add_mutually_exclusive_group()
+    source.add_argument("--staged", action="store_true", help="read the docs from the git index instead of the working tree")
+    source.add_argument("--rev", metavar="COMMIT", help="read the docs from this git commit instead of the working tree")
+    args = ap.parse_args()
+
+    url_cache = None
+    if args.check_urls and not args.no_url_cache:
+        url_cache = UrlCache.load(Path(args.url_cache))
+    try:
+        trace = trace_boot(
+            Path(args.repo_root).resolve(),
+            rev=args.rev,
+            staged=args.staged,
+            check_urls_enabled=args.check_urls,
+            timeout=args.timeout,
+            url_workers=args.url_workers,
+            url_cache=url_cache,
+        )
+    except GitError as exc:
+        raise SystemExit(str(exc)) from None
+    if url_cache is not None:
+        url_cache.save()
+    if trace.missing:
+        for issue in trace.issues:
+            print(f"ERROR {issue.message}")
+        return 1
+
     print("BootTrace decision flow")
     print("-----------------------")
     print("1) Reply #1 boot warning:")
-    print(f"   \"{standard_boot or '<missing>'}\"")
+    print(f"   \"{trace.standard_boot or '<missing>'}\"")
     print("2) Pre-reply #2 gate:")
     print("   If user sends HALT/cancel/skip modules, suppress auto-boot for this chat.")
     print("3) Reply #2 auto-boot path:")
-    if default_modules:
+    if trace.default_modules:
         print("   Load DefaultLoad=yes modules in this order:")
-        for idx, entry in enumerate(default_modules, start=1):
+        for idx, entry in enumerate(trace.default_modules, start=1):
             manifest = entry.docs.get("Manifest", "<missing>")
             quickref = entry.docs.get("QuickRef", "<missing>")
             print(f"   {idx}. {entry.name}")
@@ -256,26 +618,23 @@ def main() -> int:
     else:
         print("   <none>")
     print("4) Single-emoji activation map:")
-    if emoji_map:
-        for emoji, module in emoji_map.items():
+    if trace.emoji_map:
+        for emoji, module in trace.emoji_map.items():
             print(f"   - {emoji} -> {module}")
     else:
         print("   <none>")
 
     if args.check_urls:
         print("5) URL reachability:")
-        for url in collect_all_doc_urls(modules):
-            ok, status = check_url(url, timeout=args.timeout)
+        for url, (ok, status) in trace.url_results.items():
             label = "OK" if ok else "FAIL"
             print(f"   - {label} {status} {url}")
-            if not ok:
-                issues.append(f"Unreachable doc URL: {url} ({status})")
 
     print("")
-    if issues:
+    if trace.issues:
         print("BootTrace checks: FAIL")
-        for issue in issues:
-            print(f"- {issue}")
+        for issue in trace.issues:
+            print(f"- {issue.message}")
         return 1
 
     print("BootTrace checks: PASS")
@@ -0,0 +1,1054 @@
+#!/usr/bin/env python3
+"""
+ModuleMill benchmark harness
+
+Generates synthetic ModuleKit repos shaped like the real kits and measures the
+compiler against them:
+- `gen`: write one synthetic corpus (N kits + KitRegistry + global instructions)
+- `run`: time lint / extract / BootTrace parsing over a ladder of corpus sizes and save JSON
+- `compare`: diff two saved result files (for example across compiler versions)
+- `emoji`: time the emoji sequence tokenizer against the legacy code-point regex on emoji-dense UserGuides
+- `stub-model`: serve a deterministic OpenAI-compatible chat endpoint for `modulemill regress`
+- `url-stub`: serve doc-URL fixtures for `BootTraceHarness.py --check-urls`, or `--check` the URL checker against them
+- `git-snapshot`: check `BootTraceHarness.py --staged` / `--rev` against a throwaway `ModKits` clone as the working tree, index, and HEAD diverge
+
+Each (size, phase) measurement runs in its own child process so peak RSS is per phase.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import io
+import json
+import platform
+import random
+import re
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import redirect_stdout
+from dataclasses import asdict, dataclass
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+BENCH_SCHEMA_VERSION = 1
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+PHASES = ("lint", "extract", "boottrace")
+# Rule entry points timed during the lint phase. Times are inclusive: lint_manifest_file
+# includes lint_manifest_contract_parity, lint_markdown_file includes the markdown rules.
+LINT_TIMED_FUNCTIONS = (
+    "collect_files",
+    "lint_markdown_file",
+    "lint_manifest_file",
+    "lint_userguide_completeness",
+    "lint_emoji_glossary_contract",
+    "lint_inline_code_emoji_render_safety",
+    "lint_global_instruction_codeblock_size",
+    "lint_manifest_contract_parity",
+)
+EXTRACT_SECTIONS = ("5. Commands", "6. EmojiGlossary", "7. State")
+LIFECYCLE_VERBS = ("load", "activate", "sleep", "unload", "status")
+# Single-codepoint emoji with default emoji presentation (no variation selectors).
+EMOJI_POOL = [chr(cp) for cp in range(0x1F400, 0x1F4FF)]
+# Code-point class the compiler matched before it tokenized whole sequences; kept as the
+# `emoji` baseline. It splits ZWJ, skin-tone, flag and keycap sequences into pieces.
+LEGACY_EMOJI_RE = re.compile(r"[\u2600-\u27BF\U0001F300-\U0001FAFF]")
+LEGACY_VARIATION_SELECTOR_RE = re.compile(r"[\uFE0E\uFE0F]")
+DEFAULT_EMOJI_GUIDES = ("LogKit/_CURRENT/UserGuide.md",)
+# Multi-codepoint sequences mixed into the synthetic emoji-dense guide.
+EMOJI_SEQUENCE_POOL = (
+    "\U0001F575\ufe0f\u200d\u2642\ufe0f",
+    "\U0001F469\U0001F3FD\u200d\U0001F4BB",
+    "\U0001F468\u200d\U0001F469\u200d\U0001F467\u200d\U0001F466",
+    "\U0001F3F3\ufe0f\u200d\U0001F308",
+    "\U0001F1FA\U0001F1F8",
+    "\U0001F1EF\U0001F1F5",
+    "#\ufe0f\u20e3",
+    "1\ufe0f\u20e3",
+    "\U0001F44D\U0001F3FB",
+    "\u2764\ufe0f\u200d\U0001F525",
+    "\U0001F3F4\U000E0067\U000E0062\U000E0073\U000E0063\U000E0074\U000E007F",
+    "\u26A0\ufe0f",
+)
+BOOT_WARNING = "Bench boot warning: modules load on explicit invoke only."
+SCRIPT_DIR = Path(__file__).resolve().parent
+STUB_MODEL_PORT = 8765
+STUB_MAX_REPLY_LINES = 12
+STUB_WORD_RE = re.compile(r"\w{4,}")
+STUB_URL_PORT = 8766
+STUB_URL_ETAG = '"modulemill-v1"'
+STUB_URL_LAST_MODIFIED = "Thu, 12 Feb 2026 00:00:00 GMT"
+
+
+@dataclass
+class CorpusSpec:
+    kits: int = 10
+    userguide_lines: int = 200
+    commands: int = 8
+    glossary: int = 12
+    must_preserve: int = 10
+    state_keys: int = 8
+    seed: int = 0
+
+
+def load_module(name: str, path: Path) -> ModuleType:
+    spec = importlib.util.spec_from_file_location(name, path)
+    if spec is None or spec.loader is None:
+        raise SystemExit(f"Cannot import {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def peak_rss_kib() -> Optional[int]:
+    # Prefer VmHWM on Linux: ru_maxrss survives exec, so a child would report the
+    # parent's (corpus generator's) high-water mark.
+    try:
+        for line in Path("/proc/self/status").read_text(encoding="utf-8").splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes.
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+# ---------------------------------------------------------------------------
+# Corpus generator
+# ---------------------------------------------------------------------------
+
+
+def kit_name(i: int) -> str:
+    return f"BenchKit{i:05d}"
+
+
+def kit_emoji(i: int) -> str:
+    return EMOJI_POOL[i % len(EMOJI_POOL)]
+
+
+def filler_lines(rng: random.Random, count: int, module: str) -> List[str]:
+    words = (
+        "ledger", "capture", "review", "policy", "canvas", "runtime", "signal", "contract",
+        "artifact", "session", "operator", "boundary", "checkpoint", "handoff", "trace",
+    )
+    lines: List[str] = []
+    for n in range(count):
+        body = " ".join(rng.choice(words) for _ in range(12))
+        lines.append(f"- {module} note {n}: {body}.")
+    return lines
+
+
+def kit_terms(spec: CorpusSpec, module: str) -> Dict[str, List[str]]:
+    low = module.lower()
+    glossary = [(EMOJI_POOL[(j * 7) % len(EMOJI_POOL)], f"Feature{j}Alias") for j in range(spec.glossary)]
+    return {
+        "glossary": [f"{emoji}|{term}" for emoji, term in glossary],
+        "phrases": [f"{low} invariant phrase {j}" for j in range(spec.must_preserve)],
+        "runtime": [f"{low} runtime rule {j}" for j in range(max(1, spec.must_preserve // 4))],
+        "state_keys": [f"{low}.key_{j}" for j in range(spec.state_keys)],
+        "commands": [f"{module} {verb}" for verb in LIFECYCLE_VERBS]
+        + [f"{module} action{j}" for j in range(max(0, spec.commands - len(LIFECYCLE_VERBS)))],
+        "aliases": [EMOJI_POOL[(j * 11 + 3) % len(EMOJI_POOL)] for j in range(spec.commands)],
+    }
+
+
+def doc_header(title: str, module: str, role: str, audience: str) -> List[str]:
+    return [f"# {title}", "", f"ModuleID: {module}", "Version: 1.0.0", f"DocRole: {role}", f"Audience: {audience}", ""]
+
+
+def render_userguide(spec: CorpusSpec, module: str, terms: Dict[str, List[str]], rng: random.Random) -> str:
+    lines = doc_header(f"{module} UserGuide", module, "UserGuide", "Users and assistants")
+    lines += ["## 1. What this is", f"{module} is a synthetic benchmark kit.", ""]
+    lines += ["## 2. Mission and scope", "Natural-language intent handling is supported.", ""]
+    lines += ["## 3. Rationale", "Act only at high confidence; ask to clarify at low confidence.", ""]
+    lines += ["## 4. Invariants"] + [f"- {p}" for p in terms["phrases"] + terms["runtime"]] + [""]
+    lines += [
+        "## 5. Commands",
+        "",
+        "| Command | Canon | Aliases | Inputs | Output shape | State effects |",
+        "| --- | --- | --- | --- | --- | --- |",
+    ]
+    for cmd, alias in zip(terms["commands"], terms["aliases"]):
+        lines.append(f"| {cmd.split()[-1]} | `{cmd}` | {alias} | none | short | updates state |")
+    lines += ["", "## 6. EmojiGlossary", "", "| Emoji | Term | Meaning |", "| --- | --- | --- |"]
+    for pair in terms["glossary"]:
+        emoji, term = pair.split("|")
+        lines.append(f"| {emoji} | {term} | Synthetic glossary entry for {term}. |")
+    lines += ["", "## 7. State model"] + [f"- `{key}`: synthetic state value." for key in terms["state_keys"]] + [""]
+    lines += ["## 8. Failure behavior", "Fail closed when required docs are missing.", ""]
+    lines += ["## 9. Examples", "```text", f"{terms['commands'][0]}", "```", ""]
+    lines += ["## 10. Notes"]
+    remaining = max(0, spec.userguide_lines - len(lines))
+    lines += filler_lines(rng, remaining, module)
+    return "\n".join(lines) + "\n"
+
+
+def render_machinemanual(module: str, terms: Dict[str, List[str]]) -> str:
+    lines = doc_header(f"{module} MachineManual", module, "MachineManual", "Assistants")
+    lines += ["## Runtime rules"] + [f"- {r}" for r in terms["runtime"]] + [""]
+    lines += ["## Commands"] + [f"- `{c}` ({a})" for c, a in zip(terms["commands"], terms["aliases"])] + [""]
+    lines += ["## State keys"] + [f"- `{k}`" for k in terms["state_keys"]] + [""]
+    return "\n".join(lines) + "\n"
+
+
+def render_quickref(module: str, terms: Dict[str, List[str]]) -> str:
+    lines = doc_header(f"{module} QuickRef", module, "QuickRefCard", "Users and assistants")
+    lines += ["## Commands"] + [f"- `{c}` {a}" for c, a in zip(terms["commands"], terms["aliases"])] + [""]
+    lines += ["## Runtime"] + [f"- {r}" for r in terms["runtime"]] + [""]
+    return "\n".join(lines) + "\n"
+
+
+def render_install(module: str) -> str:
+    lines = doc_header(f"{module} Install", module, "Install", "Users")
+    lines += ["## Install", f"Load `{module}` from the registry.", ""]
+    return "\n".join(lines) + "\n"
+
+
+def render_manifest(module: str, emoji: str, terms: Dict[str, List[str]]) -> str:
+    must_preserve = [pair.replace("|", "") for pair in terms["glossary"]] + terms["phrases"]
+    lines = [
+        f'module: "{module}"',
+        f'module_emoji: "{emoji}"',
+        f'module_aliases: ["{module.lower()}", "{emoji}"]',
+        'version: "1.0.0"',
+        f'mission: "Synthetic benchmark kit {module}."',
+        "must_preserve:",
+    ]
+    lines += [f'  - "{item}"' for item in must_preserve]
+    lines += ["must_preserve_runtime:"] + [f'  - "{item}"' for item in terms["runtime"]]
+    lines += [
+        'engage_policy: "OFFER"',
+        'intent_policy: "infer_high_confidence"',
+        "single_emoji_activate: true",
+        "",
+        "use_when:",
+        '  - "Benchmark runs"',
+        "",
+        "do_not_use_when:",
+        '  - "Production"',
+        "",
+        "required_inputs:",
+        '  - "User prompt"',
+        "",
+        'response_envelope: "main_plus_microtail"',
+        'failure_mode: "fail_closed_queue_pending"',
+        "",
+        "docs:",
+        '  install: "Install.md"',
+        '  quickref: "QuickRefCard.md"',
+        '  machinemanual: "MachineManual.md"',
+        '  userguide: "UserGuide.md"',
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def render_registry(spec: CorpusSpec) -> str:
+    lines = doc_header("KitRegistry", "KitRegistry", "UserGuide", "Runtime assistants") + [
+        "## 1) Boot",
+        "The first assistant message must include a one-line boot warning:",
+        f"- `{BOOT_WARNING}`",
+        "",
+        "## 2) Modules",
+    ]
+    base = "https://raw.githubusercontent.com/OpticSugar/ModKits/main"
+    for i in range(spec.kits):
+        module = kit_name(i)
+        lines += [
+            f"### Module: {module}",
+            f"- ModuleEmoji: `{kit_emoji(i)}`",
+            f"- ModuleAliases: `{module.lower()}`, `{kit_emoji(i)}`",
+            f"- Mission: Synthetic benchmark kit {module}.",
+            "- 🎛️ EngagePolicy: `OFFER`",
+            "- AutoRunScope: `bench`",
+            f"- DefaultLoad: `{'yes' if i == 0 else 'no'}`",
+            "- SingleEmojiActivate: `yes`",
+            "- Docs:",
+            f"  - Manifest: `{base}/{module}/_CURRENT/ModuleManifest.yaml`",
+            f"  - Install: `{base}/{module}/_CURRENT/Install.md`",
+            f"  - QuickRef: `{base}/{module}/_CURRENT/QuickRefCard.md`",
+            f"  - MachineManual: `{base}/{module}/_CURRENT/MachineManual.md`",
+            f"  - UserGuide: `{base}/{module}/_CURRENT/UserGuide.md`",
+            "- Version: `1.0.0`",
+            "",
+        ]
+    lines += ["## 3) Boot contract", "- No auto-boot.", ""]
+    return "\n".join(lines) + "\n"
+
+
+def render_global_instructions(spec: CorpusSpec, title: str) -> str:
+    # Like the real BootStub, only a short emoji map fits the copy/paste budget.
+    shown = [f"{kit_emoji(i)}={kit_name(i)}" for i in range(min(spec.kits, 8))]
+    lines = [
+        f"# {title}",
+        "",
+        "```text",
+        "Boot:",
+        f'- Reply 1: "{BOOT_WARNING}"',
+        f"- Emoji map: `{', '.join(shown)}`",
+        "- Load+activate only on explicit invoke.",
+        "```",
+        "",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def generate_corpus(root: Path, spec: CorpusSpec) -> Dict[str, int]:
+    """
+    Write a synthetic repo at root/ModKits (the layout BootTraceHarness expects).
+    Returns file and byte counts.
+    """
+    rng = random.Random(spec.seed)
+    modkits = root / "ModKits"
+    if modkits.exists():
+        shutil.rmtree(modkits)
+    written: Dict[Path, str] = {}
+
+    for i in range(spec.kits):
+        module = kit_name(i)
+        terms = kit_terms(spec, module)
+        kit_dir = modkits / module / "_CURRENT"
+        written[kit_dir / "ModuleManifest.yaml"] = render_manifest(module, kit_emoji(i), terms)
+        written[kit_dir / "Install.md"] = render_install(module)
+        written[kit_dir / "QuickRefCard.md"] = render_quickref(module, terms)
+        written[kit_dir / "MachineManual.md"] = render_machinemanual(module, terms)
+        written[kit_dir / "UserGuide.md"] = render_userguide(spec, module, terms, rng)
+
+    registry_dir = modkits / "KitRegistry" / "_CURRENT"
+    written[registry_dir / "KitRegistry.md"] = render_registry(spec)
+    written[registry_dir / "ChatGPT_GlobalInstructions.md"] = render_global_instructions(
+        spec, "ChatGPT Global Instructions"
+    )
+    written[registry_dir / "ChatGPT_GlobalInstructions_Enterprise.md"] = render_global_instructions(
+        spec, "ChatGPT Global Instructions (Enterprise)"
+    )
+
+    total_bytes = 0
+    for path, text in written.items():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = text.encode("utf-8")
+        path.write_bytes(data)
+        total_bytes += len(data)
+    return {"files": len(written), "bytes": total_bytes}
+
+
+# ---------------------------------------------------------------------------
+# Measurements (run inside a child process)
+# ---------------------------------------------------------------------------
+
+
+class RuleTimer:
+    """
+    Wraps module-level functions so calls made through the module namespace are timed.
+    """
+
+    def __init__(self) -> None:
+        self.stats: Dict[str, Dict[str, float]] = {}
+
+    def wrap(self, module: ModuleType, names: tuple) -> None:
+        for name in names:
+            fn = getattr(module, name, None)
+            if fn is None:
+                continue
+            setattr(module, name, self._timed(name, fn))
+
+    def _timed(self, name: str, fn: Callable) -> Callable:
+        stat = self.stats.setdefault(name, {"seconds": 0.0, "calls": 0})
+
+        @wraps(fn)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                stat["seconds"] += time.perf_counter() - start
+                stat["calls"] += 1
+
+        return timed
+
+    def reset(self) -> None:
+        for stat in self.stats.values():
+            stat["seconds"] = 0.0
+            stat["calls"] = 0
+
+
+def measure_lint(compiler: ModuleType, modkits: Path, strict: bool, repeat: int) -> Dict[str, object]:
+    timer = RuleTimer()
+    timer.wrap(compiler, LINT_TIMED_FUNCTIONS)
+    best: Optional[Dict[str, object]] = None
+    for _ in range(repeat):
+        timer.reset()
+        out = io.StringIO()
+        start = time.perf_counter()
+        with redirect_stdout(out):
+            rc = compiler.cmd_lint([modkits], strict=strict)
+        seconds = time.perf_counter() - start
+        if best is None or seconds < best["seconds"]:
+            report = out.getvalue().splitlines()
+            best = {
+                "seconds": seconds,
+                "exit_code": rc,
+                "errors": sum(1 for line in report if not line.startswith(("WARN: ", "OK: "))),
+                "warnings": sum(1 for line in report if line.startswith("WARN: ")),
+                "rules": {name: dict(stat) for name, stat in timer.stats.items()},
+            }
+    return best or {}
+
+
+def measure_extract(compiler: ModuleType, modkits: Path, repeat: int) -> Dict[str, object]:
+    guides = sorted(modkits.glob("*/_CURRENT/UserGuide.md"))
+    best: Optional[Dict[str, object]] = None
+    for _ in range(repeat):
+        extracted = 0
+        start = time.perf_counter()
+        for guide in guides:
+            text = compiler.read_text(guide)
+            for section in EXTRACT_SECTIONS:
+                compiler.extract_section(text, section)
+                extracted += 1
+        seconds = time.perf_counter() - start
+        if best is None or seconds < best["seconds"]:
+            best = {"seconds": seconds, "files": len(guides), "sections": extracted}
+    return best or {}
+
+
+def measure_boottrace(harness: ModuleType, modkits: Path, repeat: int) -> Dict[str, object]:
+    registry_dir = modkits / "KitRegistry" / "_CURRENT"
+    best: Optional[Dict[str, object]] = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        registry_text = harness.read_text(registry_dir / "KitRegistry.md")
+        global_text = harness.read_text(registry_dir / "ChatGPT_GlobalInstructions.md")
+        enterprise_text = harness.read_text(registry_dir / "ChatGPT_GlobalInstructions_Enterprise.md")
+        harness.extract_boot_warning_from_registry(registry_text)
+        harness.extract_boot_warning_from_global(global_text)
+        harness.extract_boot_warning_from_global(enterprise_text)
+        harness.extract_supported_modules(global_text)
+        modules = harness.parse_registry_modules(registry_text)
+        urls = harness.collect_all_doc_urls(modules)
+        seconds = time.perf_counter() - start
+        if best is None or seconds < best["seconds"]:
+            best = {"seconds": seconds, "modules": len(modules), "urls": len(urls), "bytes": len(registry_text.encode("utf-8"))}
+    return best or {}
+
+
+def cmd_measure(args: argparse.Namespace) -> int:
+    modkits = Path(args.root) / "ModKits"
+    if args.phase == "boottrace":
+        harness = load_module("BootTraceHarness", Path(args.boottrace))
+        result = measure_boottrace(harness, modkits, args.repeat)
+    else:
+        compiler = load_module("ModuleMill_Compiler", Path(args.compiler))
+        if args.phase == "lint":
+            result = measure_lint(compiler, modkits, args.strict, args.repeat)
+        else:
+            result = measure_extract(compiler, modkits, args.repeat)
+    result["peak_rss_kib"] = peak_rss_kib()
+    print(json.dumps(result))
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# Runner / comparison
+# ---------------------------------------------------------------------------
+
+
+def run_phase(phase: str, root: Path, args: argparse.Namespace) -> Dict[str, object]:
+    cmd = [
+        sys.executable,
+        str(Path(__file__).resolve()),
+        "measure",
+        str(root),
+        "--phase",
+        phase,
+        "--compiler",
+        str(args.compiler),
+        "--boottrace",
+        str(args.boottrace),
+        "--repeat",
+        str(args.repeat),
+    ]
+    if args.strict:
+        cmd.append("--strict")
+    proc = subprocess.run(cmd, capture_output=True, text=True, encoding="utf-8")
+    if proc.returncode != 0:
+        raise SystemExit(f"measure {phase} failed:\n{proc.stderr}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def cmd_run(args: argparse.Namespace) -> int:
+    sizes = [int(x) for x in args.sizes.split(",") if x.strip()]
+    workdir = Path(args.workdir) if args.workdir else Path(tempfile.mkdtemp(prefix="modulemill-bench-"))
+    compiler = load_module("ModuleMill_Compiler", Path(args.compiler))
+    report: Dict[str, object] = {
+        "schema": BENCH_SCHEMA_VERSION,
+        "compiler_version": getattr(compiler, "COMPILER_VERSION", "unknown"),
+        "compiler_path": str(Path(args.compiler).resolve()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "strict": args.strict,
+        "repeat": args.repeat,
+        "results": [],
+    }
+
+    try:
+        for kits in sizes:
+            spec = CorpusSpec(
+                kits=kits,
+                userguide_lines=args.userguide_lines,
+                commands=args.commands,
+                glossary=args.glossary,
+                must_preserve=args.must_preserve,
+                state_keys=args.state_keys,
+                seed=args.seed,
+            )
+            root = workdir / f"kits-{kits}"
+            corpus = generate_corpus(root, spec)
+            entry: Dict[str, object] = {"kits": kits, "corpus": {**asdict(spec), **corpus}}
+            for phase in args.phases.split(","):
+                result = run_phase(phase, root, args)
+                seconds = float(result["seconds"])
+                if phase == "lint":
+                    result["files_per_s"] = round(corpus["files"] / seconds, 1) if seconds else None
+                elif phase == "extract":
+                    result["files_per_s"] = round(int(result["files"]) / seconds, 1) if seconds else None
+                entry[phase] = result
+                print(f"{kits:>6} kits  {phase:<9} {seconds:9.3f}s  peak RSS {result['peak_rss_kib']} KiB")
+            report["results"].append(entry)
+            if not args.keep:
+                shutil.rmtree(root, ignore_errors=True)
+    finally:
+        if not args.keep and not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    out = Path(args.out)
+    out.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    print(f"Wrote {out}")
+    return 0
+
+
+def cmd_compare(args: argparse.Namespace) -> int:
+    old = json.loads(Path(args.old).read_text(encoding="utf-8"))
+    new = json.loads(Path(args.new).read_text(encoding="utf-8"))
+    old_by_size = {entry["kits"]: entry for entry in old.get("results", [])}
+    print(f"old: {old.get('compiler_version')}  new: {new.get('compiler_version')}")
+    regressed = False
+    for entry in new.get("results", []):
+        base = old_by_size.get(entry["kits"])
+        if base is None:
+            continue
+        for phase in PHASES:
+            if phase not in entry or phase not in base:
+                continue
+            before = float(base[phase]["seconds"])
+            after = float(entry[phase]["seconds"])
+            change = (after - before) / before * 100 if before else 0.0
+            flag = ""
+            # Sub-threshold timings are dominated by interpreter startup noise.
+            if change > args.threshold and max(before, after) >= args.min_seconds:
+                flag = "  REGRESSION"
+                regressed = True
+            print(f"{entry['kits']:>6} kits  {phase:<9} {before:9.3f}s -> {after:9.3f}s  {change:+6.1f}%{flag}")
+    return 1 if regressed else 0
+
+
+# ---------------------------------------------------------------------------
+# Emoji tokenizer
+# ---------------------------------------------------------------------------
+
+
+def legacy_emoji_tokens(raw: str) -> List[str]:
+    return LEGACY_EMOJI_RE.findall(LEGACY_VARIATION_SELECTOR_RE.sub("", raw))
+
+
+def synthetic_emoji_guide(rows: int, seed: int) -> str:
+    rng = random.Random(seed)
+    lines = ["## 6. EmojiGlossary", "", "| Emoji | Meaning |", "|---|---|"]
+    for i in range(rows):
+        run = "".join(rng.choice(EMOJI_SEQUENCE_POOL + tuple(EMOJI_POOL[:32])) for _ in range(rng.randint(1, 4)))
+        lines.append(f"| {run} | Synthetic glossary entry {i} |")
+    return "\n".join(lines) + "\n"
+
+
+def table_cells(text: str) -> List[str]:
+    cells: List[str] = []
+    for line in text.splitlines():
+        if line.lstrip().startswith("|"):
+            cells.extend(cell.strip() for cell in line.strip().strip("|").split("|"))
+    return cells
+
+
+def best_time(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure_emoji(compiler: ModuleType, label: str, text: str, repeat: int) -> Dict[str, object]:
+    cells = [cell for cell in table_cells(text) if cell]
+    tokenize = compiler.emoji_sequence_tokens
+
+    def legacy_cells() -> None:
+        for cell in cells:
+            "".join(legacy_emoji_tokens(cell))
+
+    def sequence_cells() -> None:
+        for cell in cells:
+            compiler.normalize_emoji_tokens(cell)
+
+    def sequence_cells_cold() -> None:
+        tokenize.cache_clear()
+        compiler.canonical_emoji_token.cache_clear()
+        sequence_cells()
+
+    legacy = legacy_emoji_tokens(text)
+    sequences = list(compiler.iter_emoji_sequences(text))
+    # Sequences the code-point regex broke into several tokens (ZWJ, skin tone, flags) or missed (keycaps).
+    split = sum(1 for token in sequences if len(legacy_emoji_tokens(token)) != 1)
+    return {
+        "input": label,
+        "bytes": len(text.encode("utf-8")),
+        "cells": len(cells),
+        "legacy_tokens": len(legacy),
+        "sequence_tokens": len(sequences),
+        "sequences_split_by_legacy": split,
+        "document_seconds": {
+            "legacy": best_time(lambda: legacy_emoji_tokens(text), repeat),
+            "sequence": best_time(lambda: [compiler.canonical_emoji_token(t) for t in compiler.iter_emoji_sequences(text)], repeat),
+        },
+        "cell_seconds": {
+            "legacy": best_time(legacy_cells, repeat),
+            "sequence_cold": best_time(sequence_cells_cold, repeat),
+            "sequence_memoized": best_time(sequence_cells, repeat),
+        },
+    }
+
+
+def cmd_emoji(args: argparse.Namespace) -> int:
+    compiler = load_module("ModuleMill_Compiler", Path(args.compiler))
+    modkits = SCRIPT_DIR.parent.parent
+    inputs: List[tuple] = []
+    for raw in args.paths or [str(modkits / rel) for rel in DEFAULT_EMOJI_GUIDES]:
+        path = Path(raw)
+        if not path.is_file():
+            print(f"Missing input: {path}", file=sys.stderr)
+            return 2
+        inputs.append((str(path), compiler.read_text(path)))
+    if args.synthetic_rows:
+        inputs.append((f"synthetic:{args.synthetic_rows}", synthetic_emoji_guide(args.synthetic_rows, args.seed)))
+    results = [measure_emoji(compiler, label, text, args.repeat) for label, text in inputs]
+    if args.format == "json":
+        print(json.dumps({"compiler_version": compiler.COMPILER_VERSION, "results": results}, indent=2))
+        return 0
+    for entry in results:
+        doc = entry["document_seconds"]
+        cell = entry["cell_seconds"]
+        print(f"{entry['input']}  ({entry['bytes']} bytes, {entry['cells']} table cells)")
+        print(f"  tokens: legacy {entry['legacy_tokens']}  sequence {entry['sequence_tokens']}  split by legacy {entry['sequences_split_by_legacy']}")
+        print(f"  document: legacy {doc['legacy'] * 1e3:8.3f} ms  sequence {doc['sequence'] * 1e3:8.3f} ms")
+        print(
+            f"  cells:    legacy {cell['legacy'] * 1e3:8.3f} ms  sequence {cell['sequence_cold'] * 1e3:8.3f} ms cold"
+            f"  {cell['sequence_memoized'] * 1e3:8.3f} ms memoized"
+        )
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# Model stand-in
+# ---------------------------------------------------------------------------
+
+
+def stub_reply(system: str, prompt: str) -> str:
+    """
+    Deterministic stand-in for a model: echoes the context lines that share a word (4+ chars)
+    with the prompt, so a reply changes when the module docs it quotes change.
+    """
+    words = {word.casefold() for word in STUB_WORD_RE.findall(prompt)}
+    lines = [
+        line
+        for line in system.splitlines()
+        if line.strip() and not line.startswith("<!--") and words & {w.casefold() for w in STUB_WORD_RE.findall(line)}
+    ]
+    if not lines:
+        return "I can't answer that from the loaded module docs."
+    return "\n".join(lines[:STUB_MAX_REPLY_LINES])
+
+
+class StubModelHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    requests = 0
+
+    def do_POST(self) -> None:
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self.send_error(404)
+            return
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))).decode("utf-8"))
+            messages = body["messages"]
+            system = "\n".join(m["content"] for m in messages if m.get("role") == "system")
+            prompt = next(m["content"] for m in reversed(messages) if m.get("role") == "user")
+        except (ValueError, KeyError, TypeError, StopIteration):
+            self.send_error(400)
+            return
+        StubModelHandler.requests += 1
+        time.sleep(self.latency)
+        payload = {
+            "id": f"stub-{StubModelHandler.requests}",
+            "object": "chat.completion",
+            "model": body.get("model", "modulemill-stub"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": stub_reply(system, prompt)}, "finish_reason": "stop"}],
+        }
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+def cmd_stub_model(args: argparse.Namespace) -> int:
+    StubModelHandler.latency = args.latency
+    server = ThreadingHTTPServer((args.host, args.port), StubModelHandler)
+    print(f"stub model on http://{args.host}:{server.server_address[1]}/v1 (latency {args.latency}s)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"served {StubModelHandler.requests} request(s)")
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# Doc URL stand-in
+# ---------------------------------------------------------------------------
+
+
+class UrlStubHandler(BaseHTTPRequestHandler):
+    """
+    Fixture routes for the BootTrace URL checker, over HTTP/1.1 keep-alive:
+    /ok (ETag), /no-head (HEAD 405, GET with Last-Modified), /redirect (301 to /ok), /missing (404).
+    """
+
+    protocol_version = "HTTP/1.1"
+    connections = 0
+    requests: List[str] = []
+
+    def setup(self) -> None:
+        super().setup()
+        UrlStubHandler.connections += 1
+
+    def reply(self, status: int, headers: Optional[Dict[str, str]] = None) -> None:
+        UrlStubHandler.requests.append(f"{self.command} {self.path} {status}")
+        body = b"" if self.command == "HEAD" or status == 304 else f"{status}\n".encode("ascii")
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def route(self) -> None:
+        if self.path == "/ok":
+            if self.headers.get("If-None-Match") == STUB_URL_ETAG:
+                self.reply(304, {"ETag": STUB_URL_ETAG})
+            else:
+                self.reply(200, {"ETag": STUB_URL_ETAG})
+        elif self.path == "/no-head":
+            if self.command == "HEAD":
+                self.reply(405, {"Allow": "GET"})
+            elif self.headers.get("If-Modified-Since") == STUB_URL_LAST_MODIFIED:
+                self.reply(304, {"Last-Modified": STUB_URL_LAST_MODIFIED})
+            else:
+                self.reply(200, {"Last-Modified": STUB_URL_LAST_MODIFIED})
+        elif self.path == "/redirect":
+            self.reply(301, {"Location": "/ok"})
+        else:
+            self.reply(404)
+
+    do_HEAD = route
+    do_GET = route
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+def closed_port_url() -> str:
+    # Bind, read the port, and close again: nothing listens there afterwards.
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/refused"
+
+
+def check_url_stub(harness: ModuleType, base: str) -> int:
+    """
+    Run the harness URL checker twice against the stand-in (a fresh validator cache, then the
+    saved one) and compare each URL's (ok, status) with the expected result.
+    """
+    urls = {name: f"{base}/{name}" for name in ("ok", "no-head", "redirect", "missing")}
+    urls["refused"] = closed_port_url()
+    expected = {
+        1: {"ok": (True, "200"), "no-head": (True, "200"), "redirect": (True, "200"), "missing": (False, "HTTP 404")},
+        2: {
+            "ok": (True, "304 not modified"),
+            "no-head": (True, "304 not modified"),
+            "redirect": (True, "304 not modified"),
+            "missing": (False, "HTTP 404"),
+        },
+    }
+    failures = 0
+    with tempfile.TemporaryDirectory(prefix="modulemill-url-stub-") as tmp:
+        cache_path = Path(tmp) / "url-cache.json"
+        for run in (1, 2):
+            UrlStubHandler.connections = 0
+            cache = harness.UrlCache.load(cache_path)
+            results = harness.check_urls(list(urls.values()), timeout=5, workers=1, cache=cache)
+            cache.save()
+            print(f"run {run}:")
+            for name, url in urls.items():
+                got = results[url]
+                if name == "refused":
+                    ok = got[0] is False and got[1].startswith("ConnectionRefusedError")
+                    want = "(False, 'ConnectionRefusedError: ...')"
+                else:
+                    ok = got == expected[run][name]
+                    want = str(expected[run][name])
+                failures += not ok
+                print(f"  {'OK  ' if ok else 'FAIL'} {name:<9} {got}" + ("" if ok else f" expected {want}"))
+            # One worker thread: every request to the stand-in shares one kept-alive socket.
+            ok = UrlStubHandler.connections == 1
+            failures += not ok
+            print(f"  {'OK  ' if ok else 'FAIL'} keep-alive {UrlStubHandler.connections} connection(s) for the stand-in host")
+    print(f"{failures} failure(s)")
+    return 1 if failures else 0
+
+
+def cmd_url_stub(args: argparse.Namespace) -> int:
+    server = ThreadingHTTPServer((args.host, 0 if args.check else args.port), UrlStubHandler)
+    base = f"http://{args.host}:{server.server_address[1]}"
+    if args.check:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            return check_url_stub(load_module("BootTraceHarness", Path(args.boottrace)), base)
+        finally:
+            server.shutdown()
+            server.server_close()
+    print(f"url stand-in on {base}: /ok /no-head /redirect /missing", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"served {len(UrlStubHandler.requests)} request(s) on {UrlStubHandler.connections} connection(s)")
+    return 0
+
+
+def run_git(cwd: Path, *args: str) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=modulemill-bench", "-c", "user.email=bench@localhost", "-c", "commit.gpgsign=false", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+    )
+
+
+def check_git_snapshot(harness: ModuleType) -> int:
+    """
+    Trace a synthetic corpus laid out like a real clone (`<root>/ModKits` is the git worktree,
+    `<root>` is not) from the working tree, the index, and HEAD while the three diverge, and
+    compare each run's issue rules with the expected ones.
+    """
+    failures = 0
+    with tempfile.TemporaryDirectory(prefix="modulemill-git-snapshot-") as tmp:
+        root = Path(tmp)
+        generate_corpus(root, CorpusSpec(kits=2, userguide_lines=40, commands=2, glossary=2, must_preserve=2))
+        modkits = root / "ModKits"
+        run_git(modkits, "init", "-q")
+        run_git(modkits, "add", "-A")
+        run_git(modkits, "commit", "-q", "-m", "corpus")
+        enterprise = modkits / "KitRegistry" / "_CURRENT" / "ChatGPT_GlobalInstructions_Enterprise.md"
+
+        def edit_working_tree() -> None:
+            enterprise.write_text("no boot warning here\n", encoding="utf-8")
+
+        def stage() -> None:
+            run_git(modkits, "add", "-A")
+
+        broken = ["boot-warning"]
+        steps = (
+            ("committed", None, {"working tree": [], "--staged": [], "--rev HEAD": []}),
+            ("edited", edit_working_tree, {"working tree": broken, "--staged": [], "--rev HEAD": []}),
+            ("staged", stage, {"working tree": broken, "--staged": broken, "--rev HEAD": []}),
+        )
+        sources = {"working tree": {}, "--staged": {"staged": True}, "--rev HEAD": {"rev": "HEAD"}}
+        for step, action, expected in steps:
+            if action is not None:
+                action()
+            print(f"{step}:")
+            for source, kwargs in sources.items():
+                try:
+                    got = [issue.rule for issue in harness.trace_boot(root, **kwargs).issues]
+                except harness.GitError as exc:
+                    got = [f"{type(exc).__name__}: {exc}"]
+                ok = got == expected[source]
+                failures += not ok
+                print(f"  {'OK  ' if ok else 'FAIL'} {source:<12} {got}" + ("" if ok else f" expected {expected[source]}"))
+    print(f"{failures} failure(s)")
+    return 1 if failures else 0
+
+
+def cmd_git_snapshot(args: argparse.Namespace) -> int:
+    return check_git_snapshot(load_module("BootTraceHarness", Path(args.boottrace)))
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(prog="modulemill-bench")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    def add_corpus_args(p: argparse.ArgumentParser) -> None:
+        p.add_argument("--userguide-lines", type=int, default=200, help="lines per UserGuide (default: 200)")
+        p.add_argument("--commands", type=int, default=8, help="command table rows per kit (default: 8)")
+        p.add_argument("--glossary", type=int, default=12, help="EmojiGlossary rows per kit (default: 12)")
+        p.add_argument("--must-preserve", type=int, default=10, help="plain must_preserve phrases per kit (default: 10)")
+        p.add_argument("--state-keys", type=int, default=8, help="namespaced state keys per kit (default: 8)")
+        p.add_argument("--seed", type=int, default=0, help="filler text seed (default: 0)")
+
+    def add_target_args(p: argparse.ArgumentParser) -> None:
+        p.add_argument("--compiler", default=str(SCRIPT_DIR / "ModuleMill_Compiler.py"), help="compiler file to measure")
+        p.add_argument("--boottrace", default=str(SCRIPT_DIR / "BootTraceHarness.py"), help="BootTraceHarness file to measure")
+        p.add_argument("--repeat", type=int, default=3, help="runs per measurement; the fastest is kept (default: 3)")
+        p.add_argument("--strict", action="store_true", help="lint with --strict (exercises all parity checks)")
+
+    ap_gen = sub.add_parser("gen", help="write one synthetic corpus")
+    ap_gen.add_argument("root", help="output directory (kits are written under root/ModKits)")
+    ap_gen.add_argument("--kits", type=int, default=10, help="number of kits (default: 10)")
+    add_corpus_args(ap_gen)
+
+    ap_run = sub.add_parser("run", help="benchmark lint/extract/boottrace over growing corpora")
+    ap_run.add_argument(
+        "--sizes",
+        default=",".join(str(n) for n in DEFAULT_SIZES),
+        help=f"comma-separated kit counts (default: {','.join(str(n) for n in DEFAULT_SIZES)})",
+    )
+    ap_run.add_argument("--phases", default=",".join(PHASES), help=f"comma-separated phases (default: {','.join(PHASES)})")
+    ap_run.add_argument("--out", default="modulemill-bench.json", help="result JSON path (default: modulemill-bench.json)")
+    ap_run.add_argument("--workdir", help="where corpora are generated (default: a temp dir)")
+    ap_run.add_argument("--keep", action="store_true", help="keep generated corpora")
+    add_corpus_args(ap_run)
+    add_target_args(ap_run)
+
+    # Internal: one phase per child process for cmd_run. Registered without help= so it is not listed.
+    ap_measure = sub.add_parser("measure")
+    ap_measure.add_argument("root")
+    ap_measure.add_argument("--phase", choices=PHASES, required=True)
+    add_target_args(ap_measure)
+
+    ap_cmp = sub.add_parser("compare", help="compare two result files")
+    ap_cmp.add_argument("old", help="baseline result JSON")
+    ap_cmp.add_argument("new", help="candidate result JSON")
+    ap_cmp.add_argument(
+        "--threshold",
+        type=float,
+        default=10.0,
+        help="percent slowdown reported as a regression (exit 1) (default: 10)",
+    )
+    ap_cmp.add_argument(
+        "--min-seconds",
+        type=float,
+        default=0.05,
+        help="ignore slowdowns where both timings are below this many seconds (default: 0.05)",
+    )
+
+    ap_emoji = sub.add_parser("emoji", help="benchmark emoji sequence tokenizing against the legacy code-point regex")
+    ap_emoji.add_argument("paths", nargs="*", help=f"UserGuides to tokenize (default: {', '.join(DEFAULT_EMOJI_GUIDES)})")
+    ap_emoji.add_argument("--synthetic-rows", type=int, default=2000, help="also tokenize a generated glossary with this many rows; 0 to skip (default: 2000)")
+    ap_emoji.add_argument("--seed", type=int, default=0, help="synthetic glossary seed (default: 0)")
+    ap_emoji.add_argument("--compiler", default=str(SCRIPT_DIR / "ModuleMill_Compiler.py"), help="compiler file to measure")
+    ap_emoji.add_argument("--repeat", type=int, default=5, help="runs per measurement; the fastest is kept (default: 5)")
+    ap_emoji.add_argument("--format", choices=["text", "json"], default="text", help="output format (default: text)")
+
+    ap_stub = sub.add_parser("stub-model", help="serve a deterministic OpenAI-compatible /v1/chat/completions stand-in")
+    ap_stub.add_argument("--host", default="127.0.0.1", help="bind address (default: 127.0.0.1)")
+    ap_stub.add_argument("--port", type=int, default=STUB_MODEL_PORT, help=f"port (default: {STUB_MODEL_PORT})")
+    ap_stub.add_argument("--latency", type=float, default=0.5, help="seconds slept per request, to mimic a model (default: 0.5)")
+
+    ap_url = sub.add_parser("url-stub", help="serve doc-URL fixtures for the BootTrace URL checker, or --check it against them")
+    ap_url.add_argument("--host", default="127.0.0.1", help="bind address (default: 127.0.0.1)")
+    ap_url.add_argument("--port", type=int, default=STUB_URL_PORT, help=f"port when serving (default: {STUB_URL_PORT})")
+    ap_url.add_argument(
+        "--check",
+        action="store_true",
+        help="serve on a free port, run the checker twice (HEAD 405 fallback, redirect, 404, refused, keep-alive, "
+        "304 on the cached run) and exit 1 on any mismatch",
+    )
+    ap_url.add_argument("--boottrace", default=str(SCRIPT_DIR / "BootTraceHarness.py"), help="BootTraceHarness file to check")
+
+    ap_snap = sub.add_parser(
+        "git-snapshot",
+        help="check BootTraceHarness --staged/--rev against a throwaway clone whose parent folder is not a git worktree",
+    )
+    ap_snap.add_argument("--boottrace", default=str(SCRIPT_DIR / "BootTraceHarness.py"), help="BootTraceHarness file to check")
+
+    sub.metavar = "{" + ",".join(name for name in sub.choices if name != "measure") + "}"
+    args = ap.parse_args()
+
+    if args.cmd == "gen":
+        spec = CorpusSpec(
+            kits=args.kits,
+            userguide_lines=args.userguide_lines,
+            commands=args.commands,
+            glossary=args.glossary,
+            must_preserve=args.must_preserve,
+            state_keys=args.state_keys,
+            seed=args.seed,
+        )
+        counts = generate_corpus(Path(args.root), spec)
+        print(f"Wrote {counts['files']} files ({counts['bytes']} bytes) under {Path(args.root) / 'ModKits'}")
+        return 0
+    if args.cmd == "run":
+        return cmd_run(args)
+    if args.cmd == "measure":
+        return cmd_measure(args)
+    if args.cmd == "compare":
+        return cmd_compare(args)
+    if args.cmd == "emoji":
+        return cmd_emoji(args)
+    if args.cmd == "stub-model":
+        return cmd_stub_model(args)
+    if args.cmd == "url-stub":
+        return cmd_url_stub(args)
+    if args.cmd == "git-snapshot":
+        return cmd_git_snapshot(args)
+
+    return 2
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
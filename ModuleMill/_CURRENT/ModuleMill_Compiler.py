@@ -3,13 +3,45 @@
 ModuleMill Compiler v0.7.2
 - lint: validate metadata, role hygiene, and ModuleManifest contract checks
 - extract: print a requested section by heading
+- build: write deterministic per-module (and boot) doc bundles
+- index: compile KitRegistry.md into a JSON lookup index
+- budget: report boot and escalation payload bytes / approximate tokens per module
+- lsp: serve lint diagnostics to editors over the Language Server Protocol (stdio)
+- regress: run each module's golden-prompt corpus against an OpenAI-compatible endpoint
+- lint/extract --staged | --rev REV: read inputs from git objects instead of the working tree
+- API: lint_paths / lint_kit / extract_section / boottrace for import (Diagnostic results)
+- lint streams each finding as its kit is linted (--format text|ndjson); --fail-fast / --max-errors N stop early
+- lint --shard i/N: lint a stable 1/N of the kits and write a result file; merge: combine shard results
 """
 
 import argparse
+import hashlib
+import importlib.util
+import json
+import mmap
+import os
 import re
+import socket
+import socketserver
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from bisect import bisect_right
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache, partial, wraps
+from itertools import accumulate
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+from urllib.error import HTTPError
+from urllib.parse import unquote as unquote_url, urlsplit
+from urllib.request import Request, urlopen
 
+COMPILER_VERSION = "0.7.2"
 DOC_ROLES = {"Install", "QuickRefCard", "MachineManual", "UserGuide"}
 FRAMEWORK_MODULE_IDS = {"ModuleMill", "KitRegistry"}
 ENGAGE_POLICIES = {"AUTO", "OFFER", "MANUAL"}
@@ -53,6 +85,86 @@ REQUIRED_USERGUIDE_SECTION_GROUPS = {
 USERGUIDE_MIN_NONEMPTY_LINES = 120
 USERGUIDE_MIN_HEADINGS = 8
 LIFECYCLE_VERBS = ("load", "activate", "sleep", "unload", "status")
+MANIFEST_DOC_ROLES = {
+    "install": "Install",
+    "quickref": "QuickRefCard",
+    "machinemanual": "MachineManual",
+    "userguide": "UserGuide",
+}
+# Below this many needles, per-needle str.find (C speed) beats a pure-Python automaton pass.
+AHO_CORASICK_MIN_TERMS = 1000
+LINT_CACHE_DEFAULT_DIR = ".modulemill_cache"
+LINT_CACHE_FILENAME = "lint-cache.json"
+LINT_CACHE_MAX_ENTRIES = 50000
+# Upper bound on kits per worker task, so -j output streams and --fail-fast stops promptly.
+LINT_STREAM_CHUNK_UNITS = 8
+LINT_SHARD_SCHEMA = 1
+# Kits holding KitRegistry.md or global instructions are always linted on this shard.
+LINT_SHARD_GLOBAL = 1
+LINT_SHARD_RESULT_TEMPLATE = "lint-shard-{index}-of-{count}.json"
+LSP_SEVERITY_ERROR = 1
+LSP_SEVERITY_WARNING = 2
+LSP_TEXT_SYNC_FULL = 1
+# Report order for `lint --profile`; per-file entry points are inclusive of the rules they call.
+PROFILED_LINT_FUNCTIONS = (
+    "collect_files",
+    "lint_markdown_file",
+    "lint_manifest_file",
+    "lint_userguide_completeness",
+    "lint_emoji_glossary_contract",
+    "lint_inline_code_emoji_render_safety",
+    "lint_global_instruction_codeblock_size",
+    "lint_manifest_contract_parity",
+)
+PROFILED_FILE_FUNCTIONS = {"lint_markdown_file", "lint_manifest_file"}
+BUILD_DEFAULT_OUT_DIR = "build/bundles"
+BUNDLE_INDEX_FILENAME = "bundle-index.json"
+BOOT_BUNDLE_FILENAME = "BOOT_BUNDLE.md"
+REGISTRY_INDEX_SCHEMA = 1
+REGISTRY_INDEX_DEFAULT_PATH = "build/registry-index.json"
+DEFAULT_REGISTRY_PATH = "KitRegistry/_CURRENT/KitRegistry.md"
+# Docs at least this large are extracted through the mmap byte-offset path by default.
+MMAP_EXTRACT_MIN_BYTES = 32 * 1024 * 1024
+# The extract daemon keeps at most this many parsed docs, and this many memoized sections per doc.
+EXTRACT_CACHE_MAX_DOCS = 256
+EXTRACT_CACHE_MAX_SECTIONS = 512
+HEADING_SIDECAR_SUFFIX = ".headings.json"
+HEADING_SIDECAR_SCHEMA = 1
+SCAN_CHUNK_BYTES = 4 * 1024 * 1024
+# Bundle section order follows boot order: manifest, then QuickRef, then on-demand docs.
+BUNDLE_DOC_ORDER = ("quickref", "machinemanual", "userguide", "install")
+# Progressive disclosure (DevGuide 9.4): boot loads ManifestModule + QuickRefCard per DefaultLoad
+# module; escalation adds MachineManual and UserGuide.
+BOOT_DOC_ROLES = ("manifest", "quickref")
+ESCALATION_DOC_ROLES = ("machinemanual", "userguide")
+APPROX_CHARS_PER_TOKEN = 4
+# Golden-prompt regression corpus (DevGuide 10.2/10.3), one JSON prompt per line beside the manifest.
+GOLDEN_PROMPTS_FILENAME = "GoldenPrompts.jsonl"
+GOLDEN_PROMPT_MIN_KINDS = {"nominal": 3, "edge": 3, "collision": 2, "fail_closed": 2}
+GOLDEN_PROMPT_CONTEXTS = {"boot": BOOT_DOC_ROLES, "full": BOOT_DOC_ROLES + ESCALATION_DOC_ROLES}
+REGRESS_CACHE_FILENAME = "regress-cache.json"
+REGRESS_CACHE_MAX_ENTRIES = 20000
+REGRESS_DEFAULT_ENDPOINT = "http://127.0.0.1:8765/v1"
+REGRESS_DEFAULT_MODEL = "modulemill-stub"
+REGRESS_API_KEY_ENV = "MODULEMILL_REGRESS_API_KEY"
+REGRESS_RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Directories never walked during discovery (unless --no-ignore). Virtualenvs are also
+# recognized by their pyvenv.cfg, whatever they are named.
+PRUNED_DIR_NAMES = {
+    ".git",
+    ".hg",
+    ".svn",
+    "node_modules",
+    "__pycache__",
+    ".venv",
+    "venv",
+    ".tox",
+    ".nox",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".ruff_cache",
+    LINT_CACHE_DEFAULT_DIR,
+}
 STATE_KEY_RE = re.compile(r"`([a-z][a-z0-9_]*\.[a-z0-9_.]+)`")
 
 META_PATTERNS = {
@@ -63,7 +175,49 @@ META_PATTERNS = {
 }
 
 HEADING_RE = re.compile(r"^(#{1,6})\s+(.*)$")
-EMOJI_RE = re.compile(r"[\u2600-\u27bf\U0001F300-\U0001FAFF]")
+# UTF-8 line breaks str.splitlines() honors besides \n and \r\n (lone \r is checked separately).
+# Byte offsets computed on \n would disagree with ParsedDoc's line model, so such files stay
+# on the in-memory path.
+EXTRA_LINE_BREAK_BYTES = (b"\x0b", b"\x0c", b"\x1c", b"\x1d", b"\x1e", b"\xc2\x85", b"\xe2\x80\xa8", b"\xe2\x80\xa9")
+MARKDOWN_FENCE_RE = re.compile(r"^ {0,3}(```|~~~)")
+THEMATIC_BREAK_RE = re.compile(r"^ {0,3}([-*_])(?: *\1){2,} *$")
+TABLE_SEPARATOR_CELL_RE = re.compile(r"^:?-+:?$")
+CODE_SPAN_PIPE_RE = re.compile(r"`[^`]*\|[^`]*`")
+HTML_COMMENT_LINE_RE = re.compile(r"^\s*<!--.*-->\s*$")
+DOC_LOCATION_RE = re.compile(r":\d+:\d+")
+ISSUE_LOCATION_RE = re.compile(r"^(?P<name>[^\s:]+):(?P<line>\d+):(?P<col>\d+): ")
+ISSUE_QUOTED_RE = re.compile(r"'([^']+)'")
+# Manifest parity findings that name the role doc missing something ("... missing from QuickRefCard",
+# "MachineManual missing ...", "UserGuide is missing ...").
+PARITY_TARGET_RE = re.compile(r"missing from (UserGuide|MachineManual|QuickRefCard)\b|\b(UserGuide|MachineManual|QuickRefCard) (?:is )?missing\b")
+# Emoji sequences per the UTS #51 shapes, matched as whole tokens: ZWJ sequences, keycaps,
+# regional-indicator flags, skin-tone modifiers, and tag sequences. Emoji-presentation
+# code points stand alone; text-default ones (arrows, (c), ...) count only with VS16.
+EMOJI_PRESENTATION_CLASS = (
+    "\u231a-\u231b\u23e9-\u23ec\u23f0\u23f3\u25fd-\u25fe\u2600-\u27bf\u2b1b-\u2b1c\u2b50\u2b55"
+    "\U0001F004\U0001F0CF\U0001F18E\U0001F191-\U0001F19A\U0001F201\U0001F21A\U0001F22F"
+    "\U0001F232-\U0001F236\U0001F238-\U0001F23A\U0001F250-\U0001F251\U0001F300-\U0001FAFF"
+)
+EMOJI_TEXT_DEFAULT_CLASS = (
+    "\u00a9\u00ae\u203c\u2049\u2122\u2139\u2194-\u2199\u21a9-\u21aa\u2328\u23cf\u23ed-\u23ef"
+    "\u23f1-\u23f2\u23f8-\u23fa\u24c2\u25aa-\u25ab\u25b6\u25c0\u25fb-\u25fc\u2934-\u2935"
+    "\u2b05-\u2b07\u3030\u303d\u3297\u3299\U0001F170-\U0001F171\U0001F17E-\U0001F17F\U0001F202\U0001F237"
+)
+EMOJI_ELEMENT_PATTERN = (
+    f"(?:[{EMOJI_PRESENTATION_CLASS}]|[{EMOJI_TEXT_DEFAULT_CLASS}]\ufe0f)"
+    "(?:[\U000E0020-\U000E007E]+\U000E007F)?[\ufe0e\ufe0f]?[\U0001F3FB-\U0001F3FF]?"
+)
+EMOJI_SEQUENCE_RE = re.compile(
+    "[\U0001F1E6-\U0001F1FF]{2}"
+    "|[0-9#*]\ufe0f?\u20e3"
+    f"|{EMOJI_ELEMENT_PATTERN}(?:\u200d{EMOJI_ELEMENT_PATTERN})*"
+)
+EMOJI_TEXT_DEFAULT_RE = re.compile(f"[{EMOJI_TEXT_DEFAULT_CLASS}]")
+# Every sequence is non-ASCII apart from a keycap base, so the tokenizer only runs over
+# non-ASCII runs. A single leading class keeps sre on its fast prefix scan (`X+` is not).
+EMOJI_CANDIDATE_RE = re.compile(r"[^\x00-\x7f][^\x00-\x7f]*")
+EMOJI_KEYCAP_BASES = "0123456789#*"
+EMOJI_TOKEN_CACHE_SIZE = 16384
 VARIATION_SELECTOR_RE = re.compile(r"[\ufe0e\ufe0f]")
 PASCAL_CASE_RE = re.compile(r"^[A-Z][A-Za-z0-9]*$")
 INTENT_SIGNAL_KEYWORDS = {
@@ -73,12 +227,332 @@ INTENT_SIGNAL_KEYWORDS = {
 
 
 def read_text(path: Path) -> str:
+    source = GitObjectSource.active
+    if source is not None:
+        return source.read_bytes(path).decode("utf-8", errors="replace")
     return path.read_text(encoding="utf-8", errors="replace")
 
 
+def input_exists(path: Path) -> bool:
+    source = GitObjectSource.active
+    return source.exists(path) if source is not None else path.exists()
+
+
+@lru_cache(maxsize=None)
+def process_umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+def replace_file(path: Path, data: bytes) -> None:
+    """
+    Write data to a unique temp file beside path, then rename it over path. Concurrent
+    writers (an editor save during a pre-commit run) never share a temp file, and readers
+    only ever see a complete old or new file.
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        # mkstemp creates 0600 files; published artifacts keep the usual umask-derived mode.
+        os.fchmod(fd, 0o666 & ~process_umask())
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+@dataclass
+class TableRow:
+    line_index: int
+    cells: List[str]
+    header: List[str]
+
+    @property
+    def is_separator(self) -> bool:
+        return set("".join(self.cells)) <= {"-", ":", " "}
+
+
+@dataclass
+class MarkdownTable:
+    """
+    A run of '|' rows. Blank lines stay inside the run; any other non-table line ends it.
+    `header` is the first row's cells and `rows` includes every row, header first.
+    """
+
+    start_line: int
+    header: List[str] = field(default_factory=list)
+    rows: List[TableRow] = field(default_factory=list)
+
+
+class ParsedDoc:
+    """
+    One markdown document, read once and parsed lazily for every lint rule.
+    Derived views (lowercase text, lines, meta, headings, section spans, tables)
+    are computed on first use and then shared.
+    """
+
+    def __init__(self, text: str, path: Optional[Path] = None) -> None:
+        self.text = text
+        self.path = path
+
+    @classmethod
+    def load(cls, path: Path) -> "ParsedDoc":
+        return cls(read_text(path), path)
+
+    @cached_property
+    def lower(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def lines(self) -> List[str]:
+        return self.text.splitlines()
+
+    @cached_property
+    def nbytes(self) -> int:
+        return len(self.text.encode("utf-8"))
+
+    @cached_property
+    def meta(self) -> Dict[str, str]:
+        return parse_meta_lines(self.lines)
+
+    @cached_property
+    def headings(self) -> List[Tuple[int, str, int]]:
+        """
+        Returns list of (level, title, line_index)
+        """
+        idx = []
+        for i, line in enumerate(self.lines):
+            if not line.startswith("#"):
+                continue
+            m = HEADING_RE.match(line)
+            if m:
+                level = len(m.group(1))
+                title = m.group(2).strip()
+                idx.append((level, title, i))
+        return idx
+
+    @cached_property
+    def emoji_tokens(self) -> Set[str]:
+        """
+        Every emoji sequence in the text, in canonical_emoji_token form.
+        """
+        return {canonical_emoji_token(token) for token in iter_emoji_sequences(self.text)}
+
+    @cached_property
+    def titles_lower(self) -> List[str]:
+        return [title.lower() for _, title, _ in self.headings]
+
+    @cached_property
+    def section_spans(self) -> List[Tuple[int, str, int, int]]:
+        """
+        Returns list of (level, title, start_line, end_line) where each section ends
+        at the next heading of the same or higher level.
+        """
+        spans: List[Tuple[int, str, int, int]] = []
+        open_idx: List[int] = []
+        for level, title, li in self.headings:
+            while open_idx and spans[open_idx[-1]][0] >= level:
+                prev_level, prev_title, prev_start, _ = spans[open_idx[-1]]
+                spans[open_idx.pop()] = (prev_level, prev_title, prev_start, li)
+            spans.append((level, title, li, len(self.lines)))
+            open_idx.append(len(spans) - 1)
+        return spans
+
+    @cached_property
+    def tables(self) -> List[MarkdownTable]:
+        tables: List[MarkdownTable] = []
+        table: Optional[MarkdownTable] = None
+        for i, raw in enumerate(self.lines):
+            if "|" not in raw:
+                # Most lines: no cell can start here; only an open table needs the blank check.
+                if table is not None and raw.strip():
+                    table = None
+                continue
+            line = raw.strip()
+            if not line.startswith("|"):
+                if line:
+                    table = None
+                continue
+            cells = [c.strip() for c in line.split("|")[1:-1]]
+            if table is None:
+                table = MarkdownTable(start_line=i, header=cells)
+                tables.append(table)
+            table.rows.append(TableRow(line_index=i, cells=cells, header=table.header))
+        return tables
+
+    @cached_property
+    def line_starts(self) -> List[int]:
+        """
+        Character offset of each line start, aligned with `lines`, plus a final end offset.
+        """
+        return [0, *accumulate(map(len, self.text.splitlines(keepends=True)))]
+
+    def line_col(self, offset: int) -> Tuple[int, int]:
+        """
+        Resolve a character offset to a 1-based (line, column) pair.
+        """
+        line_idx = max(bisect_right(self.line_starts, offset) - 1, 0)
+        return line_idx + 1, offset - self.line_starts[line_idx] + 1
+
+    def text_offset(self, lower_offset: int) -> int:
+        """
+        Map an offset in `lower` back to `text` (they differ only when lowercasing changes length).
+        """
+        if len(self.lower) == len(self.text):
+            return lower_offset
+        pos = 0
+        for i, ch in enumerate(self.text):
+            if pos >= lower_offset:
+                return i
+            pos += len(ch.lower())
+        return len(self.text)
+
+    def location(self, offset: int) -> str:
+        line_no, col = self.line_col(offset)
+        return f"{self.path.name if self.path else '<text>'}:{line_no}:{col}"
+
+    def section_lines(self, span: Tuple[int, str, int, int]) -> List[str]:
+        _, _, start, end = span
+        return self.lines[start:end]
+
+
+@dataclass
+class ProfileEvent:
+    name: str
+    file: str
+    start_ns: int
+    duration_ns: int
+    nbytes: int
+    pid: int
+
+
+class LintProfiler:
+    """
+    Collects one timing event per call of a @profiled lint function while active.
+    Only one profiler is active per process; worker processes install their own and
+    ship events back to the parent.
+    """
+
+    active: Optional["LintProfiler"] = None
+
+    def __init__(self) -> None:
+        self.events: List[ProfileEvent] = []
+        self.origin_ns = time.perf_counter_ns()
+
+    def record(self, name: str, args: tuple, start_ns: int) -> None:
+        file, nbytes = profile_subject(args)
+        self.events.append(
+            ProfileEvent(name, file, start_ns, time.perf_counter_ns() - start_ns, nbytes, os.getpid())
+        )
+
+    def rule_stats(self) -> List[Dict[str, object]]:
+        stats: Dict[str, Dict[str, object]] = {
+            name: {"rule": name, "calls": 0, "seconds": 0.0, "bytes": 0} for name in PROFILED_LINT_FUNCTIONS
+        }
+        for ev in self.events:
+            row = stats.setdefault(ev.name, {"rule": ev.name, "calls": 0, "seconds": 0.0, "bytes": 0})
+            row["calls"] += 1
+            row["seconds"] += ev.duration_ns / 1e9
+            row["bytes"] += ev.nbytes
+        return [row for row in stats.values() if row["calls"]]
+
+    def slowest_files(self, top: int) -> List[Dict[str, object]]:
+        per_file: Dict[str, Dict[str, object]] = {}
+        for ev in self.events:
+            if ev.name not in PROFILED_FILE_FUNCTIONS:
+                continue
+            row = per_file.setdefault(ev.file, {"file": ev.file, "seconds": 0.0, "bytes": 0})
+            row["seconds"] += ev.duration_ns / 1e9
+            row["bytes"] += ev.nbytes
+        return sorted(per_file.values(), key=lambda row: (-row["seconds"], row["file"]))[:top]
+
+    def report(self, top: int) -> Dict[str, object]:
+        return {"rules": self.rule_stats(), "slowest_files": self.slowest_files(top)}
+
+    def report_text(self, top: int) -> str:
+        lines = [f"{'rule':<40} {'calls':>7} {'seconds':>10} {'bytes':>12} {'MB/s':>8}"]
+        for row in self.rule_stats():
+            rate = row["bytes"] / row["seconds"] / 1e6 if row["seconds"] and row["bytes"] else 0.0
+            lines.append(
+                f"{row['rule']:<40} {row['calls']:>7} {row['seconds']:>10.4f} {row['bytes']:>12} "
+                f"{(f'{rate:.1f}' if rate else '-'):>8}"
+            )
+        slowest = self.slowest_files(top)
+        if slowest:
+            lines.append("")
+            lines.append(f"slowest {len(slowest)} file(s):")
+            for row in slowest:
+                lines.append(f"  {row['seconds']:>10.4f}s {row['bytes']:>10} B  {row['file']}")
+        return "\n".join(lines) + "\n"
+
+    def chrome_trace(self) -> Dict[str, object]:
+        events = [
+            {
+                "name": ev.name,
+                "cat": "lint",
+                "ph": "X",
+                "ts": (ev.start_ns - self.origin_ns) / 1000,
+                "dur": ev.duration_ns / 1000,
+                "pid": ev.pid,
+                "tid": ev.pid,
+                "args": {"file": ev.file, "bytes": ev.nbytes},
+            }
+            for ev in sorted(self.events, key=lambda ev: ev.start_ns)
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def profile_subject(args: tuple) -> Tuple[str, int]:
+    """
+    Best-effort (file, bytes scanned) for a profiled call, derived from its positional args.
+    """
+    if not args:
+        return "", 0
+    first = args[0]
+    if isinstance(first, ParsedDoc):
+        return str(first.path or "<text>"), first.nbytes
+    if isinstance(first, Path):
+        # lint_manifest_contract_parity(path, manifest, docs, ...) scans the role docs.
+        if len(args) > 2 and isinstance(args[2], dict):
+            return str(first), sum(doc.nbytes for doc in args[2].values() if isinstance(doc, ParsedDoc))
+        try:
+            return str(first), first.stat().st_size
+        except OSError:
+            return str(first), 0
+    return "", 0
+
+
+def profiled(fn: Callable) -> Callable:
+    """
+    Time calls to fn into LintProfiler.active; a plain pass-through when profiling is off.
+    """
+    name = fn.__name__
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        profiler = LintProfiler.active
+        if profiler is None:
+            return fn(*args, **kwargs)
+        start_ns = time.perf_counter_ns()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            profiler.record(name, args, start_ns)
+
+    return wrapper
+
+
 def parse_meta(text: str, scan_lines: int = 40) -> Dict[str, str]:
-    lines = text.splitlines()[:scan_lines]
-    blob = "\n".join(lines)
+    return parse_meta_lines(text.splitlines(), scan_lines)
+
+
+def parse_meta_lines(lines: List[str], scan_lines: int = 40) -> Dict[str, str]:
+    blob = "\n".join(lines[:scan_lines])
     meta: Dict[str, str] = {}
     for key, pat in META_PATTERNS.items():
         m = pat.search(blob)
@@ -191,6 +665,52 @@ def parse_manifest(text: str) -> Dict[str, object]:
     return manifest
 
 
+def find_manifest_item_position(doc: ParsedDoc, key: str, item: str) -> Tuple[int, int]:
+    """
+    Locate a list item under a top-level manifest key as 1-based (line, col); (0, 0) if not found.
+    """
+    in_key = False
+    for line_no, raw in enumerate(doc.lines, start=1):
+        line = strip_inline_comment(raw)
+        if not line.strip():
+            continue
+        if not line.startswith(" "):
+            name, _, value = line.partition(":")
+            in_key = name.strip() == key
+            if in_key and item in parse_inline_list(value):
+                return line_no, raw.find(item) + 1
+            continue
+        if in_key and line.startswith("  - ") and unquote(line[4:]) == item:
+            return line_no, raw.find(item) + 1
+    return 0, 0
+
+
+def manifest_item_location(path: Path, manifest_doc: Optional[ParsedDoc], key: str, item: str) -> str:
+    if manifest_doc is not None:
+        line_no, col = find_manifest_item_position(manifest_doc, key, item)
+        if line_no:
+            return f"{path.name}:{line_no}:{col}"
+    return path.name
+
+
+class Finding(str):
+    """
+    A lint report line that carries the stable rule id of the check that emitted it. It is a
+    plain str everywhere the report text is used; Diagnostic and the LSP `code` read `rule`.
+    """
+
+    rule: str
+
+    def __new__(cls, rule: str, text: str) -> "Finding":
+        finding = super().__new__(cls, text)
+        finding.rule = rule
+        return finding
+
+    def __reduce__(self) -> Tuple[type, Tuple[str, str]]:
+        # Findings cross the worker-pool boundary; str's default pickling would drop the rule.
+        return (Finding, (self.rule, str(self)))
+
+
 def route_issue(msg: str, strict: bool, errs: List[str], warns: List[str]) -> None:
     if strict:
         errs.append(msg)
@@ -198,35 +718,51 @@ def route_issue(msg: str, strict: bool, errs: List[str], warns: List[str]) -> No
         warns.append(msg)
 
 
-def heading_titles_lower(text: str) -> List[str]:
-    return [title.lower() for _, title, _ in build_heading_index(text)]
+def heading_titles_lower(doc: ParsedDoc) -> List[str]:
+    return doc.titles_lower
 
 
-def find_heading_section_lines(text: str, needle: str) -> List[str]:
-    lines = text.splitlines()
-    headings = build_heading_index(text)
-    match = None
-    for level, title, li in headings:
-        if needle.lower() in title.lower():
-            match = (level, li)
-            break
-    if not match:
-        return []
+def find_heading_section_lines(doc: ParsedDoc, needle: str) -> List[str]:
+    needle_lower = needle.lower()
+    for span, title_lower in zip(doc.section_spans, doc.titles_lower):
+        if needle_lower in title_lower:
+            return doc.section_lines(span)
+    return []
+
+
+@lru_cache(maxsize=EMOJI_TOKEN_CACHE_SIZE)
+def canonical_emoji_token(token: str) -> str:
+    # Ignore text/emoji variation selectors so aliases like `🖨️` and `🖨` are the same
+    # token across renderers; text-default bases keep VS16, which makes them emoji at all.
+    stripped = VARIATION_SELECTOR_RE.sub("", token)
+    return EMOJI_TEXT_DEFAULT_RE.sub("\\g<0>\ufe0f", stripped)
+
+
+def iter_emoji_sequences(text: str) -> Iterator[str]:
+    for run in EMOJI_CANDIDATE_RE.finditer(text):
+        start = run.start()
+        if start and text[start] in "\ufe0f\u20e3" and text[start - 1] in EMOJI_KEYCAP_BASES:
+            start -= 1
+        yield from EMOJI_SEQUENCE_RE.findall(text, start, run.end())
 
-    level, start = match
-    end = len(lines)
-    for lvl, _, li in headings:
-        if li > start and lvl <= level:
-            end = li
-            break
-    return lines[start:end]
+
+@lru_cache(maxsize=EMOJI_TOKEN_CACHE_SIZE)
+def emoji_sequence_tokens(raw: str) -> Tuple[str, ...]:
+    """
+    Whole emoji sequences in raw, in order, each in canonical_emoji_token form. One regex pass
+    per distinct input: the same glossary cells, alias cells, and must_preserve items recur
+    across rules and manifests, so results are memoized.
+    """
+    return tuple(canonical_emoji_token(token) for token in iter_emoji_sequences(raw))
 
 
 def normalize_emoji_tokens(raw: str) -> str:
-    # Ignore text/emoji variation selectors so aliases like `🖨️` and `🖨`
-    # are treated as the same emoji token across renderers.
-    normalized = VARIATION_SELECTOR_RE.sub("", raw)
-    return "".join(EMOJI_RE.findall(normalized))
+    return "".join(emoji_sequence_tokens(raw))
+
+
+def contains_token_run(tokens: Tuple[str, ...], run: Tuple[str, ...]) -> bool:
+    n = len(run)
+    return n > 0 and any(tokens[i : i + n] == run for i in range(len(tokens) - n + 1))
 
 
 def is_pascal_case_term(raw: str) -> bool:
@@ -237,18 +773,24 @@ def is_pascal_case_term(raw: str) -> bool:
     return any(ch.islower() for ch in term)
 
 
-def extract_emoji_glossary_entries(text: str) -> List[Tuple[str, str, str]]:
-    entries: List[Tuple[str, str, str]] = []
-    section_lines = find_heading_section_lines(text, "EmojiGlossary")
-    if not section_lines:
+def extract_emoji_glossary_entries(doc: ParsedDoc) -> List[Tuple[str, str, str]]:
+    return [(emoji_tokens, term, meaning) for emoji_tokens, term, meaning, _ in extract_emoji_glossary_rows(doc)]
+
+
+def extract_emoji_glossary_rows(doc: ParsedDoc) -> List[Tuple[str, str, str, int]]:
+    """
+    Returns list of (emoji_tokens, term, meaning, line_index) for EmojiGlossary rows.
+    """
+    entries: List[Tuple[str, str, str, int]] = []
+    needle = "emojiglossary"
+    span = next((sp for sp, title in zip(doc.section_spans, doc.titles_lower) if needle in title), None)
+    if span is None:
         return entries
 
-    for raw in section_lines:
-        line = raw.strip()
-        if not line.startswith("|") or line.startswith("|---"):
-            continue
-        cells = [c.strip() for c in line.split("|")[1:-1]]
-        if len(cells) < 3:
+    _, _, start, end = span
+    for row in iter_table_rows(doc, start, end):
+        cells = row.cells
+        if row.is_separator or len(cells) < 3:
             continue
         emoji_cell = cells[0].replace("`", "").strip()
         term_cell = cells[1].replace("`", "").strip()
@@ -256,7 +798,7 @@ def extract_emoji_glossary_entries(text: str) -> List[Tuple[str, str, str]]:
         emoji_tokens = normalize_emoji_tokens(emoji_cell)
         if not emoji_tokens:
             continue
-        entries.append((emoji_tokens, term_cell, meaning_cell))
+        entries.append((emoji_tokens, term_cell, meaning_cell, row.line_index))
 
     return entries
 
@@ -269,7 +811,7 @@ def parse_emoji_pascal_token(raw: str) -> Tuple[str, str]:
     if not emoji_tokens:
         return "", ""
     # Remove emoji and variation selector marks to isolate a possible PascalCase term.
-    term = EMOJI_RE.sub("", token)
+    term = EMOJI_SEQUENCE_RE.sub("", token)
     term = re.sub(r"[\ufe0e\ufe0f\s]+", "", term)
     if not is_pascal_case_term(term):
         return "", ""
@@ -278,17 +820,30 @@ def parse_emoji_pascal_token(raw: str) -> Tuple[str, str]:
 
 def must_preserve_item_matches_pair(item: str, emoji_token: str, pascal_term: str) -> bool:
     cleaned = item.replace("`", "").strip()
-    item_emoji_tokens = normalize_emoji_tokens(cleaned)
-    return bool(emoji_token) and (emoji_token in item_emoji_tokens) and (pascal_term in cleaned)
+    # Token-level containment: `👨` must not match inside `👨‍💻`.
+    return contains_token_run(emoji_sequence_tokens(cleaned), emoji_sequence_tokens(emoji_token)) and (
+        pascal_term in cleaned
+    )
 
 
-def lint_userguide_completeness(path: Path, text: str, strict: bool, errs: List[str], warns: List[str]) -> None:
-    titles = heading_titles_lower(text)
-    nonempty_lines = [line for line in text.splitlines() if line.strip()]
+@profiled
+def lint_userguide_completeness(doc: ParsedDoc, strict: bool, errs: List[str], warns: List[str]) -> None:
+    path = doc.path
+    titles = heading_titles_lower(doc)
+    # Only the shortfall is reported, so counting can stop at the threshold.
+    nonempty_lines = 0
+    for line in doc.lines:
+        if line.strip():
+            nonempty_lines += 1
+            if nonempty_lines >= USERGUIDE_MIN_NONEMPTY_LINES:
+                break
 
-    if len(nonempty_lines) < USERGUIDE_MIN_NONEMPTY_LINES:
+    if nonempty_lines < USERGUIDE_MIN_NONEMPTY_LINES:
         route_issue(
-            f"{path.name}: UserGuide appears over-compressed ({len(nonempty_lines)} non-empty lines; expected >= {USERGUIDE_MIN_NONEMPTY_LINES})",
+            Finding(
+                "userguide-compressed",
+                f"{path.name}: UserGuide appears over-compressed ({nonempty_lines} non-empty lines; expected >= {USERGUIDE_MIN_NONEMPTY_LINES})",
+            ),
             strict,
             errs,
             warns,
@@ -296,7 +851,10 @@ def lint_userguide_completeness(path: Path, text: str, strict: bool, errs: List[
 
     if len(titles) < USERGUIDE_MIN_HEADINGS:
         route_issue(
-            f"{path.name}: UserGuide appears over-compressed ({len(titles)} headings; expected >= {USERGUIDE_MIN_HEADINGS})",
+            Finding(
+                "userguide-compressed",
+                f"{path.name}: UserGuide appears over-compressed ({len(titles)} headings; expected >= {USERGUIDE_MIN_HEADINGS})",
+            ),
             strict,
             errs,
             warns,
@@ -305,33 +863,54 @@ def lint_userguide_completeness(path: Path, text: str, strict: bool, errs: List[
     for label, keywords in REQUIRED_USERGUIDE_SECTION_GROUPS.items():
         if not any(any(key in title for key in keywords) for title in titles):
             route_issue(
-                f"{path.name}: UserGuide missing required section signal for {label}",
+                Finding(
+                    "userguide-section-signal",
+                    f"{path.name}: UserGuide missing required section signal for {label}",
+                ),
                 strict,
                 errs,
                 warns,
             )
 
 
-def lint_emoji_glossary_contract(path: Path, text: str, strict: bool, errs: List[str], warns: List[str]) -> None:
-    if not EMOJI_RE.search(text):
+@profiled
+def lint_emoji_glossary_contract(doc: ParsedDoc, strict: bool, errs: List[str], warns: List[str]) -> None:
+    path = doc.path
+    text = doc.text
+    if not EMOJI_SEQUENCE_RE.search(text):
         return
 
     if "EmojiGlossary" not in text:
-        errs.append(f"{path.name}: UserGuide contains emoji but no 'EmojiGlossary' section.")
+        errs.append(
+            Finding(
+                "emoji-glossary-missing",
+                f"{path.name}: UserGuide contains emoji but no 'EmojiGlossary' section.",
+            )
+        )
         return
 
-    section_lines = find_heading_section_lines(text, "EmojiGlossary")
+    section_lines = find_heading_section_lines(doc, "EmojiGlossary")
     if not section_lines:
-        errs.append(f"{path.name}: UserGuide contains emoji but 'EmojiGlossary' section could not be parsed.")
+        errs.append(
+            Finding(
+                "emoji-glossary-missing",
+                f"{path.name}: UserGuide contains emoji but 'EmojiGlossary' section could not be parsed.",
+            )
+        )
         return
 
     seen: Set[str] = set()
-    entries = extract_emoji_glossary_entries(text)
+    entries = extract_emoji_glossary_rows(doc)
 
-    for emoji_tokens, term_cell, meaning_cell in entries:
+    for emoji_tokens, term_cell, meaning_cell, line_idx in entries:
+        raw_line = doc.lines[line_idx]
+        where = doc.location(doc.line_starts[line_idx] + len(raw_line) - len(raw_line.lstrip()))
         if emoji_tokens in seen:
             route_issue(
-                f"{path.name}: EmojiGlossary contains duplicate emoji mapping for '{emoji_tokens}'",
+                Finding(
+                    "emoji-glossary-duplicate",
+                    f"{where}: EmojiGlossary contains duplicate emoji mapping for '{emoji_tokens}'",
+                ),
                 strict,
                 errs,
                 warns,
@@ -341,7 +920,10 @@ def lint_emoji_glossary_contract(path: Path, text: str, strict: bool, errs: List
 
         if not term_cell or not meaning_cell:
             route_issue(
-                f"{path.name}: EmojiGlossary must map emoji aliases to non-empty term and meaning fields.",
+                Finding(
+                    "emoji-glossary-fields",
+                    f"{where}: EmojiGlossary must map emoji aliases to non-empty term and meaning fields.",
+                ),
                 strict,
                 errs,
                 warns,
@@ -349,14 +931,22 @@ def lint_emoji_glossary_contract(path: Path, text: str, strict: bool, errs: List
 
     if not entries:
         route_issue(
-            f"{path.name}: EmojiGlossary exists but no valid emoji mapping rows were found.",
+            Finding(
+                "emoji-glossary-empty",
+                f"{path.name}: EmojiGlossary exists but no valid emoji mapping rows were found.",
+            ),
             strict,
             errs,
             warns,
         )
 
 
-def lint_inline_code_emoji_render_safety(path: Path, text: str, strict: bool, errs: List[str], warns: List[str]) -> None:
+@profiled
+def lint_inline_code_emoji_render_safety(doc: ParsedDoc, strict: bool, errs: List[str], warns: List[str]) -> None:
+    text = doc.text
+    # Only a backtick directly followed by a variation selector can open such a span.
+    if "`\ufe0e" not in text and "`\ufe0f" not in text:
+        return
     # Variation-selector-leading spans can indicate dropped emoji bases.
     # If no emoji can be recovered after normalization, treat the span as
     # corrupted render noise and ignore it.
@@ -365,9 +955,11 @@ def lint_inline_code_emoji_render_safety(path: Path, text: str, strict: bool, er
         if token and token[0] in ("\ufe0e", "\ufe0f"):
             if not normalize_emoji_tokens(token):
                 continue
-            line_no = text.count("\n", 0, m.start()) + 1
             route_issue(
-                f"{path.name}:{line_no}: inline code span starts with variation selector; likely missing emoji base token",
+                Finding(
+                    "inline-emoji-render",
+                    f"{doc.location(m.start())}: inline code span starts with variation selector; likely missing emoji base token",
+                ),
                 strict,
                 errs,
                 warns,
@@ -381,13 +973,16 @@ def extract_first_text_codeblock(text: str) -> str:
     return m.group(1)
 
 
-def lint_global_instruction_codeblock_size(
-    path: Path, text: str, strict: bool, errs: List[str], warns: List[str]
-) -> None:
-    block = extract_first_text_codeblock(text)
+@profiled
+def lint_global_instruction_codeblock_size(doc: ParsedDoc, strict: bool, errs: List[str], warns: List[str]) -> None:
+    path = doc.path
+    block = extract_first_text_codeblock(doc.text)
     if not block:
         route_issue(
-            f"{path.name}: missing ```text fenced block for copy/paste instructions",
+            Finding(
+                "global-codeblock-missing",
+                f"{path.name}: missing ```text fenced block for copy/paste instructions",
+            ),
             strict,
             errs,
             warns,
@@ -399,14 +994,20 @@ def lint_global_instruction_codeblock_size(
 
     if char_count > GLOBAL_INSTRUCTION_CODEBLOCK_MAX_CHARS:
         errs.append(
-            f"{path.name}: instruction code block length {char_count} exceeds ModuleMill budget {GLOBAL_INSTRUCTION_CODEBLOCK_MAX_CHARS} "
-            f"(ChatGPT limit {CHATGPT_CUSTOM_INSTRUCTIONS_MAX_CHARS} minus reserved {GLOBAL_INSTRUCTION_RESERVED_PERSONALIZATION_CHARS})"
+            Finding(
+                "global-codeblock-size",
+                f"{path.name}: instruction code block length {char_count} exceeds ModuleMill budget {GLOBAL_INSTRUCTION_CODEBLOCK_MAX_CHARS} "
+                f"(ChatGPT limit {CHATGPT_CUSTOM_INSTRUCTIONS_MAX_CHARS} minus reserved {GLOBAL_INSTRUCTION_RESERVED_PERSONALIZATION_CHARS})",
+            )
         )
         return
 
     if char_count > GLOBAL_INSTRUCTION_CODEBLOCK_SOFT_TARGET:
         route_issue(
-            f"{path.name}: instruction code block length {char_count} exceeds soft target {GLOBAL_INSTRUCTION_CODEBLOCK_SOFT_TARGET}",
+            Finding(
+                "global-codeblock-size",
+                f"{path.name}: instruction code block length {char_count} exceeds soft target {GLOBAL_INSTRUCTION_CODEBLOCK_SOFT_TARGET}",
+            ),
             strict,
             errs,
             warns,
@@ -421,32 +1022,39 @@ def normalize_canon_command(raw: str) -> str:
     return token
 
 
-def extract_userguide_canon_commands(text: str) -> List[str]:
-    commands: List[str] = []
-    in_command_table = False
-
-    for raw in text.splitlines():
-        line = raw.strip()
-        if not line.startswith("|"):
-            if in_command_table and line:
-                in_command_table = False
-            continue
+def iter_table_rows(doc: ParsedDoc, start: int = 0, end: Optional[int] = None) -> Iterator[TableRow]:
+    """
+    Yield every table row whose source line falls in [start, end).
+    """
+    for table in doc.tables:
+        for row in table.rows:
+            if row.line_index >= start and (end is None or row.line_index < end):
+                yield row
 
-        cells = [c.strip() for c in line.split("|")[1:-1]]
-        if len(cells) < 2:
-            continue
 
-        if cells[0].lower() == "command" and cells[1].lower() == "canon":
-            in_command_table = True
-            continue
+def iter_command_table_rows(doc: ParsedDoc) -> Iterator[TableRow]:
+    """
+    Yield data rows of canon command tables: rows after a `Command | Canon` header row
+    within the same table, skipping separator rows.
+    """
+    for table in doc.tables:
+        in_command_table = False
+        for row in table.rows:
+            cells = row.cells
+            if len(cells) < 2:
+                continue
+            if cells[0].lower() == "command" and cells[1].lower() == "canon":
+                in_command_table = True
+                continue
+            if in_command_table and not row.is_separator:
+                yield row
 
-        if not in_command_table:
-            continue
 
-        if set("".join(cells)) <= {"-", " "}:
-            continue
+def extract_userguide_canon_commands(doc: ParsedDoc) -> List[str]:
+    commands: List[str] = []
 
-        canon_cell = cells[1]
+    for row in iter_command_table_rows(doc):
+        canon_cell = row.cells[1]
         m = re.search(r"`([^`]+)`", canon_cell)
         canon = normalize_canon_command(m.group(1) if m else canon_cell)
         if canon and canon not in commands:
@@ -455,102 +1063,213 @@ def extract_userguide_canon_commands(text: str) -> List[str]:
     return commands
 
 
-def extract_userguide_command_alias_emoji_map(text: str) -> List[Tuple[str, str]]:
-    aliases: List[Tuple[str, str]] = []
-    in_command_table = False
-
-    for raw in text.splitlines():
-        line = raw.strip()
-        if not line.startswith("|"):
-            if in_command_table and line:
-                in_command_table = False
-            continue
+def extract_userguide_command_alias_emoji_map(doc: ParsedDoc) -> List[Tuple[str, Tuple[str, ...]]]:
+    aliases: List[Tuple[str, Tuple[str, ...]]] = []
 
-        cells = [c.strip() for c in line.split("|")[1:-1]]
+    for row in iter_command_table_rows(doc):
+        cells = row.cells
         if len(cells) < 3:
             continue
 
-        if cells[0].lower() == "command" and cells[1].lower() == "canon":
-            in_command_table = True
-            continue
-
-        if not in_command_table:
-            continue
-
-        if set("".join(cells)) <= {"-", " "}:
-            continue
-
         command_label = cells[0].replace("`", "").strip()
         alias_cell = cells[2].replace("`", "").strip()
-        emoji_tokens = normalize_emoji_tokens(alias_cell)
+        emoji_tokens = emoji_sequence_tokens(alias_cell)
         if not command_label or not emoji_tokens:
             continue
 
         # Preserve appearance order while removing duplicates.
-        dedup_tokens = "".join(dict.fromkeys(emoji_tokens))
-        aliases.append((command_label, dedup_tokens))
+        aliases.append((command_label, tuple(dict.fromkeys(emoji_tokens))))
 
     return aliases
 
 
-def extract_namespaced_state_keys(text: str, module: str) -> List[str]:
-    keys: List[str] = []
+def extract_namespaced_state_keys(doc: ParsedDoc, module: str) -> List[str]:
+    return [key for key, _ in extract_namespaced_state_key_offsets(doc, module)]
+
+
+def extract_namespaced_state_key_offsets(doc: ParsedDoc, module: str) -> List[Tuple[str, int]]:
+    """
+    Returns list of (state_key, first_offset) from 'state' sections, or the whole doc if none exist.
+    """
+    keys: Dict[str, int] = {}
     module_prefix = f"{module.lower()}."
-    sections: List[str] = []
-    headings = build_heading_index(text)
-    lines = text.splitlines()
+    ranges: List[Tuple[int, int]] = []
 
-    for idx, (level, title, start) in enumerate(headings):
-        if "state" not in title.lower():
+    for (_, _, start, end), title_lower in zip(doc.section_spans, doc.titles_lower):
+        if "state" not in title_lower:
             continue
-        end = len(lines)
-        for lvl, _, li in headings[idx + 1 :]:
-            if li > start and lvl <= level:
-                end = li
-                break
-        sections.append("\n".join(lines[start:end]))
+        ranges.append((doc.line_starts[start], doc.line_starts[end]))
+
+    if not ranges:
+        ranges.append((0, len(doc.text)))
+    for pos, endpos in ranges:
+        for m in STATE_KEY_RE.finditer(doc.text, pos, endpos):
+            key = m.group(1)
+            if key.startswith(module_prefix) and key.count(".") == 1 and key not in keys:
+                keys[key] = m.start(1)
+    return list(keys.items())
 
-    scan_text = "\n".join(sections) if sections else text
-    for m in STATE_KEY_RE.finditer(scan_text):
-        key = m.group(1)
-        if key.startswith(module_prefix) and key.count(".") == 1 and key not in keys:
-            keys.append(key)
-    return keys
 
+class TermMatcher:
+    """
+    Multi-term substring matcher that returns the first offset of every needle found in a text.
+    Large needle sets run through one Aho-Corasick automaton pass per text; smaller sets use
+    per-needle str.find, which is faster in CPython below AHO_CORASICK_MIN_TERMS needles.
+    """
 
+    def __init__(self, needles: Iterable[str]) -> None:
+        self.needles = list(dict.fromkeys(n for n in needles if n))
+        self.goto: List[Dict[str, int]] = []
+        self.fail: List[int] = []
+        self.out: List[List[str]] = []
+        if len(self.needles) >= AHO_CORASICK_MIN_TERMS:
+            self._build()
+
+    def _build(self) -> None:
+        goto: List[Dict[str, int]] = [{}]
+        out: List[List[str]] = [[]]
+        for needle in self.needles:
+            state = 0
+            for ch in needle:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto.append({})
+                    out.append([])
+                    goto[state][ch] = nxt
+                state = nxt
+            out[state].append(needle)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fallback = goto[f].get(ch, 0)
+                fail[nxt] = fallback if fallback != nxt else 0
+                out[nxt] = out[nxt] + out[fail[nxt]]
+
+        self.goto = goto
+        self.fail = fail
+        self.out = out
+
+    def find_first(self, text: str) -> Dict[str, int]:
+        found: Dict[str, int] = {}
+        if not text:
+            return found
+        if not self.goto:
+            for needle in self.needles:
+                pos = text.find(needle)
+                if pos >= 0:
+                    found[needle] = pos
+            return found
+
+        goto, fail, out = self.goto, self.fail, self.out
+        total = len(self.needles)
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                for needle in out[state]:
+                    if needle not in found:
+                        found[needle] = i - len(needle) + 1
+                if len(found) == total:
+                    break
+        return found
+
+
+def describe_term_hits(needle: str, hits: Dict[str, Dict[str, int]], docs: Dict[str, ParsedDoc], skip: str) -> str:
+    where = [
+        docs[role].location(docs[role].text_offset(found[needle]))
+        for role, found in hits.items()
+        if role != skip and needle in found
+    ]
+    return f" (found in {', '.join(where)})" if where else ""
+
+
+@profiled
 def lint_manifest_contract_parity(
     path: Path,
     manifest: Dict[str, object],
-    doc_texts: Dict[str, str],
+    docs: Dict[str, ParsedDoc],
     strict: bool,
     errs: List[str],
     warns: List[str],
+    manifest_doc: Optional[ParsedDoc] = None,
 ) -> None:
     module = str(manifest.get("module", "")).strip()
-    userguide_text = doc_texts.get("userguide", "")
-    machinemanual_text = doc_texts.get("machinemanual", "")
-    quickref_text = doc_texts.get("quickref", "")
+    empty_doc = ParsedDoc("")
+    userguide = docs.get("userguide", empty_doc)
+    machinemanual = docs.get("machinemanual", empty_doc)
+    quickref = docs.get("quickref", empty_doc)
+    userguide_text = userguide.text
+    machinemanual_text = machinemanual.text
+    quickref_text = quickref.text
     intent_policy = str(manifest.get("intent_policy", "")).strip()
 
     must_preserve = manifest.get("must_preserve", [])
     if not isinstance(must_preserve, list):
-        errs.append(f"{path.name}: 'must_preserve' must be a list")
+        errs.append(Finding("manifest-list-type", f"{path.name}: 'must_preserve' must be a list"))
         must_preserve = []
 
     for i, item in enumerate(must_preserve, start=1):
         if not isinstance(item, str) or not item.strip():
-            errs.append(f"{path.name}: must_preserve item #{i} must be a non-empty string")
+            errs.append(
+                Finding(
+                    "parity-must-preserve",
+                    f"{path.name}: must_preserve item #{i} must be a non-empty string",
+                )
+            )
+
+    must_preserve_runtime = manifest.get("must_preserve_runtime", [])
 
     glossary_entries: List[Tuple[str, str, str]] = []
     if userguide_text:
-        glossary_entries = extract_emoji_glossary_entries(userguide_text)
+        glossary_entries = extract_emoji_glossary_entries(userguide)
+
+    strict_checks = strict and bool(module)
+    command_alias_emoji: List[Tuple[str, Tuple[str, ...]]] = []
+    ug_state_keys: List[Tuple[str, int]] = []
+    lifecycle_commands: List[str] = []
+    if strict_checks:
+        command_alias_emoji = extract_userguide_command_alias_emoji_map(userguide)
+        if userguide_text and machinemanual_text:
+            ug_state_keys = extract_namespaced_state_key_offsets(userguide, module)
+            lifecycle_commands = [
+                cmd
+                for cmd in extract_userguide_canon_commands(userguide)
+                if any(cmd.lower().endswith(f" {verb}") for verb in LIFECYCLE_VERBS)
+            ]
+
+    # One matcher over every parity needle for this manifest, run once per role doc on its
+    # lowercase text. Emoji alias tokens are checked against each doc's emoji_tokens instead.
+    needles: List[str] = []
+    for items in (must_preserve, must_preserve_runtime):
+        if not isinstance(items, list):
+            continue
+        needles.extend(item.strip().lower() for item in items if isinstance(item, str) and item.strip())
+    for keywords in INTENT_SIGNAL_KEYWORDS.values():
+        needles.extend(keywords)
+    needles.extend(key.lower() for key, _ in ug_state_keys)
+    needles.extend(cmd.lower() for cmd in lifecycle_commands)
+    matcher = TermMatcher(needles)
+    role_docs = {"userguide": userguide, "machinemanual": machinemanual, "quickref": quickref}
+    hits = {role: matcher.find_first(role_doc.lower) for role, role_doc in role_docs.items() if role_doc.text}
+    ug_hits = hits.get("userguide", {})
+    mm_hits = hits.get("machinemanual", {})
+    qr_hits = hits.get("quickref", {})
 
     if userguide_text and isinstance(must_preserve, list):
-        userguide_lower = userguide_text.lower()
         for item in must_preserve:
             if isinstance(item, str) and item.strip():
                 raw_item = item.strip()
-                if raw_item.lower() in userguide_lower:
+                if raw_item.lower() in ug_hits:
                     continue
                 emoji_token, pascal_term = parse_emoji_pascal_token(raw_item)
                 if emoji_token and pascal_term:
@@ -559,53 +1278,71 @@ def lint_manifest_contract_parity(
                         for g_emoji, g_term, _ in glossary_entries
                     ):
                         continue
-                if raw_item.lower() not in userguide_lower:
-                    errs.append(
-                        f"{path.name}: must_preserve term missing from UserGuide: '{item}'"
+                errs.append(
+                    Finding(
+                        "parity-must-preserve",
+                        f"{manifest_item_location(path, manifest_doc, 'must_preserve', item)}: "
+                        f"must_preserve term missing from UserGuide: '{item}'"
+                        f"{describe_term_hits(raw_item.lower(), hits, role_docs, 'userguide')}",
                     )
+                )
 
-    must_preserve_runtime = manifest.get("must_preserve_runtime", [])
     if must_preserve_runtime and not isinstance(must_preserve_runtime, list):
-        errs.append(f"{path.name}: 'must_preserve_runtime' must be a list when provided")
+        errs.append(Finding("manifest-list-type", f"{path.name}: 'must_preserve_runtime' must be a list when provided"))
         must_preserve_runtime = []
 
     for i, item in enumerate(must_preserve_runtime, start=1):
         if not isinstance(item, str) or not item.strip():
-            errs.append(f"{path.name}: must_preserve_runtime item #{i} must be a non-empty string")
+            errs.append(
+                Finding(
+                    "parity-must-preserve-runtime",
+                    f"{path.name}: must_preserve_runtime item #{i} must be a non-empty string",
+                )
+            )
 
     if isinstance(must_preserve_runtime, list) and must_preserve_runtime:
-        runtime_docs = {
-            "UserGuide": userguide_text,
-            "MachineManual": machinemanual_text,
-            "QuickRefCard": quickref_text,
+        runtime_roles = {
+            "UserGuide": "userguide",
+            "MachineManual": "machinemanual",
+            "QuickRefCard": "quickref",
         }
         for item in must_preserve_runtime:
             if not isinstance(item, str) or not item.strip():
                 continue
             needle = item.strip().lower()
-            for role, role_text in runtime_docs.items():
-                if not role_text:
+            for role, role_key in runtime_roles.items():
+                if not role_docs[role_key].text:
                     errs.append(
-                        f"{path.name}: must_preserve_runtime requires docs.{role.lower()} text for term '{item}'"
+                        Finding(
+                            "parity-must-preserve-runtime",
+                            f"{path.name}: must_preserve_runtime requires docs.{role.lower()} text for term '{item}'",
+                        )
                     )
                     continue
-                if needle not in role_text.lower():
+                if needle not in hits[role_key]:
                     errs.append(
-                        f"{path.name}: must_preserve_runtime term missing from {role}: '{item}'"
+                        Finding(
+                            "parity-must-preserve-runtime",
+                            f"{manifest_item_location(path, manifest_doc, 'must_preserve_runtime', item)}: "
+                            f"must_preserve_runtime term missing from {role}: '{item}'"
+                            f"{describe_term_hits(needle, hits, role_docs, role_key)}",
+                        )
                     )
 
     if intent_policy == "infer_high_confidence" and userguide_text:
-        userguide_lower = userguide_text.lower()
         missing_signals: List[str] = []
         for label, keywords in INTENT_SIGNAL_KEYWORDS.items():
-            if not any(key in userguide_lower for key in keywords):
+            if not any(key in ug_hits for key in keywords):
                 missing_signals.append(label)
         if missing_signals:
             warns.append(
-                f"{path.name}: intent_policy=infer_high_confidence but UserGuide is missing signal(s): {', '.join(missing_signals)}"
+                Finding(
+                    "parity-intent-signals",
+                    f"{path.name}: intent_policy=infer_high_confidence but UserGuide is missing signal(s): {', '.join(missing_signals)}",
+                )
             )
 
-    if not strict or not module:
+    if not strict_checks:
         return
 
     # Global anti-drift rule: any Emoji + PascalCase feature token defined in EmojiGlossary
@@ -618,61 +1355,89 @@ def lint_manifest_contract_parity(
             for item in must_preserve
         ):
             errs.append(
-                f"{path.name}: missing must_preserve anti-drift entry for Emoji+PascalCase token '{emoji_token}{term_cell}'"
+                Finding(
+                    "parity-emoji-pascal",
+                    f"{path.name}: missing must_preserve anti-drift entry for Emoji+PascalCase token '{emoji_token}{term_cell}'",
+                )
             )
 
-    command_alias_emoji = extract_userguide_command_alias_emoji_map(userguide_text)
     for command_label, emoji_tokens in command_alias_emoji:
-        missing_mm = [token for token in emoji_tokens if token not in machinemanual_text]
+        missing_mm = [token for token in emoji_tokens if token not in machinemanual.emoji_tokens]
         if missing_mm:
             errs.append(
-                f"{path.name}: MachineManual missing emoji alias token(s) for command '{command_label}': {''.join(missing_mm)}"
+                Finding(
+                    "parity-emoji-alias",
+                    f"{path.name}: MachineManual missing emoji alias token(s) for command '{command_label}': {''.join(missing_mm)}",
+                )
             )
         if quickref_text:
-            missing_qr = [token for token in emoji_tokens if token not in quickref_text]
+            missing_qr = [token for token in emoji_tokens if token not in quickref.emoji_tokens]
             if missing_qr:
                 errs.append(
-                    f"{path.name}: QuickRefCard missing emoji alias token(s) for command '{command_label}': {''.join(missing_qr)}"
+                    Finding(
+                        "parity-emoji-alias",
+                        f"{path.name}: QuickRefCard missing emoji alias token(s) for command '{command_label}': {''.join(missing_qr)}",
+                    )
                 )
 
     if userguide_text and machinemanual_text:
-        ug_state_keys = extract_namespaced_state_keys(userguide_text, module)
-        mm_lower = machinemanual_text.lower()
-        missing_state = [k for k in ug_state_keys if k.lower() not in mm_lower]
+        missing_state = [f"{k} ({userguide.location(offset)})" for k, offset in ug_state_keys if k.lower() not in mm_hits]
         if missing_state:
             errs.append(
-                f"{path.name}: MachineManual missing namespaced state key(s) from UserGuide: {', '.join(missing_state)}"
+                Finding(
+                    "parity-state-keys",
+                    f"{path.name}: MachineManual missing namespaced state key(s) from UserGuide: {', '.join(missing_state)}",
+                )
             )
 
-        canon_commands = extract_userguide_canon_commands(userguide_text)
-        lifecycle_commands = [
-            cmd
-            for cmd in canon_commands
-            if any(cmd.lower().endswith(f" {verb}") for verb in LIFECYCLE_VERBS)
-        ]
-        missing_lifecycle = [cmd for cmd in lifecycle_commands if cmd.lower() not in mm_lower]
+        missing_lifecycle = [cmd for cmd in lifecycle_commands if cmd.lower() not in mm_hits]
         if missing_lifecycle:
             errs.append(
-                f"{path.name}: MachineManual missing lifecycle canon command(s): {', '.join(missing_lifecycle)}"
+                Finding(
+                    "parity-lifecycle",
+                    f"{path.name}: MachineManual missing lifecycle canon command(s): {', '.join(missing_lifecycle)}",
+                )
             )
 
         if quickref_text:
-            qr_lower = quickref_text.lower()
-            missing_qr_lifecycle = [cmd for cmd in lifecycle_commands if cmd.lower() not in qr_lower]
+            missing_qr_lifecycle = [cmd for cmd in lifecycle_commands if cmd.lower() not in qr_hits]
             if missing_qr_lifecycle:
                 warns.append(
-                    f"{path.name}: QuickRefCard missing lifecycle canon command text for: {', '.join(missing_qr_lifecycle)}"
+                    Finding(
+                        "parity-lifecycle",
+                        f"{path.name}: QuickRefCard missing lifecycle canon command text for: {', '.join(missing_qr_lifecycle)}",
+                    )
                 )
 
 
-def lint_markdown_file(path: Path, strict: bool = False, require_manifest: bool = False) -> Tuple[List[str], List[str]]:
-    text = read_text(path)
-    meta = parse_meta(text)
+def load_doc(path: Path, doc_cache: Optional[Dict[Path, ParsedDoc]] = None) -> ParsedDoc:
+    """
+    Read and wrap a markdown file, reusing an already-parsed copy from doc_cache when present.
+    """
+    if doc_cache is None:
+        return ParsedDoc.load(path)
+    doc = doc_cache.get(path)
+    if doc is None:
+        doc = ParsedDoc.load(path)
+        doc_cache[path] = doc
+    return doc
+
+
+@profiled
+def lint_markdown_file(
+    path: Path,
+    strict: bool = False,
+    require_manifest: bool = False,
+    doc_cache: Optional[Dict[Path, ParsedDoc]] = None,
+) -> Tuple[List[str], List[str]]:
+    doc = load_doc(path, doc_cache)
+    text = doc.text
+    meta = doc.meta
     errs: List[str] = []
     warns: List[str] = []
 
     if path.name in GLOBAL_INSTRUCTION_FILENAMES:
-        lint_global_instruction_codeblock_size(path, text, strict, errs, warns)
+        lint_global_instruction_codeblock_size(doc, strict, errs, warns)
         return errs, warns
 
     # Bundle files intentionally aggregate multiple docs and do not map to one DocRole.
@@ -686,35 +1451,51 @@ def lint_markdown_file(path: Path, strict: bool = False, require_manifest: bool
 
     for req in ("ModuleID", "Version", "DocRole", "Audience"):
         if req not in meta:
-            errs.append(f"{path.name}: missing {req} in first ~40 lines")
+            errs.append(Finding("meta-missing", f"{path.name}: missing {req} in first ~40 lines"))
 
     role = meta.get("DocRole", "")
     if role and role not in DOC_ROLES:
-        errs.append(f"{path.name}: DocRole '{role}' not in {sorted(DOC_ROLES)}")
+        errs.append(Finding("meta-docrole", f"{path.name}: DocRole '{role}' not in {sorted(DOC_ROLES)}"))
 
     # Basic role hygiene (lightweight heuristics, not a full classifier)
     if role == "QuickRefCard":
-        if "rationale" in text.lower()[:2000]:
-            errs.append(f"{path.name}: QuickRefCard contains 'rationale' near top (role bleed risk)")
-        if len(text.splitlines()) > 220:
-            errs.append(f"{path.name}: QuickRefCard is very long (>220 lines). Consider slimming.")
+        if "rationale" in doc.lower[:2000]:
+            errs.append(
+                Finding(
+                    "quickref-rationale",
+                    f"{path.name}: QuickRefCard contains 'rationale' near top (role bleed risk)",
+                )
+            )
+        if len(doc.lines) > 220:
+            errs.append(
+                Finding(
+                    "quickref-length",
+                    f"{path.name}: QuickRefCard is very long (>220 lines). Consider slimming.",
+                )
+            )
 
     module_id = meta.get("ModuleID", "")
-    lint_inline_code_emoji_render_safety(path, text, strict, errs, warns)
+    lint_inline_code_emoji_render_safety(doc, strict, errs, warns)
 
     # Encourage canon command table markers in runtime UserGuides.
     if role == "UserGuide" and module_id not in FRAMEWORK_MODULE_IDS:
-        lint_userguide_completeness(path, text, strict, errs, warns)
-        lint_emoji_glossary_contract(path, text, strict, errs, warns)
+        lint_userguide_completeness(doc, strict, errs, warns)
+        lint_emoji_glossary_contract(doc, strict, errs, warns)
 
         missing_markers = [m for m in sorted(REQUIRED_COMMAND_MARKERS) if m not in text]
         if missing_markers:
-            msg = f"{path.name}: UserGuide missing canon command markers: {', '.join(missing_markers)}"
+            msg = Finding(
+                "userguide-command-markers",
+                f"{path.name}: UserGuide missing canon command markers: {', '.join(missing_markers)}",
+            )
             route_issue(msg, strict, errs, warns)
 
         manifest_path = path.parent / "ModuleManifest.yaml"
-        if not manifest_path.exists():
-            msg = f"{path.name}: missing sibling ModuleManifest.yaml in {path.parent}"
+        if not input_exists(manifest_path):
+            msg = Finding(
+                "userguide-sibling-manifest",
+                f"{path.name}: missing sibling ModuleManifest.yaml in {path.parent}",
+            )
             if require_manifest or strict:
                 errs.append(msg)
             else:
@@ -723,27 +1504,54 @@ def lint_markdown_file(path: Path, strict: bool = False, require_manifest: bool
     return errs, warns
 
 
-def lint_manifest_file(path: Path, strict: bool = False) -> Tuple[List[str], List[str]]:
-    text = read_text(path)
-    manifest = parse_manifest(text)
+def is_template_manifest(path: Path, module: str) -> bool:
+    return any(part.lower() == "templates" for part in path.parts) or "<" in module or ">" in module
+
+
+@profiled
+def lint_manifest_file(
+    path: Path, strict: bool = False, doc_cache: Optional[Dict[Path, ParsedDoc]] = None
+) -> Tuple[List[str], List[str]]:
+    manifest_doc = load_doc(path, doc_cache)
+    manifest = parse_manifest(manifest_doc.text)
     errs: List[str] = []
     warns: List[str] = []
 
     missing_keys = [k for k in sorted(REQUIRED_MANIFEST_KEYS) if k not in manifest]
     if missing_keys:
-        errs.append(f"{path.name}: missing required key(s): {', '.join(missing_keys)}")
+        errs.append(
+            Finding(
+                "manifest-required-keys",
+                f"{path.name}: missing required key(s): {', '.join(missing_keys)}",
+            )
+        )
 
     engage_policy = str(manifest.get("engage_policy", "")).strip()
     if engage_policy and engage_policy not in ENGAGE_POLICIES:
-        errs.append(f"{path.name}: engage_policy '{engage_policy}' not in {sorted(ENGAGE_POLICIES)}")
+        errs.append(
+            Finding(
+                "manifest-engage-policy",
+                f"{path.name}: engage_policy '{engage_policy}' not in {sorted(ENGAGE_POLICIES)}",
+            )
+        )
 
     intent_policy = str(manifest.get("intent_policy", "")).strip()
     if intent_policy and intent_policy not in INTENT_POLICIES:
-        errs.append(f"{path.name}: intent_policy '{intent_policy}' not in {sorted(INTENT_POLICIES)}")
+        errs.append(
+            Finding(
+                "manifest-intent-policy",
+                f"{path.name}: intent_policy '{intent_policy}' not in {sorted(INTENT_POLICIES)}",
+            )
+        )
 
     version = str(manifest.get("version", "")).strip()
     if version and not re.match(r"^[0-9]+\.[0-9]+(?:\.[0-9]+)?$", version):
-        errs.append(f"{path.name}: version '{version}' is not SemVer-like (MAJOR.MINOR[.PATCH])")
+        errs.append(
+            Finding(
+                "manifest-version",
+                f"{path.name}: version '{version}' is not SemVer-like (MAJOR.MINOR[.PATCH])",
+            )
+        )
 
     for list_key in (
         "module_aliases",
@@ -754,68 +1562,75 @@ def lint_manifest_file(path: Path, strict: bool = False) -> Tuple[List[str], Lis
         "must_preserve_runtime",
     ):
         if list_key in manifest and not isinstance(manifest.get(list_key), list):
-            errs.append(f"{path.name}: '{list_key}' must be a list")
+            errs.append(Finding("manifest-list-type", f"{path.name}: '{list_key}' must be a list"))
 
     module_emoji = str(manifest.get("module_emoji", "")).strip()
-    if module_emoji and not EMOJI_RE.search(module_emoji):
-        errs.append(f"{path.name}: module_emoji must contain an emoji token")
+    if module_emoji and not EMOJI_SEQUENCE_RE.search(module_emoji):
+        errs.append(Finding("manifest-module-emoji", f"{path.name}: module_emoji must contain an emoji token"))
 
     docs = manifest.get("docs", {})
     if not isinstance(docs, dict):
-        errs.append(f"{path.name}: 'docs' must be a mapping")
+        errs.append(Finding("manifest-docs", f"{path.name}: 'docs' must be a mapping"))
         docs = {}
 
     missing_doc_keys = [k for k in sorted(REQUIRED_MANIFEST_DOC_KEYS) if k not in docs]
     if missing_doc_keys:
-        errs.append(f"{path.name}: docs missing key(s): {', '.join(missing_doc_keys)}")
-
-    role_expectations = {
-        "install": "Install",
-        "quickref": "QuickRefCard",
-        "machinemanual": "MachineManual",
-        "userguide": "UserGuide",
-    }
+        errs.append(Finding("manifest-docs", f"{path.name}: docs missing key(s): {', '.join(missing_doc_keys)}"))
 
     module = str(manifest.get("module", "")).strip()
-    is_template_manifest = any(part.lower() == "templates" for part in path.parts) or "<" in module or ">" in module
+    is_template = is_template_manifest(path, module)
 
-    doc_texts: Dict[str, str] = {}
+    role_docs: Dict[str, ParsedDoc] = {}
 
-    for doc_key, expected_role in role_expectations.items():
+    for doc_key, expected_role in MANIFEST_DOC_ROLES.items():
         rel = str(docs.get(doc_key, "")).strip()
         if not rel:
             continue
 
-        if is_template_manifest:
+        if is_template:
             continue
 
         doc_path = path.parent / rel
-        if not doc_path.exists():
-            errs.append(f"{path.name}: docs.{doc_key} points to missing file '{rel}'")
+        if not input_exists(doc_path):
+            errs.append(Finding("manifest-doc-pointer", f"{path.name}: docs.{doc_key} points to missing file '{rel}'"))
             continue
 
         if doc_path.suffix.lower() != ".md":
-            warns.append(f"{path.name}: docs.{doc_key} expected markdown file, got '{rel}'")
+            warns.append(
+                Finding(
+                    "manifest-doc-pointer",
+                    f"{path.name}: docs.{doc_key} expected markdown file, got '{rel}'",
+                )
+            )
             continue
 
-        doc_text = read_text(doc_path)
-        doc_texts[doc_key] = doc_text
-        doc_meta = parse_meta(doc_text)
+        role_doc = load_doc(doc_path, doc_cache)
+        role_docs[doc_key] = role_doc
+        doc_meta = role_doc.meta
         doc_role = doc_meta.get("DocRole", "")
         if doc_role and doc_role != expected_role:
             errs.append(
-                f"{path.name}: docs.{doc_key} points to {doc_path.name} with DocRole '{doc_role}', expected '{expected_role}'"
+                Finding(
+                    "manifest-doc-role",
+                    f"{path.name}: docs.{doc_key} points to {doc_path.name} with DocRole '{doc_role}', expected '{expected_role}'",
+                )
             )
 
         doc_module = doc_meta.get("ModuleID", "")
         if module and doc_module and doc_module != module:
             errs.append(
-                f"{path.name}: docs.{doc_key} module mismatch ({doc_module} != {module})"
+                Finding(
+                    "manifest-doc-module",
+                    f"{path.name}: docs.{doc_key} module mismatch ({doc_module} != {module})",
+                )
             )
 
         doc_version = doc_meta.get("Version", "")
         if version and doc_version and doc_version != version:
-            msg = f"{path.name}: docs.{doc_key} version mismatch ({doc_version} != {version})"
+            msg = Finding(
+                "manifest-doc-version",
+                f"{path.name}: docs.{doc_key} version mismatch ({doc_version} != {version})",
+            )
             if strict:
                 errs.append(msg)
             else:
@@ -823,10 +1638,15 @@ def lint_manifest_file(path: Path, strict: bool = False) -> Tuple[List[str], Lis
 
     failure_mode = str(manifest.get("failure_mode", "")).strip()
     if failure_mode and not failure_mode.startswith("fail_closed"):
-        warns.append(f"{path.name}: failure_mode '{failure_mode}' should start with 'fail_closed' for safety")
+        warns.append(
+            Finding(
+                "manifest-failure-mode",
+                f"{path.name}: failure_mode '{failure_mode}' should start with 'fail_closed' for safety",
+            )
+        )
 
-    if not is_template_manifest:
-        lint_manifest_contract_parity(path, manifest, doc_texts, strict, errs, warns)
+    if not is_template:
+        lint_manifest_contract_parity(path, manifest, role_docs, strict, errs, warns, manifest_doc=manifest_doc)
 
     return errs, warns
 
@@ -835,37 +1655,159 @@ def build_heading_index(text: str) -> List[Tuple[int, str, int]]:
     """
     Returns list of (level, title, line_index)
     """
-    idx = []
-    lines = text.splitlines()
-    for i, line in enumerate(lines):
-        m = HEADING_RE.match(line)
-        if m:
-            level = len(m.group(1))
-            title = m.group(2).strip()
-            idx.append((level, title, i))
-    return idx
+    return ParsedDoc(text).headings
 
 
-def extract_section(text: str, want: str) -> str:
-    lines = text.splitlines()
-    headings = build_heading_index(text)
-
+def find_doc_section(doc: ParsedDoc, want: str) -> Optional[str]:
     # Find the first heading whose title starts with want (case-insensitive)
-    target = None
-    for level, title, li in headings:
-        if title.lower().startswith(want.lower()):
-            target = (level, li)
-            break
-    if not target:
-        raise SystemExit(f"Section not found: '{want}'")
-
-    level, start = target
-    end = len(lines)
-    for lvl, _, li in headings:
-        if li > start and lvl <= level:
-            end = li
-            break
-    return "\n".join(lines[start:end]).rstrip() + "\n"
+    want_lower = want.lower()
+    for span, title_lower in zip(doc.section_spans, doc.titles_lower):
+        if title_lower.startswith(want_lower):
+            return "\n".join(doc.section_lines(span)).rstrip() + "\n"
+    return None
+
+
+def scan_heading_offsets(path: Path) -> Optional[Tuple[List[Tuple[int, str, int, int]], str]]:
+    """
+    Stream the file in SCAN_CHUNK_BYTES chunks and return ([(level, title, start_byte, end_byte)], sha256)
+    with the same heading rule and section nesting as ParsedDoc.section_spans. Returns None when the file
+    uses line breaks other than \\n / \\r\\n (see EXTRA_LINE_BREAK_BYTES).
+    """
+    digest = hashlib.sha256()
+    headings: List[Tuple[int, str, int]] = []
+    offset = 0
+    carry = b""
+    with path.open("rb") as fh:
+        while True:
+            chunk = fh.read(SCAN_CHUNK_BYTES)
+            digest.update(chunk)
+            data = carry + chunk
+            if chunk:
+                # Only whole lines are scanned; the partial tail rides into the next chunk.
+                cut = data.rfind(b"\n") + 1
+                if not cut:
+                    carry = data
+                    continue
+                block, carry = data[:cut], data[cut:]
+            else:
+                block, carry = data, b""
+            # Substring scans run at memchr speed; a regex over every byte is several times slower.
+            if block.count(b"\r") != block.count(b"\r\n") or any(sep in block for sep in EXTRA_LINE_BREAK_BYTES):
+                return None
+            pos = 0 if block.startswith(b"#") else block.find(b"\n#") + 1 or -1
+            while pos >= 0:
+                line_end = block.find(b"\n", pos)
+                if line_end < 0:
+                    line_end = len(block)
+                line = block[pos:line_end].rstrip(b"\r").decode("utf-8", errors="replace")
+                hm = HEADING_RE.match(line)
+                if hm:
+                    headings.append((len(hm.group(1)), hm.group(2).strip(), offset + pos))
+                pos = block.find(b"\n#", line_end) + 1 or -1
+            offset += len(block)
+            if not chunk:
+                break
+
+    spans: List[Tuple[int, str, int, int]] = []
+    open_idx: List[int] = []
+    for level, title, start in headings:
+        while open_idx and spans[open_idx[-1]][0] >= level:
+            prev_level, prev_title, prev_start, _ = spans[open_idx[-1]]
+            spans[open_idx.pop()] = (prev_level, prev_title, prev_start, start)
+        spans.append((level, title, start, offset))
+        open_idx.append(len(spans) - 1)
+    return spans, digest.hexdigest()
+
+
+def heading_sidecar_path(path: Path) -> Path:
+    return path.with_name(path.name + HEADING_SIDECAR_SUFFIX)
+
+
+def save_heading_sidecar(side: Path, data: Dict[str, object]) -> None:
+    # The sidecar is only an accelerator: an unwritable doc folder must not fail the extract.
+    try:
+        replace_file(side, (json.dumps(data, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8"))
+    except OSError:
+        pass
+
+
+class ByteSectionIndex:
+    """
+    Heading byte spans of one markdown file. A section is served by slicing its byte range
+    out of an mmap of the file, so the rest of the document is never read or decoded.
+
+    The spans can be persisted in a sidecar (<doc>.headings.json) next to the doc. It is
+    trusted while the doc's (size, mtime_ns) match; on a stamp mismatch with the same size
+    the doc's sha256 is compared before the offsets are reused, otherwise it is rebuilt.
+    """
+
+    def __init__(self, path: Path, spans: List[Tuple[int, str, int, int]]):
+        self.path = path
+        self.spans = spans
+        self.titles_lower = [title.lower() for _, title, _, _ in spans]
+
+    @classmethod
+    def load(cls, path: Path, sidecar: bool = False) -> Optional["ByteSectionIndex"]:
+        """
+        Returns None when the doc cannot be indexed by byte offsets (exotic line breaks);
+        callers fall back to ParsedDoc.
+        """
+        st = path.stat()
+        side = heading_sidecar_path(path)
+        if sidecar and side.is_file():
+            try:
+                data = json.loads(side.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                data = None
+            if (
+                isinstance(data, dict)
+                and data.get("schema") == HEADING_SIDECAR_SCHEMA
+                and data.get("size") == st.st_size
+            ):
+                spans = [tuple(row) for row in data.get("headings", [])]
+                if data.get("mtime_ns") == st.st_mtime_ns:
+                    return cls(path, spans)
+                if data.get("sha256") == file_sha256(path):
+                    data["mtime_ns"] = st.st_mtime_ns
+                    save_heading_sidecar(side, data)
+                    return cls(path, spans)
+
+        scanned = scan_heading_offsets(path)
+        if scanned is None:
+            return None
+        spans, sha = scanned
+        if sidecar:
+            payload = {
+                "schema": HEADING_SIDECAR_SCHEMA,
+                "doc": path.name,
+                "size": st.st_size,
+                "mtime_ns": st.st_mtime_ns,
+                "sha256": sha,
+                "headings": [list(span) for span in spans],
+            }
+            save_heading_sidecar(side, payload)
+        return cls(path, spans)
+
+    def read_range(self, start: int, end: int) -> str:
+        if start >= end:
+            return ""
+        with self.path.open("rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return mm[start:end].decode("utf-8", errors="replace")
+
+    def find(self, want: str) -> Optional[str]:
+        # Same first-prefix-match and output normalization as find_doc_section
+        want_lower = want.lower()
+        for (_, _, start, end), title_lower in zip(self.spans, self.titles_lower):
+            if title_lower.startswith(want_lower):
+                return "\n".join(self.read_range(start, end).splitlines()).rstrip() + "\n"
+        return None
+
+
+def find_section_bytes(path: Path, want: str, sidecar: bool = False) -> Optional[str]:
+    index = ByteSectionIndex.load(path, sidecar=sidecar)
+    if index is None:
+        return find_doc_section(ParsedDoc.load(path), want)
+    return index.find(want)
 
 
 def is_canonical_modulekit_markdown(path: Path) -> bool:
@@ -880,76 +1822,2711 @@ def is_modulemill_lint_markdown(path: Path, modulekit_only: bool) -> bool:
     return is_canonical_modulekit_markdown(path)
 
 
-def collect_files(paths: List[Path], modulekit_only: bool = False) -> Tuple[List[Path], List[Path]]:
-    md_files: Set[Path] = set()
-    manifest_files: Set[Path] = set()
+def is_lint_candidate_name(name: str) -> bool:
+    return name.endswith(".md") or name == "ModuleManifest.yaml"
 
-    for p in paths:
-        if p.is_dir():
-            if modulekit_only:
-                for md in p.rglob("*.md"):
-                    if is_modulemill_lint_markdown(md, modulekit_only=True):
-                        md_files.add(md)
-                for mf in p.rglob("ModuleManifest.yaml"):
-                    if "_CURRENT" in mf.parts:
-                        manifest_files.add(mf)
-            else:
-                md_files.update(p.rglob("*.md"))
-                manifest_files.update(p.rglob("ModuleManifest.yaml"))
+
+def gitignore_regex(pattern: str) -> Optional[Tuple["re.Pattern[str]", bool, bool]]:
+    """
+    Compile one .gitignore line to (regex over '/'-separated relative paths, negate, dir_only).
+    Supports comments, `!` negation, trailing-`/` directory patterns, anchoring, and
+    `*` / `?` / `**` / `[...]` globs.
+    """
+    line = pattern.rstrip("\n").rstrip()
+    if not line or line.startswith("#"):
+        return None
+    negate = line.startswith("!")
+    if negate:
+        line = line[1:]
+    if line.startswith("\\"):
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    anchored = "/" in line
+    line = line.lstrip("/")
+
+    out: List[str] = []
+    i = 0
+    while i < len(line):
+        if line.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if line.startswith("**", i):
+            out.append(".*")
+            i += 2
+            continue
+        ch = line[i]
+        if ch == "*":
+            out.append("[^/]*")
+        elif ch == "?":
+            out.append("[^/]")
+        elif ch == "[" and line.find("]", i + 1) != -1:
+            end = line.find("]", i + 1)
+            body = line[i + 1 : end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            out.append("[" + body.replace("\\", "\\\\") + "]")
+            i = end + 1
+            continue
         else:
-            if p.suffix.lower() == ".md":
-                if is_modulemill_lint_markdown(p, modulekit_only=modulekit_only):
-                    md_files.add(p)
-            if p.name == "ModuleManifest.yaml":
-                if not modulekit_only or "_CURRENT" in p.parts:
-                    manifest_files.add(p)
+            out.append(re.escape(ch))
+        i += 1
 
-    return sorted(md_files), sorted(manifest_files)
+    prefix = "^" if anchored else "^(?:.*/)?"
+    return re.compile(prefix + "".join(out) + "$"), negate, dir_only
 
 
-def cmd_lint(paths: List[Path], strict: bool = False, require_manifest: bool = False, modulekit_only: bool = False) -> int:
-    all_errs: List[str] = []
-    all_warns: List[str] = []
+class GitIgnore:
+    """
+    .gitignore rules in effect for one directory during a discovery walk. Each rule keeps the
+    walk-path of the directory it came from, so matching is a prefix strip, not a relpath call.
+    Ancestor rules (between the repo root and the walk root) carry the lead path from their
+    directory down to the walk root.
+    """
 
-    md_files, manifest_files = collect_files(paths, modulekit_only=modulekit_only)
+    def __init__(self, rules: Optional[List[Tuple[str, str, "re.Pattern[str]", bool, bool]]] = None) -> None:
+        self.rules = rules or []
+
+    @staticmethod
+    def read_rules(gitignore: str, base: str, lead: str) -> List[Tuple[str, str, "re.Pattern[str]", bool, bool]]:
+        try:
+            with open(gitignore, encoding="utf-8", errors="replace") as fh:
+                lines = fh.readlines()
+        except OSError:
+            return []
+        rules = []
+        for line in lines:
+            compiled = gitignore_regex(line)
+            if compiled:
+                regex, negate, dir_only = compiled
+                rules.append((base, lead, regex, negate, dir_only))
+        return rules
+
+    @classmethod
+    def for_walk_root(cls, root: str) -> "GitIgnore":
+        """
+        Collect .gitignore files from the enclosing git work tree down to (excluding) root.
+        """
+        root_abs = Path(os.path.abspath(root))
+        chain: List[Path] = []
+        for parent in root_abs.parents:
+            chain.append(parent)
+            if (parent / ".git").exists():
+                break
+        else:
+            return cls()
+        rules = []
+        for ancestor in reversed(chain):
+            lead = root_abs.relative_to(ancestor).as_posix() + "/"
+            rules.extend(cls.read_rules(str(ancestor / ".gitignore"), root, lead))
+        return cls(rules)
+
+    def child(self, directory: str, names: Set[str]) -> "GitIgnore":
+        if ".gitignore" not in names:
+            return self
+        return GitIgnore(self.rules + self.read_rules(os.path.join(directory, ".gitignore"), directory, ""))
+
+    def ignored(self, path: str, is_dir: bool) -> bool:
+        result = False
+        for base, lead, regex, negate, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            rel = lead + path[len(base) + 1 :].replace(os.sep, "/")
+            if regex.match(rel):
+                result = not negate
+        return result
 
-    for md in md_files:
-        errs, warns = lint_markdown_file(md, strict=strict, require_manifest=require_manifest)
-        all_errs.extend(errs)
-        all_warns.extend(warns)
 
-    for mf in manifest_files:
-        errs, warns = lint_manifest_file(mf, strict=strict)
-        all_errs.extend(errs)
-        all_warns.extend(warns)
+def walk_lint_files(
+    root: Path, modulekit_only: bool = False, respect_ignores: bool = True, visited: Optional[Set[Path]] = None
+) -> Iterator[Path]:
+    """
+    One os.scandir walk yielding markdown and manifest candidates under root.
+    Prunes PRUNED_DIR_NAMES, virtualenvs, and .gitignore'd paths (unless respect_ignores is off).
+    With modulekit_only, a directory that has a `_CURRENT` child is a kit: only that subtree is
+    descended (files beside it, such as global-instruction files, are still seen).
+    Directory symlinks are not followed, matching Path.rglob. Scanned directories are added
+    to visited when given.
+    """
+    root_str = str(root)
+    stack: List[Tuple[str, Optional[GitIgnore]]] = [
+        (root_str, GitIgnore.for_walk_root(root_str) if respect_ignores else None)
+    ]
+    while stack:
+        directory, ignore = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        names = {entry.name for entry in entries}
+        if ignore is not None:
+            if "pyvenv.cfg" in names and directory != root_str:
+                continue
+            ignore = ignore.child(directory, names)
+        if visited is not None:
+            visited.add(Path(directory))
+        kit_dir = modulekit_only and "_CURRENT" in names
+
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if kit_dir and entry.name != "_CURRENT":
+                    continue
+                if ignore is not None and (entry.name in PRUNED_DIR_NAMES or ignore.ignored(entry.path, True)):
+                    continue
+                stack.append((entry.path, ignore))
+            elif is_lint_candidate_name(entry.name):
+                if ignore is not None and ignore.ignored(entry.path, False):
+                    continue
+                yield Path(entry.path)
 
-    if all_warns:
-        print("\n".join([f"WARN: {w}" for w in all_warns]))
 
-    if all_errs:
-        print("\n".join(all_errs))
-        return 1
+class GitError(RuntimeError):
+    """
+    A git command failed or returned an unreadable object. Library calls raise it so a
+    long-lived caller can recover; only main() turns it into an exit message.
+    """
 
-    print("OK: no lint errors.")
-    return 0
 
+def run_git(args: List[str]) -> str:
+    try:
+        proc = subprocess.run(["git", *args], capture_output=True, check=False)
+    except OSError as err:
+        raise GitError(f"git {args[0]} failed: {err}") from err
+    if proc.returncode != 0:
+        raise GitError(f"git {args[0]} failed: {proc.stderr.decode('utf-8', 'replace').strip()}")
+    return proc.stdout.decode("utf-8", "replace")
 
-def cmd_extract(path: Path, section: str) -> int:
-    text = read_text(path)
-    print(extract_section(text, section), end="")
-    return 0
 
+def run_git_z(args: List[str]) -> List[str]:
+    # For commands given -z: NUL-separated names, no quoting of unusual characters.
+    return [name for name in run_git(args).split("\0") if name]
 
-def main() -> int:
-    ap = argparse.ArgumentParser(prog="modulemill")
-    sub = ap.add_subparsers(dest="cmd", required=True)
 
-    ap_lint = sub.add_parser("lint", help="lint ModuleKit docs")
-    ap_lint.add_argument("paths", nargs="+", help="file(s) or folder(s)")
-    ap_lint.add_argument(
-        "--strict",
-        action="store_true",
-        help="enforce metadata and stronger checks, including warning escalations",
+def list_git_files(paths: List[Path]) -> List[Path]:
+    """
+    Tracked plus untracked-but-not-ignored files under paths, as listed by `git ls-files`.
+    """
+    names = run_git_z(["ls-files", "-z", "--cached", "--others", "--exclude-standard", "--", *map(str, paths)])
+    return [Path(name) for name in dict.fromkeys(names)]
+
+
+class GitObjectSource:
+    """
+    Lint/extract inputs read from git objects instead of the working tree: the index
+    (`--staged`) or a commit (`--rev`). The file list comes from one ls-files / ls-tree call
+    and blobs stream through one long-lived `git cat-file --batch` process, so a historical
+    release or a staged snapshot is linted without a checkout or a process per file.
+    """
+
+    active: Optional["GitObjectSource"] = None
+
+    def __init__(self, rev: Optional[str] = None) -> None:
+        self.rev = rev
+        self.top = Path(run_git(["rev-parse", "--show-toplevel"]).strip())
+        self.commit = run_git(["rev-parse", "--verify", f"{rev}^{{commit}}"]).strip() if rev else ""
+        self.blobs: Dict[str, bytes] = {}
+        self.proc: Optional[subprocess.Popen] = None
+        self.pid = 0
+        self.lock = threading.Lock()
+
+    @classmethod
+    def install(cls, rev: Optional[str]) -> None:
+        # Process-pool initializer. Forked workers inherit the parent's source with its prefetched
+        # blobs (and start their own cat-file pipe on a miss); spawned workers build a new one.
+        if cls.active is None or cls.active.rev != rev:
+            cls.active = cls(rev)
+
+    @property
+    def label(self) -> str:
+        return f"rev {self.rev}" if self.rev else "staged index"
+
+    @cached_property
+    def oids(self) -> Dict[str, str]:
+        """
+        {top-relative posix path: blob oid}. Unmerged index entries (stages 1-3) are skipped.
+        """
+        oids: Dict[str, str] = {}
+        if self.rev:
+            entries = run_git_z(["-C", str(self.top), "ls-tree", "-r", "-z", "--full-tree", self.commit])
+        else:
+            entries = run_git_z(["-C", str(self.top), "ls-files", "-z", "--stage"])
+        for entry in entries:
+            meta, _, name = entry.partition("\t")
+            fields = meta.split()
+            if self.rev:
+                if len(fields) == 3 and fields[1] == "blob":
+                    oids[name] = fields[2]
+            elif len(fields) == 3 and fields[2] == "0":
+                oids[name] = fields[1]
+        return oids
+
+    @cached_property
+    def dirs(self) -> Set[str]:
+        dirs = {""}
+        for name in self.oids:
+            parent = name.rpartition("/")[0]
+            while parent not in dirs:
+                dirs.add(parent)
+                parent = parent.rpartition("/")[0]
+        return dirs
+
+    def key(self, path: Path) -> Optional[str]:
+        rel = os.path.relpath(os.path.abspath(path), self.top)
+        if rel == os.curdir:
+            return ""
+        if rel.startswith(os.pardir):
+            return None
+        return Path(rel).as_posix()
+
+    def oid(self, path: Path) -> Optional[str]:
+        key = self.key(path)
+        return self.oids.get(key) if key is not None else None
+
+    def exists(self, path: Path) -> bool:
+        key = self.key(path)
+        return key is not None and (key in self.oids or key in self.dirs)
+
+    def list_files(self, paths: List[Path]) -> List[Path]:
+        """
+        Files under each path, spelled relative to that path the way a directory walk would.
+        """
+        files: List[Path] = []
+        for p in paths:
+            key = self.key(p)
+            if key is None:
+                continue
+            if key in self.oids:
+                files.append(p)
+                continue
+            prefix = f"{key}/" if key else ""
+            files.extend(p / name[len(prefix) :] for name in self.oids if name.startswith(prefix))
+        return files
+
+    def read_bytes(self, path: Path) -> bytes:
+        oid = self.oid(path)
+        if oid is None:
+            raise FileNotFoundError(f"{path}: not in {self.label}")
+        if oid not in self.blobs:
+            self.prefetch([path])
+        return self.blobs[oid]
+
+    def prefetch(self, paths: Iterable[Path]) -> None:
+        """
+        Reads every listed blob not read yet in one pipelined cat-file round: all object names
+        are written by a helper thread while the replies are read, so the pipe never stalls.
+        """
+        wanted = list(dict.fromkeys(oid for oid in map(self.oid, paths) if oid and oid not in self.blobs))
+        if not wanted:
+            return
+        with self.lock:
+            proc = self._process()
+            writer = threading.Thread(target=self._write_names, args=(proc, wanted), daemon=True)
+            writer.start()
+            for oid in wanted:
+                header = proc.stdout.readline().split()
+                if len(header) != 3 or header[1] == b"missing":
+                    raise GitError(f"git cat-file: cannot read object {oid}")
+                size = int(header[2])
+                self.blobs[oid] = proc.stdout.read(size)
+                proc.stdout.read(1)
+            writer.join()
+
+    @staticmethod
+    def _write_names(proc: subprocess.Popen, oids: List[str]) -> None:
+        proc.stdin.write("".join(f"{oid}\n" for oid in oids).encode("ascii"))
+        proc.stdin.flush()
+
+    def _process(self) -> subprocess.Popen:
+        if self.proc is None or self.pid != os.getpid():
+            try:
+                self.proc = subprocess.Popen(
+                    ["git", "-C", str(self.top), "cat-file", "--batch"],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                )
+            except OSError as err:
+                raise GitError(f"git cat-file failed: {err}") from err
+            self.pid = os.getpid()
+        return self.proc
+
+    def close(self) -> None:
+        if self.proc is not None and self.pid == os.getpid():
+            self.proc.stdin.close()
+            self.proc.wait()
+        self.proc = None
+
+
+def open_git_source(rev: Optional[str], staged: bool) -> Optional[GitObjectSource]:
+    if not rev and not staged:
+        return None
+    return GitObjectSource(rev or None)
+
+
+def kit_root(path: Path) -> Optional[Path]:
+    # The innermost `_CURRENT` folder holding path, i.e. the kit it belongs to.
+    parts = path.parts
+    if "_CURRENT" not in parts[:-1]:
+        return None
+    return Path(*parts[: len(parts) - 1 - parts[-2::-1].index("_CURRENT")])
+
+
+def list_changed_lint_files(
+    paths: List[Path], since: str, modulekit_only: bool = False, respect_ignores: bool = True
+) -> List[Path]:
+    """
+    Lint inputs affected by changes since the merge base of `since` and HEAD (committed,
+    staged, unstaged, and untracked), expanded to dependents:
+    - a changed (or deleted) file inside a `_CURRENT` kit pulls in the whole kit, so its
+      manifest re-runs parity against the docs it references
+    - a changed KitRegistry.md or global-instructions file pulls in all of them
+    """
+    pathspec = [str(p) for p in paths]
+    base = run_git(["merge-base", since, "HEAD"]).strip()
+    changed = run_git_z(["diff", "-z", "--name-only", "--relative", base, "--", *pathspec])
+    changed += run_git_z(["ls-files", "-z", "--others", "--exclude-standard", "--", *pathspec])
+    changed_paths = [Path(name) for name in dict.fromkeys(changed) if is_lint_candidate_name(Path(name).name)]
+
+    candidates: List[Path] = []
+    kits: Set[Path] = set()
+    for p in changed_paths:
+        kit = kit_root(p)
+        if kit is None:
+            candidates.append(p)
+        elif kit not in kits:
+            kits.add(kit)
+            if kit.is_dir():
+                candidates.extend(walk_lint_files(kit, modulekit_only=modulekit_only, respect_ignores=respect_ignores))
+    if any(p.name == "KitRegistry.md" or p.name in GLOBAL_INSTRUCTION_FILENAMES for p in changed_paths):
+        names = ["KitRegistry.md", *sorted(GLOBAL_INSTRUCTION_FILENAMES)]
+        globs = [Path(f":(glob){p.as_posix()}/**/{name}") for p in paths if p.is_dir() for name in names]
+        # With only file arguments there is nothing to expand into; an empty pathspec
+        # would make `git ls-files` list the whole repository.
+        if globs:
+            candidates.extend(list_git_files(globs))
+    return [p for p in candidates if p.is_file()]
+
+
+@profiled
+def collect_files(
+    paths: List[Path],
+    modulekit_only: bool = False,
+    respect_ignores: bool = True,
+    git_ls_files: bool = False,
+    since: Optional[str] = None,
+    visited: Optional[Set[Path]] = None,
+) -> Tuple[List[Path], List[Path]]:
+    md_files: Set[Path] = set()
+    manifest_files: Set[Path] = set()
+    candidates: List[Path] = []
+
+    if GitObjectSource.active is not None:
+        candidates = [
+            p
+            for p in GitObjectSource.active.list_files(paths)
+            if is_lint_candidate_name(p.name) and not (respect_ignores and PRUNED_DIR_NAMES.intersection(p.parts))
+        ]
+    elif since is not None:
+        candidates = list_changed_lint_files(paths, since, modulekit_only=modulekit_only, respect_ignores=respect_ignores)
+    elif git_ls_files:
+        candidates = [p for p in list_git_files(paths) if is_lint_candidate_name(p.name) and p.is_file()]
+    else:
+        for p in paths:
+            if p.is_dir():
+                candidates.extend(
+                    walk_lint_files(p, modulekit_only=modulekit_only, respect_ignores=respect_ignores, visited=visited)
+                )
+            else:
+                candidates.append(p)
+
+    for p in candidates:
+        if p.suffix.lower() == ".md":
+            if is_modulemill_lint_markdown(p, modulekit_only=modulekit_only):
+                md_files.add(p)
+        if p.name == "ModuleManifest.yaml":
+            if not modulekit_only or "_CURRENT" in p.parts:
+                manifest_files.add(p)
+
+    return sorted(md_files), sorted(manifest_files)
+
+
+LintResult = Tuple[List[str], List[str]]
+
+
+def group_lint_units(md_files: List[Path], manifest_files: List[Path]) -> List[Tuple[List[Path], List[Path]]]:
+    """
+    Group files by parent directory so each `_CURRENT` kit (manifest plus its sibling docs)
+    is linted as one independent unit.
+    """
+    units: Dict[Path, Tuple[List[Path], List[Path]]] = {}
+    for md in md_files:
+        units.setdefault(md.parent, ([], []))[0].append(md)
+    for mf in manifest_files:
+        units.setdefault(mf.parent, ([], []))[1].append(mf)
+    return [units[key] for key in sorted(units)]
+
+
+def parse_lint_shard(raw: str) -> Tuple[int, int]:
+    index, sep, count = raw.partition("/")
+    if not sep or not index.isdigit() or not count.isdigit() or not 1 <= int(index) <= int(count):
+        raise argparse.ArgumentTypeError(f"expected i/N with 1 <= i <= N, got '{raw}'")
+    return int(index), int(count)
+
+
+def lint_unit_shard(files: List[Path], count: int) -> int:
+    """
+    1-based shard for one lint unit (files sharing a `_CURRENT` directory). The kit path,
+    relative to the working directory, is hashed so every machine agrees on the split.
+    """
+    if any(p.name == "KitRegistry.md" or p.name in GLOBAL_INSTRUCTION_FILENAMES for p in files):
+        return LINT_SHARD_GLOBAL
+    kit = Path(os.path.relpath(files[0].parent)).as_posix()
+    return int.from_bytes(hashlib.sha256(kit.encode("utf-8")).digest()[:8], "big") % count + 1
+
+
+def shard_lint_files(
+    md_files: List[Path], manifest_files: List[Path], shard: Tuple[int, int]
+) -> Tuple[List[Path], List[Path]]:
+    index, count = shard
+    keep: Set[Path] = set()
+    for md_list, mf_list in group_lint_units(md_files, manifest_files):
+        if lint_unit_shard(md_list + mf_list, count) == index:
+            keep.update(md_list + mf_list)
+    return [md for md in md_files if md in keep], [mf for mf in manifest_files if mf in keep]
+
+
+def lint_unit(
+    md_files: List[Path],
+    manifest_files: List[Path],
+    strict: bool = False,
+    require_manifest: bool = False,
+) -> Dict[Path, LintResult]:
+    # Manifest parity checks reuse the docs already parsed by the markdown pass.
+    doc_cache: Dict[Path, ParsedDoc] = {}
+    results: Dict[Path, LintResult] = {}
+
+    for md in md_files:
+        results[md] = lint_markdown_file(md, strict=strict, require_manifest=require_manifest, doc_cache=doc_cache)
+
+    for mf in manifest_files:
+        results[mf] = lint_manifest_file(mf, strict=strict, doc_cache=doc_cache)
+
+    return results
+
+
+def profiled_lint_unit(
+    md_files: List[Path],
+    manifest_files: List[Path],
+    strict: bool = False,
+    require_manifest: bool = False,
+) -> Tuple[Dict[Path, LintResult], List[ProfileEvent]]:
+    """
+    Worker-side lint_unit under a fresh profiler; the events travel back to the parent.
+    """
+    profiler = LintProfiler()
+    LintProfiler.active = profiler
+    try:
+        return lint_unit(md_files, manifest_files, strict=strict, require_manifest=require_manifest), profiler.events
+    finally:
+        LintProfiler.active = None
+
+
+def iter_lint_units(
+    units: List[Tuple[List[Path], List[Path]]],
+    strict: bool = False,
+    require_manifest: bool = False,
+    jobs: int = 1,
+) -> Iterator[Dict[Path, LintResult]]:
+    """
+    Yield each unit's results in unit order as soon as that unit is linted. Closing the
+    generator early cancels units still queued for the worker pool.
+    """
+    worker = partial(lint_unit, strict=strict, require_manifest=require_manifest)
+
+    if jobs <= 1 or len(units) <= 1:
+        for md_files, manifest_files in units:
+            yield worker(md_files, manifest_files)
+        return
+
+    profiler = LintProfiler.active
+    if profiler is not None:
+        worker = partial(profiled_lint_unit, strict=strict, require_manifest=require_manifest)
+
+    jobs = min(jobs, len(units))
+    chunksize = max(1, min(len(units) // (jobs * 4), LINT_STREAM_CHUNK_UNITS))
+    source = GitObjectSource.active
+    pool_args: Dict[str, object] = {}
+    if source is not None:
+        pool_args = {"initializer": GitObjectSource.install, "initargs": (source.rev,)}
+    pool = ProcessPoolExecutor(max_workers=jobs, **pool_args)
+    try:
+        for unit_results in pool.map(
+            worker,
+            [md_files for md_files, _ in units],
+            [manifest_files for _, manifest_files in units],
+            chunksize=chunksize,
+        ):
+            if profiler is not None:
+                unit_results, events = unit_results
+                profiler.events.extend(events)
+            yield unit_results
+    finally:
+        # Only chunks already running finish; queued ones are dropped.
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def run_lint_units(
+    units: List[Tuple[List[Path], List[Path]]],
+    strict: bool = False,
+    require_manifest: bool = False,
+    jobs: int = 1,
+) -> Dict[Path, LintResult]:
+    results: Dict[Path, LintResult] = {}
+    for unit_results in iter_lint_units(units, strict=strict, require_manifest=require_manifest, jobs=jobs):
+        results.update(unit_results)
+    return results
+
+
+def merge_lint_results(
+    results: Dict[Path, LintResult], md_files: List[Path], manifest_files: List[Path]
+) -> LintResult:
+    all_errs: List[str] = []
+    all_warns: List[str] = []
+    # Merge in collect_files order: all markdown files first, then manifests.
+    for path in md_files + manifest_files:
+        errs, warns = results[path]
+        all_errs.extend(errs)
+        all_warns.extend(warns)
+    return all_errs, all_warns
+
+
+def build_lint_dependents(manifest_files: List[Path]) -> Dict[Path, Set[Path]]:
+    """
+    Map each doc named under a manifest's `docs:` block to the manifests that read it.
+    """
+    dependents: Dict[Path, Set[Path]] = {}
+    for mf in manifest_files:
+        try:
+            docs = parse_manifest(read_text(mf)).get("docs", {})
+        except OSError:
+            continue
+        if not isinstance(docs, dict):
+            continue
+        for doc_key in MANIFEST_DOC_ROLES:
+            rel = str(docs.get(doc_key, "")).strip()
+            if rel:
+                doc_path = Path(os.path.normpath(mf.parent / rel))
+                dependents.setdefault(doc_path, set()).add(mf)
+    return dependents
+
+
+def file_stamps(paths: Set[Path]) -> Dict[Path, Tuple[int, int]]:
+    stamps: Dict[Path, Tuple[int, int]] = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        stamps[path] = (st.st_mtime_ns, st.st_size)
+    return stamps
+
+
+def watch_directories(paths: List[Path], files: Iterable[Path], visited: Set[Path]) -> Set[Path]:
+    """
+    Directories whose mtime reveals an added or removed input: every directory the walk
+    scanned, or (for inputs listed by git) each input's ancestors up to its path argument.
+    """
+    dirs = set(visited)
+    roots = {Path(os.path.normpath(p)) for p in paths if p.is_dir()}
+    dirs.update(roots)
+    if not visited:
+        for path in files:
+            for parent in Path(os.path.normpath(path)).parents:
+                if parent in roots or parent in dirs:
+                    break
+                dirs.add(parent)
+    return dirs
+
+
+def lint_report_lines(all_errs: List[str], all_warns: List[str]) -> List[str]:
+    return [f"WARN: {w}" for w in all_warns] + all_errs
+
+
+def cmd_lint_watch(
+    paths: List[Path],
+    strict: bool = False,
+    require_manifest: bool = False,
+    modulekit_only: bool = False,
+    jobs: int = 1,
+    interval: float = 1.0,
+    respect_ignores: bool = True,
+    git_ls_files: bool = False,
+) -> int:
+    """
+    Lint once, then poll the inputs and re-lint only files affected by each change:
+    the changed markdown file itself plus every manifest whose `docs:` mapping points to it.
+    Each re-lint prints a diff of report lines against the previous run.
+    Polls only stat the known inputs and their directories; the tree is re-walked and the
+    manifests' `docs:` mappings re-read only when a manifest changes or a directory's mtime
+    shows an input was added or removed.
+    """
+
+    def scan() -> Tuple[List[Path], List[Path], Dict[Path, Set[Path]], Set[Path]]:
+        visited: Set[Path] = set()
+        md_files, manifest_files = collect_files(
+            paths, modulekit_only=modulekit_only, respect_ignores=respect_ignores, git_ls_files=git_ls_files, visited=visited
+        )
+        dependents = build_lint_dependents(manifest_files)
+        watched_dirs = watch_directories(paths, md_files + manifest_files, visited)
+        return md_files, manifest_files, dependents, watched_dirs
+
+    md_files, manifest_files, dependents, watched_dirs = scan()
+    watched = set(md_files) | set(manifest_files) | set(dependents) | watched_dirs
+    stamps = file_stamps(watched)
+    results = run_lint_units(
+        group_lint_units(md_files, manifest_files), strict=strict, require_manifest=require_manifest, jobs=jobs
+    )
+    all_errs, all_warns = merge_lint_results(results, md_files, manifest_files)
+    previous = lint_report_lines(all_errs, all_warns)
+    if previous:
+        print("\n".join(previous))
+    print(f"watching {len(md_files) + len(manifest_files)} file(s): {len(all_errs)} error(s), {len(all_warns)} warning(s)")
+
+    try:
+        while True:
+            time.sleep(interval)
+            current = file_stamps(watched)
+            changed = {p for p in set(current) | set(stamps) if current.get(p) != stamps.get(p)}
+            if not changed:
+                continue
+            scanned_dirs = watched_dirs
+            if any(p in watched_dirs or p not in current or p.name == "ModuleManifest.yaml" for p in changed):
+                md_files, manifest_files, dependents, watched_dirs = scan()
+                watched = set(md_files) | set(manifest_files) | set(dependents) | watched_dirs
+                current = file_stamps(watched)
+                changed = {p for p in set(current) | set(stamps) if current.get(p) != stamps.get(p)}
+            stamps = current
+            # Directory stamps only signal a re-walk; they are not lint inputs.
+            changed = {p for p in changed if p not in watched_dirs and p not in scanned_dirs}
+            if not changed:
+                continue
+
+            md_set = set(md_files)
+            manifest_set = set(manifest_files)
+            dirty_md = {p for p in changed if p in md_set}
+            dirty_manifests = {p for p in changed if p in manifest_set}
+            for path in changed:
+                dirty_manifests.update(dependents.get(path, set()))
+                # Adding or removing a manifest flips the sibling-manifest check for its docs.
+                if path.name == "ModuleManifest.yaml":
+                    dirty_md.update(md for md in md_files if md.parent == path.parent)
+
+            results = {p: r for p, r in results.items() if p in md_set or p in manifest_set}
+            results.update(
+                run_lint_units(
+                    group_lint_units(sorted(dirty_md), sorted(dirty_manifests)),
+                    strict=strict,
+                    require_manifest=require_manifest,
+                    jobs=jobs,
+                )
+            )
+            all_errs, all_warns = merge_lint_results(results, md_files, manifest_files)
+            report = lint_report_lines(all_errs, all_warns)
+
+            added = Counter(report) - Counter(previous)
+            resolved = Counter(previous) - Counter(report)
+            print(
+                f"--- {time.strftime('%H:%M:%S')} {len(changed)} changed, "
+                f"{len(dirty_md) + len(dirty_manifests)} re-linted"
+            )
+            for line in report:
+                if added[line] > 0:
+                    added[line] -= 1
+                    print(f"+ {line}")
+            for line in previous:
+                if resolved[line] > 0:
+                    resolved[line] -= 1
+                    print(f"- {line}")
+            print(f"= {len(all_errs)} error(s), {len(all_warns)} warning(s)")
+            previous = report
+    except KeyboardInterrupt:
+        return 1 if all_errs else 0
+
+
+class LintCache:
+    """
+    Persistent lint results keyed by file content hash, compiler version, and lint flags.
+    Content hashes are memoized by (mtime_ns, size) so unchanged files are not re-read.
+    """
+
+    def __init__(self, path: Path, flags: Dict[str, bool]) -> None:
+        self.path = path
+        self.flags = flags
+        self.hashes: Dict[str, List[object]] = {}
+        self.results: Dict[str, List[List[List[str]]]] = {}
+        self.touched: Set[str] = set()
+        self.hashed: Set[str] = set()
+
+    @classmethod
+    def load(cls, path: Path, flags: Dict[str, bool]) -> "LintCache":
+        cache = cls(path, flags)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cache
+        if isinstance(data, dict) and data.get("compiler_version") == COMPILER_VERSION:
+            cache.hashes = data.get("hashes", {})
+            cache.results = data.get("results", {})
+        return cache
+
+    def file_hash(self, path: Path) -> str:
+        if GitObjectSource.active is not None:
+            # Blob ids already are content hashes.
+            return GitObjectSource.active.oid(path) or "missing"
+        abs_path = os.path.abspath(path)
+        self.hashed.add(abs_path)
+        try:
+            st = os.stat(abs_path)
+        except OSError:
+            return "missing"
+        memo = self.hashes.get(abs_path)
+        if memo and memo[0] == st.st_mtime_ns and memo[1] == st.st_size:
+            return str(memo[2])
+        digest = hashlib.sha256(Path(abs_path).read_bytes()).hexdigest()
+        self.hashes[abs_path] = [st.st_mtime_ns, st.st_size, digest]
+        return digest
+
+    @cached_property
+    def compiler_digest(self) -> str:
+        # Unreleased rule changes keep the version string, so the compiler source is part of the key too.
+        return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+    def _key(self, kind: str, path: Path, parts: List[str]) -> str:
+        payload = json.dumps(
+            [COMPILER_VERSION, self.compiler_digest, self.flags, kind, str(path), parts], sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def markdown_key(self, path: Path) -> str:
+        # Runtime UserGuide checks also depend on whether a sibling manifest exists.
+        sibling_manifest = input_exists(path.parent / "ModuleManifest.yaml")
+        return self._key("md", path, [self.file_hash(path), str(sibling_manifest)])
+
+    def manifest_key(self, path: Path) -> str:
+        parts = [self.file_hash(path)]
+        try:
+            docs = parse_manifest(read_text(path)).get("docs", {})
+        except OSError:
+            docs = {}
+        if isinstance(docs, dict):
+            # Parity checks read the docs a manifest points to, so their content is part of the key.
+            for doc_key in sorted(MANIFEST_DOC_ROLES):
+                rel = str(docs.get(doc_key, "")).strip()
+                if rel:
+                    parts.append(f"{doc_key}={rel}:{self.file_hash(path.parent / rel)}")
+        return self._key("manifest", path, parts)
+
+    def get(self, key: str) -> Optional[LintResult]:
+        hit = self.results.get(key)
+        if hit is None:
+            return None
+        self.touched.add(key)
+        return [Finding(rule, text) for rule, text in hit[0]], [Finding(rule, text) for rule, text in hit[1]]
+
+    def put(self, key: str, result: LintResult) -> None:
+        # Rule ids are stored next to each line so cached findings keep them.
+        self.results[key] = [[[f.rule, str(f)] for f in issues] for issues in result]
+        self.touched.add(key)
+
+    def save(self) -> None:
+        results = {key: self.results[key] for key in self.touched if key in self.results}
+        for key, value in self.results.items():
+            if len(results) >= LINT_CACHE_MAX_ENTRIES:
+                break
+            results.setdefault(key, value)
+        # Hash memos are bounded the same way: this run's files first, then older entries.
+        hashes = {key: self.hashes[key] for key in self.hashed if key in self.hashes}
+        for key, value in self.hashes.items():
+            if len(hashes) >= LINT_CACHE_MAX_ENTRIES:
+                break
+            hashes.setdefault(key, value)
+        data = {"compiler_version": COMPILER_VERSION, "hashes": hashes, "results": results}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        replace_file(self.path, json.dumps(data, ensure_ascii=False).encode("utf-8"))
+
+
+def write_lint_profile(profiler: LintProfiler, fmt: str, top: int, trace_path: Optional[Path]) -> None:
+    # Profile output goes to stderr so the lint report on stdout stays unchanged.
+    if fmt == "json":
+        sys.stderr.write(json.dumps(profiler.report(top), indent=2) + "\n")
+    else:
+        sys.stderr.write(profiler.report_text(top))
+    if trace_path is not None:
+        trace_path.write_text(json.dumps(profiler.chrome_trace()), encoding="utf-8")
+        sys.stderr.write(f"Wrote Chrome trace: {trace_path}\n")
+
+
+@dataclass(frozen=True)
+class Diagnostic:
+    """
+    One lint (or boottrace) finding. `text` is the report line the CLI prints; `message` is
+    the same finding without its "<file>[:line:col]: " prefix. `file` is the linted file the
+    finding was reported for, and line/column are 1-based when the finding has a location.
+    """
+
+    rule: str
+    severity: str
+    file: Path
+    line: Optional[int]
+    column: Optional[int]
+    message: str
+    text: str
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "rule": self.rule,
+            "severity": self.severity,
+            "file": str(self.file),
+            "line": self.line,
+            "column": self.column,
+            "message": self.message,
+        }
+
+
+def lint_diagnostic(path: Path, issue: str, severity: str) -> Diagnostic:
+    if not isinstance(issue, Finding):
+        raise TypeError(f"lint finding has no rule id (emit it as a Finding): {issue!r}")
+    line = column = None
+    m = ISSUE_LOCATION_RE.match(issue)
+    if m:
+        line, column = int(m.group("line")), int(m.group("col"))
+        message = issue[m.end():]
+    else:
+        _, sep, rest = issue.partition(": ")
+        message = rest if sep else issue
+    return Diagnostic(issue.rule, severity, path, line, column, message, str(issue))
+
+
+def iter_lint_diagnostics(
+    paths: Iterable[Union[str, Path]],
+    strict: bool = False,
+    require_manifest: bool = False,
+    modulekit_only: bool = False,
+    jobs: int = 1,
+    cache_dir: Optional[Path] = None,
+    respect_ignores: bool = True,
+    git_ls_files: bool = False,
+    since: Optional[str] = None,
+    rev: Optional[str] = None,
+    staged: bool = False,
+    shard: Optional[Tuple[int, int]] = None,
+) -> Iterator[Diagnostic]:
+    """
+    Lint markdown docs and manifests under paths, yielding each finding as soon as its kit
+    (one `_CURRENT` directory) is linted. Kits come in path order; within a kit, markdown
+    files precede manifests and a file's errors precede its warnings. The arguments mirror
+    `modulemill lint`; shard=(i, N) keeps only the kits lint_unit_shard assigns to shard i.
+    Closing the generator early stops work, including queued -j units.
+    Not thread-safe: the git source and profiler are process-wide while it runs.
+    """
+    paths = [Path(p) for p in paths]
+    source = open_git_source(rev, staged)
+    GitObjectSource.active = source
+    cache: Optional[LintCache] = None
+    fresh: Optional[Iterator[Dict[Path, LintResult]]] = None
+    try:
+        md_files, manifest_files = collect_files(
+            paths, modulekit_only=modulekit_only, respect_ignores=respect_ignores, git_ls_files=git_ls_files, since=since
+        )
+        if shard is not None:
+            md_files, manifest_files = shard_lint_files(md_files, manifest_files, shard)
+        cached: Dict[Path, LintResult] = {}
+        cache_keys: Dict[Path, str] = {}
+
+        if cache_dir is not None:
+            flags = {"strict": strict, "require_manifest": require_manifest, "modulekit_only": modulekit_only}
+            cache = LintCache.load(cache_dir / LINT_CACHE_FILENAME, flags)
+            if GitObjectSource.active is not None:
+                # Manifest keys read the manifests' docs mappings.
+                GitObjectSource.active.prefetch(manifest_files)
+            for md in md_files:
+                cache_keys[md] = cache.markdown_key(md)
+            for mf in manifest_files:
+                cache_keys[mf] = cache.manifest_key(mf)
+            for path, key in cache_keys.items():
+                hit = cache.get(key)
+                if hit is not None:
+                    cached[path] = hit
+
+        units = group_lint_units(md_files, manifest_files)
+        pending = [
+            ([md for md in md_list if md not in cached], [mf for mf in mf_list if mf not in cached])
+            for md_list, mf_list in units
+        ]
+        fresh_units = [unit for unit in pending if unit[0] or unit[1]]
+        if GitObjectSource.active is not None:
+            GitObjectSource.active.prefetch(path for md_list, mf_list in fresh_units for path in md_list + mf_list)
+        fresh = iter_lint_units(fresh_units, strict=strict, require_manifest=require_manifest, jobs=jobs)
+
+        for (md_list, mf_list), (todo_md, todo_mf) in zip(units, pending):
+            results = cached
+            if todo_md or todo_mf:
+                results = next(fresh)
+                if cache is not None:
+                    for path, result in results.items():
+                        cache.put(cache_keys[path], result)
+                results = {**cached, **results}
+            for path in md_list + mf_list:
+                errs, warns = results[path]
+                for issue in errs:
+                    yield lint_diagnostic(path, issue, "error")
+                for issue in warns:
+                    yield lint_diagnostic(path, issue, "warning")
+    finally:
+        if fresh is not None:
+            fresh.close()
+        if cache is not None:
+            # Results linted before an early stop are kept.
+            cache.save()
+        GitObjectSource.active = None
+        if source is not None:
+            source.close()
+
+
+def lint_paths(
+    paths: Iterable[Union[str, Path]],
+    strict: bool = False,
+    require_manifest: bool = False,
+    modulekit_only: bool = False,
+    jobs: int = 1,
+    cache_dir: Optional[Path] = None,
+    respect_ignores: bool = True,
+    git_ls_files: bool = False,
+    since: Optional[str] = None,
+    rev: Optional[str] = None,
+    staged: bool = False,
+    shard: Optional[Tuple[int, int]] = None,
+) -> List[Diagnostic]:
+    """
+    All findings of iter_lint_diagnostics, in the same order.
+    """
+    return list(
+        iter_lint_diagnostics(
+            paths,
+            strict=strict,
+            require_manifest=require_manifest,
+            modulekit_only=modulekit_only,
+            jobs=jobs,
+            cache_dir=cache_dir,
+            respect_ignores=respect_ignores,
+            git_ls_files=git_ls_files,
+            since=since,
+            rev=rev,
+            staged=staged,
+            shard=shard,
+        )
+    )
+
+
+def lint_kit(
+    kit: Union[str, Path],
+    strict: bool = False,
+    require_manifest: bool = False,
+    rev: Optional[str] = None,
+    staged: bool = False,
+) -> List[Diagnostic]:
+    """
+    Lint one ModuleKit, given either its directory or its `_CURRENT` directory.
+    """
+    kit = Path(kit)
+    kit_dir = kit if kit.name == "_CURRENT" else kit / "_CURRENT"
+    return lint_paths([kit_dir], strict=strict, require_manifest=require_manifest, rev=rev, staged=staged)
+
+
+def format_lint_diagnostic(diagnostic: Diagnostic, fmt: str) -> str:
+    if fmt == "ndjson":
+        return json.dumps(diagnostic.to_dict(), ensure_ascii=False)
+    return f"WARN: {diagnostic.text}" if diagnostic.severity == "warning" else diagnostic.text
+
+
+def cmd_lint(
+    paths: List[Path],
+    strict: bool = False,
+    require_manifest: bool = False,
+    modulekit_only: bool = False,
+    jobs: int = 1,
+    cache_dir: Optional[Path] = None,
+    profile: bool = False,
+    profile_format: str = "text",
+    profile_top: int = 10,
+    profile_trace: Optional[Path] = None,
+    respect_ignores: bool = True,
+    git_ls_files: bool = False,
+    since: Optional[str] = None,
+    rev: Optional[str] = None,
+    staged: bool = False,
+    fmt: str = "text",
+    max_errors: int = 0,
+    shard: Optional[Tuple[int, int]] = None,
+    shard_result: Optional[Path] = None,
+) -> int:
+    profiler = LintProfiler() if profile else None
+    LintProfiler.active = profiler
+    error_count = 0
+    stopped = False
+    diagnostics = iter_lint_diagnostics(
+        paths,
+        strict=strict,
+        require_manifest=require_manifest,
+        modulekit_only=modulekit_only,
+        jobs=jobs,
+        cache_dir=cache_dir,
+        respect_ignores=respect_ignores,
+        git_ls_files=git_ls_files,
+        since=since,
+        rev=rev,
+        staged=staged,
+        shard=shard,
+    )
+    found: List[Diagnostic] = []
+    try:
+        for diagnostic in diagnostics:
+            print(format_lint_diagnostic(diagnostic, fmt), flush=True)
+            found.append(diagnostic)
+            if diagnostic.severity == "error":
+                error_count += 1
+                if max_errors and error_count >= max_errors:
+                    stopped = True
+                    break
+    finally:
+        diagnostics.close()
+        LintProfiler.active = None
+    if profiler is not None:
+        write_lint_profile(profiler, profile_format, profile_top, profile_trace)
+
+    if stopped:
+        sys.stderr.write(f"Stopped after {error_count} error(s) (--max-errors {max_errors}); remaining files not linted.\n")
+    if shard is not None and shard_result is not None:
+        options = {
+            "paths": [p.as_posix() for p in paths],
+            "strict": strict,
+            "require_manifest": require_manifest,
+            "modulekit_only": modulekit_only,
+            "respect_ignores": respect_ignores,
+            "git_ls_files": git_ls_files,
+            "since": since,
+            "rev": rev,
+            "staged": staged,
+        }
+        write_lint_shard_result(shard_result, shard, options, found, complete=not stopped)
+    if error_count:
+        return 1
+
+    if fmt == "text":
+        print("OK: no lint errors.")
+    return 0
+
+
+def write_lint_shard_result(
+    path: Path, shard: Tuple[int, int], options: Dict[str, object], diagnostics: List[Diagnostic], complete: bool
+) -> None:
+    data = {
+        "schema": LINT_SHARD_SCHEMA,
+        "compiler_version": COMPILER_VERSION,
+        "shard": shard[0],
+        "shards": shard[1],
+        "options": options,
+        "complete": complete,
+        "diagnostics": [{**d.to_dict(), "text": d.text} for d in diagnostics],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    replace_file(path, json.dumps(data, ensure_ascii=False).encode("utf-8"))
+
+
+def cmd_merge(result_paths: List[Path], fmt: str = "text") -> int:
+    """
+    Combine `lint --shard` result files into the report and exit code of one unsharded run.
+    Every shard 1..N must be present once, written by the same compiler version and options.
+    """
+    shards: Dict[int, Dict[str, object]] = {}
+    first: Optional[Dict[str, object]] = None
+    for path in result_paths:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            raise SystemExit(f"{path}: cannot read lint shard result ({exc})")
+        if not isinstance(data, dict) or data.get("schema") != LINT_SHARD_SCHEMA:
+            raise SystemExit(f"{path}: not a lint shard result (schema {LINT_SHARD_SCHEMA})")
+        if first is None:
+            first = data
+        for key in ("compiler_version", "shards", "options"):
+            if data.get(key) != first.get(key):
+                raise SystemExit(f"{path}: {key} differs from {result_paths[0]}; shards must come from one lint configuration")
+        index = data.get("shard")
+        if index in shards:
+            raise SystemExit(f"{path}: shard {index}/{data['shards']} given twice")
+        shards[index] = data
+    if first is None:
+        raise SystemExit("merge: no shard result files given")
+    missing = [str(i) for i in range(1, first["shards"] + 1) if i not in shards]
+    if missing:
+        raise SystemExit(f"merge: missing shard(s) {', '.join(missing)} of {first['shards']}")
+
+    diagnostics: List[Dict[str, object]] = []
+    for index in sorted(shards):
+        diagnostics.extend(shards[index]["diagnostics"])
+    # Each kit was linted whole on one shard, so a stable sort by kit directory restores
+    # the unsharded run's kit order and keeps each kit's own order.
+    diagnostics.sort(key=lambda d: Path(d["file"]).parent)
+
+    for index in sorted(shards):
+        if not shards[index].get("complete", True):
+            sys.stderr.write(f"Shard {index}/{first['shards']} stopped early (--max-errors); merged report is partial.\n")
+    error_count = 0
+    for d in diagnostics:
+        if fmt == "ndjson":
+            print(json.dumps({k: v for k, v in d.items() if k != "text"}, ensure_ascii=False))
+        else:
+            print(f"WARN: {d['text']}" if d["severity"] == "warning" else d["text"])
+        if d["severity"] == "error":
+            error_count += 1
+    if error_count:
+        return 1
+
+    if fmt == "text":
+        print("OK: no lint errors.")
+    return 0
+
+
+def extract_section(
+    source: Union[str, Path],
+    want: str,
+    use_mmap: bool = False,
+    sidecar: bool = False,
+    rev: Optional[str] = None,
+    staged: bool = False,
+) -> Optional[str]:
+    """
+    Return the section under the first heading whose title starts with want (case-insensitive),
+    or None when no heading matches. A str source is markdown text; a Path is read from the
+    working tree, or from git objects with rev/staged.
+    """
+    if isinstance(source, str):
+        return find_doc_section(ParsedDoc(source), want)
+    git_source = open_git_source(rev, staged)
+    if git_source is not None:
+        # A blob is read whole; mmap and sidecars only apply to working-tree files.
+        GitObjectSource.active = git_source
+        try:
+            doc = ParsedDoc.load(source)
+        finally:
+            GitObjectSource.active = None
+            git_source.close()
+        return find_doc_section(doc, want)
+    if use_mmap or sidecar or source.stat().st_size >= MMAP_EXTRACT_MIN_BYTES:
+        return find_section_bytes(source, want, sidecar=sidecar)
+    return find_doc_section(ParsedDoc.load(source), want)
+
+
+def cmd_extract(
+    path: Path,
+    section: str,
+    use_mmap: bool = False,
+    sidecar: bool = False,
+    rev: Optional[str] = None,
+    staged: bool = False,
+) -> int:
+    text = extract_section(path, section, use_mmap=use_mmap, sidecar=sidecar, rev=rev, staged=staged)
+    if text is None:
+        raise SystemExit(f"Section not found: '{section}'")
+    print(text, end="")
+    return 0
+
+
+SectionCacheEntry = Tuple[Tuple[int, int], Optional[ParsedDoc], Optional[ByteSectionIndex], Dict[str, Optional[str]]]
+
+
+class SectionIndexCache:
+    """
+    Parsed docs (heading index + section spans) kept across extract requests, keyed by
+    real path and invalidated when the file's (mtime_ns, size) changes. Section
+    lookups are memoized per doc version and keep find_doc_section's first-prefix-match rule.
+    Docs of MMAP_EXTRACT_MIN_BYTES or more keep only a ByteSectionIndex and are not memoized,
+    so the daemon's footprint does not grow with them. Docs and per-doc sections are both
+    LRU-bounded (EXTRACT_CACHE_MAX_DOCS, EXTRACT_CACHE_MAX_SECTIONS).
+
+    With a root, paths that resolve outside it are refused. Loads lock per doc, so a slow
+    parse of one file does not stall requests for the others.
+    """
+
+    def __init__(self, root: Optional[Path] = None) -> None:
+        self.root = os.path.realpath(root) if root is not None else None
+        self.entries: Dict[str, SectionCacheEntry] = {}
+        # Guards entries, each memo, and loading; held only for dict updates, never for file reads.
+        self.lock = threading.Lock()
+        self.loading: Dict[str, threading.Lock] = {}
+
+    def resolve(self, path: str) -> str:
+        key = os.path.realpath(path)
+        if self.root is not None and key != self.root and not key.startswith(self.root.rstrip(os.sep) + os.sep):
+            raise PermissionError(f"'{path}' is outside the served root {self.root}")
+        return key
+
+    def cached(self, key: str, stamp: Tuple[int, int]) -> Optional[SectionCacheEntry]:
+        # Caller holds self.lock. A hit moves the doc to the most-recently-used end.
+        entry = self.entries.pop(key, None)
+        if entry is None or entry[0] != stamp:
+            return None
+        self.entries[key] = entry
+        return entry
+
+    def load(self, key: str, stamp: Tuple[int, int], size: int) -> SectionCacheEntry:
+        with self.lock:
+            entry = self.cached(key, stamp)
+            if entry is not None:
+                return entry
+            key_lock = self.loading.setdefault(key, threading.Lock())
+        with key_lock:
+            # Another request may have loaded this doc while we waited.
+            with self.lock:
+                entry = self.cached(key, stamp)
+            if entry is not None:
+                return entry
+            byte_index = ByteSectionIndex.load(Path(key)) if size >= MMAP_EXTRACT_MIN_BYTES else None
+            doc = ParsedDoc.load(Path(key)) if byte_index is None else None
+            entry = (stamp, doc, byte_index, {})
+            with self.lock:
+                self.entries[key] = entry
+                while len(self.entries) > EXTRACT_CACHE_MAX_DOCS:
+                    del self.entries[next(iter(self.entries))]
+                self.loading.pop(key, None)
+            return entry
+
+    def extract(self, path: str, want: str) -> Optional[str]:
+        key = self.resolve(path)
+        st = os.stat(key)
+        _, doc, byte_index, memo = self.load(key, (st.st_mtime_ns, st.st_size), st.st_size)
+        if byte_index is not None:
+            return byte_index.find(want)
+        with self.lock:
+            if want in memo:
+                memo[want] = memo.pop(want)
+                return memo[want]
+        text = find_doc_section(doc, want)
+        with self.lock:
+            memo[want] = text
+            while len(memo) > EXTRACT_CACHE_MAX_SECTIONS:
+                del memo[next(iter(memo))]
+        return text
+
+
+def handle_extract_request(cache: SectionIndexCache, raw: str) -> Dict[str, object]:
+    """
+    One JSONL request `{"path": ..., "section": ...}` (optional "id" is echoed back)
+    -> `{"ok": true, "text": ...}` or `{"ok": false, "error": ...}`.
+    """
+    try:
+        req = json.loads(raw)
+    except ValueError as err:
+        return {"ok": False, "error": f"invalid JSON: {err}"}
+    if not isinstance(req, dict) or not isinstance(req.get("path"), str) or not isinstance(req.get("section"), str):
+        return {"ok": False, "error": "request must be an object with string 'path' and 'section'"}
+
+    resp: Dict[str, object] = {"path": req["path"], "section": req["section"]}
+    if "id" in req:
+        resp["id"] = req["id"]
+    try:
+        text = cache.extract(req["path"], req["section"])
+    except OSError as err:
+        resp.update(ok=False, error=f"{type(err).__name__}: {err}")
+        return resp
+    if text is None:
+        resp.update(ok=False, error=f"Section not found: '{req['section']}'")
+    else:
+        resp.update(ok=True, text=text)
+    return resp
+
+
+def cmd_extract_batch(stream: Iterable[str]) -> int:
+    cache = SectionIndexCache()
+    failed = False
+    for raw in stream:
+        if not raw.strip():
+            continue
+        resp = handle_extract_request(cache, raw)
+        failed = failed or not resp["ok"]
+        print(json.dumps(resp, ensure_ascii=False), flush=True)
+    return 1 if failed else 0
+
+
+class ExtractRequestHandler(socketserver.StreamRequestHandler):
+    # One connection may send any number of JSONL requests; each gets one JSON line back.
+    def handle(self) -> None:
+        for raw in self.rfile:
+            line = raw.decode("utf-8", errors="replace")
+            if not line.strip():
+                continue
+            resp = handle_extract_request(self.server.section_cache, line)
+            self.wfile.write((json.dumps(resp, ensure_ascii=False) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+
+def open_extract_server(address: str, root: Path) -> socketserver.BaseServer:
+    """
+    `HOST:PORT` binds TCP on loopback only; anything else is a Unix socket path. Only docs
+    under root are served.
+    """
+    m = re.match(r"^(localhost|127\.0\.0\.1)?:(\d+)$", address)
+    if m:
+        server: socketserver.BaseServer = socketserver.ThreadingTCPServer(("127.0.0.1", int(m.group(2))), ExtractRequestHandler)
+    else:
+        if not hasattr(socket, "AF_UNIX"):
+            raise SystemExit("Unix sockets are not available here; use --serve 127.0.0.1:PORT")
+        if os.path.lexists(address):
+            # Only a socket can be stale; never replace any other file at this path.
+            if not stat.S_ISSOCK(os.lstat(address).st_mode):
+                raise SystemExit(f"{address} exists and is not a socket; refusing to replace it")
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(address)
+            except OSError:
+                os.unlink(address)  # stale socket from a previous run
+            else:
+                raise SystemExit(f"extract daemon already listening on {address}")
+            finally:
+                probe.close()
+        server = socketserver.ThreadingUnixStreamServer(address, ExtractRequestHandler)
+    server.daemon_threads = True
+    server.section_cache = SectionIndexCache(root)
+    return server
+
+
+def cmd_extract_serve(address: str, root: Path) -> int:
+    server = open_extract_server(address, root)
+    sys.stderr.write(
+        f"extract daemon listening on {address} for docs under {server.section_cache.root} "
+        f"(JSONL requests: {{\"path\": ..., \"section\": ...}})\n"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if server.address_family == getattr(socket, "AF_UNIX", None) and os.path.exists(address):
+            os.unlink(address)
+    return 0
+
+
+def read_lsp_message(stream) -> Optional[Dict[str, object]]:
+    """
+    Read one `Content-Length`-framed JSON-RPC message; None at end of input.
+    """
+    length = -1
+    while True:
+        line = stream.readline()
+        if not line:
+            return None
+        line = line.strip()
+        if not line:
+            break
+        name, _, value = line.decode("ascii", errors="replace").partition(":")
+        if name.strip().lower() == "content-length":
+            # A malformed length is treated like a missing one rather than ending the server.
+            try:
+                length = int(value.strip())
+            except ValueError:
+                length = -1
+    if length < 0:
+        return {}
+    body = stream.read(length)
+    try:
+        message = json.loads(body.decode("utf-8"))
+    except ValueError:
+        return {}
+    return message if isinstance(message, dict) else {}
+
+
+def write_lsp_message(stream, payload: Dict[str, object]) -> None:
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    stream.write(f"Content-Length: {len(body)}\r\n\r\n".encode("ascii") + body)
+    stream.flush()
+
+
+def uri_to_path(uri: str) -> Optional[Path]:
+    parts = urlsplit(uri)
+    if parts.scheme != "file":
+        return None
+    return Path(os.path.normpath(unquote_url(parts.path)))
+
+
+def utf16_len(text: str) -> int:
+    # LSP columns count UTF-16 code units; astral emoji take two.
+    return len(text.encode("utf-16-le")) // 2
+
+
+def is_lsp_lintable(path: Path) -> bool:
+    return path.suffix.lower() == ".md" or path.name == "ModuleManifest.yaml"
+
+
+class LintLanguageServer:
+    """
+    Lint rules behind the Language Server Protocol (stdio, full-text sync).
+
+    Open documents are kept as in-memory ParsedDoc overlays; closed siblings are read from
+    disk and kept while their (mtime_ns, size) holds, so unchanged docs keep their cached
+    lines / headings / lowercase text between edits. A change re-runs lint_markdown_file for
+    the changed doc and lint_manifest_file for every manifest whose `docs:` mapping reads it;
+    nothing else is re-linted. Manifest parity findings that name a role doc are published on
+    that doc as well as on the manifest.
+    """
+
+    def __init__(self, out, strict: bool = False, require_manifest: bool = False) -> None:
+        self.out = out
+        self.strict = strict
+        self.require_manifest = require_manifest
+        self.open_docs: Dict[Path, ParsedDoc] = {}
+        self.disk_docs: Dict[Path, Tuple[Tuple[int, int], ParsedDoc]] = {}
+        self.results: Dict[Path, LintResult] = {}
+        self.published: Set[Path] = set()
+        self.shutdown_requested = False
+
+    def load(self, path: Path) -> Optional[ParsedDoc]:
+        doc = self.open_docs.get(path)
+        if doc is not None:
+            return doc
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self.disk_docs.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        doc = ParsedDoc.load(path)
+        self.disk_docs[path] = (stamp, doc)
+        return doc
+
+    def manifest_role_paths(self, manifest_path: Path) -> Dict[str, Path]:
+        """
+        {doc_key: path} as lint_manifest_file joins them (manifest folder / docs.<key>).
+        """
+        doc = self.load(manifest_path)
+        if doc is None:
+            return {}
+        docs = parse_manifest(doc.text).get("docs", {})
+        if not isinstance(docs, dict):
+            return {}
+        paths: Dict[str, Path] = {}
+        for doc_key in MANIFEST_DOC_ROLES:
+            rel = str(docs.get(doc_key, "")).strip()
+            if rel:
+                paths[doc_key] = manifest_path.parent / rel
+        return paths
+
+    def dependent_manifests(self, path: Path) -> Set[Path]:
+        candidates = {path.parent / "ModuleManifest.yaml"}
+        candidates.update(p for p in set(self.open_docs) | set(self.results) if p.name == "ModuleManifest.yaml")
+        return {
+            mf
+            for mf in candidates
+            if any(Path(os.path.normpath(p)) == path for p in self.manifest_role_paths(mf).values())
+        }
+
+    def relint(self, path: Path) -> Set[Path]:
+        """
+        Re-lint what a change to path affects; returns the paths whose diagnostics may have changed.
+        """
+        dirty: Set[Path] = {path}
+        if self.load(path) is None:
+            self.results.pop(path, None)
+        elif path.name == "ModuleManifest.yaml":
+            self.lint_manifest(path)
+            dirty.update(Path(os.path.normpath(p)) for p in self.manifest_role_paths(path).values())
+        elif path.suffix.lower() == ".md":
+            doc_cache = {path: self.load(path)}
+            self.results[path] = lint_markdown_file(
+                path, strict=self.strict, require_manifest=self.require_manifest, doc_cache=doc_cache
+            )
+        for mf in self.dependent_manifests(path) - {path}:
+            self.lint_manifest(mf)
+            dirty.add(mf)
+            dirty.update(Path(os.path.normpath(p)) for p in self.manifest_role_paths(mf).values())
+        return dirty
+
+    def lint_manifest(self, manifest_path: Path) -> None:
+        doc_cache: Dict[Path, ParsedDoc] = {manifest_path: self.load(manifest_path)}
+        for doc_path in self.manifest_role_paths(manifest_path).values():
+            doc = self.load(Path(os.path.normpath(doc_path)))
+            if doc is not None:
+                doc_cache[doc_path] = doc
+        self.results[manifest_path] = lint_manifest_file(manifest_path, strict=self.strict, doc_cache=doc_cache)
+
+    def diagnostic(self, doc: Optional[ParsedDoc], path: Path, issue: str, severity: int) -> Dict[str, object]:
+        lines = doc.lines if doc is not None else []
+        line = col = 0
+        width = -1
+        m = ISSUE_LOCATION_RE.match(issue)
+        quoted = ISSUE_QUOTED_RE.search(issue)
+        if m and m.group("name") == path.name:
+            line, col = int(m.group("line")) - 1, int(m.group("col")) - 1
+        elif quoted and doc is not None:
+            offset = doc.text.find(quoted.group(1))
+            if offset >= 0:
+                line_no, col_no = doc.line_col(offset)
+                line, col, width = line_no - 1, col_no - 1, len(quoted.group(1))
+        text_line = lines[line] if line < len(lines) else ""
+        start = utf16_len(text_line[:col])
+        end = utf16_len(text_line[: col + width]) if width >= 0 else utf16_len(text_line)
+        return {
+            "range": {"start": {"line": line, "character": start}, "end": {"line": line, "character": max(end, start)}},
+            "severity": severity,
+            "code": lint_diagnostic(path, issue, "").rule,
+            "source": "modulemill",
+            "message": issue,
+        }
+
+    def diagnostics_for(self, path: Path) -> List[Dict[str, object]]:
+        doc = self.load(path)
+        diagnostics: List[Dict[str, object]] = []
+        errs, warns = self.results.get(path, ([], []))
+        for severity, issues in ((LSP_SEVERITY_ERROR, errs), (LSP_SEVERITY_WARNING, warns)):
+            diagnostics.extend(self.diagnostic(doc, path, issue, severity) for issue in issues)
+
+        for mf, (errs, warns) in self.results.items():
+            if mf == path or mf.name != "ModuleManifest.yaml":
+                continue
+            roles = [
+                MANIFEST_DOC_ROLES[key]
+                for key, p in self.manifest_role_paths(mf).items()
+                if Path(os.path.normpath(p)) == path
+            ]
+            if not roles:
+                continue
+            for severity, issues in ((LSP_SEVERITY_ERROR, errs), (LSP_SEVERITY_WARNING, warns)):
+                for issue in issues:
+                    target = PARITY_TARGET_RE.search(issue)
+                    if target and (target.group(1) or target.group(2)) in roles:
+                        diagnostics.append(self.diagnostic(doc, path, issue, severity))
+        return diagnostics
+
+    def publish(self, paths: Iterable[Path]) -> None:
+        for path in sorted(set(paths)):
+            diagnostics = self.diagnostics_for(path)
+            if not diagnostics and path not in self.published:
+                continue
+            if diagnostics:
+                self.published.add(path)
+            else:
+                self.published.discard(path)
+            self.notify("textDocument/publishDiagnostics", {"uri": path.as_uri(), "diagnostics": diagnostics})
+
+    def notify(self, method: str, params: Dict[str, object]) -> None:
+        write_lsp_message(self.out, {"jsonrpc": "2.0", "method": method, "params": params})
+
+    def respond(self, msg_id: object, result: object = None, error: Optional[Dict[str, object]] = None) -> None:
+        payload: Dict[str, object] = {"jsonrpc": "2.0", "id": msg_id}
+        if error is not None:
+            payload["error"] = error
+        else:
+            payload["result"] = result
+        write_lsp_message(self.out, payload)
+
+    def changed(self, path: Optional[Path]) -> None:
+        if path is not None and is_lsp_lintable(path):
+            self.publish(self.relint(path))
+
+    def handle(self, msg: Dict[str, object]) -> bool:
+        """
+        Dispatch one message; returns False once the client sends `exit`.
+        """
+        method = msg.get("method")
+        params = msg.get("params") or {}
+        text_doc = params.get("textDocument", {}) if isinstance(params, dict) else {}
+        path = uri_to_path(str(text_doc.get("uri", ""))) if isinstance(text_doc, dict) else None
+
+        if "id" in msg and method is not None:
+            if method == "initialize":
+                self.respond(
+                    msg["id"],
+                    {
+                        "capabilities": {
+                            "textDocumentSync": {"openClose": True, "change": LSP_TEXT_SYNC_FULL, "save": {"includeText": False}}
+                        },
+                        "serverInfo": {"name": "modulemill", "version": COMPILER_VERSION},
+                    },
+                )
+            elif method == "shutdown":
+                self.shutdown_requested = True
+                self.respond(msg["id"])
+            else:
+                self.respond(msg["id"], error={"code": -32601, "message": f"method not found: {method}"})
+            return True
+
+        if method == "exit":
+            return False
+        if method == "textDocument/didOpen" and path is not None:
+            self.open_docs[path] = ParsedDoc(str(text_doc.get("text", "")), path)
+            self.changed(path)
+        elif method == "textDocument/didChange" and path is not None:
+            changes = params.get("contentChanges") or []
+            if changes:
+                # Full sync: the last change carries the whole document.
+                self.open_docs[path] = ParsedDoc(str(changes[-1].get("text", "")), path)
+                self.changed(path)
+        elif method == "textDocument/didSave":
+            self.changed(path)
+        elif method == "textDocument/didClose" and path is not None:
+            self.open_docs.pop(path, None)
+            self.changed(path)
+        elif method == "workspace/didChangeWatchedFiles":
+            for change in params.get("changes") or []:
+                self.changed(uri_to_path(str(change.get("uri", ""))))
+        return True
+
+
+def cmd_lsp(strict: bool = False, require_manifest: bool = False) -> int:
+    # stdout is the protocol channel from here on; nothing else may print to it.
+    server = LintLanguageServer(sys.stdout.buffer, strict=strict, require_manifest=require_manifest)
+    while True:
+        msg = read_lsp_message(sys.stdin.buffer)
+        if msg is None or not server.handle(msg):
+            return 0 if server.shutdown_requested else 1
+
+
+def load_boottrace_module():
+    """
+    Import the sibling BootTraceHarness.py for KitRegistry parsing. Only registry-aware
+    commands need it, so lint/extract keep working from a lone copy of this file.
+    """
+    path = Path(__file__).resolve().with_name("BootTraceHarness.py")
+    if not path.exists():
+        raise SystemExit(f"{path.name} not found beside {Path(__file__).name}; it is required for KitRegistry parsing")
+    if "BootTraceHarness" in sys.modules:
+        return sys.modules["BootTraceHarness"]
+    spec = importlib.util.spec_from_file_location("BootTraceHarness", path)
+    module = importlib.util.module_from_spec(spec)
+    # Registered before exec so its dataclasses can resolve their module.
+    sys.modules["BootTraceHarness"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def boottrace(
+    repo_root: Union[str, Path],
+    rev: Optional[str] = None,
+    staged: bool = False,
+    check_urls: bool = False,
+    timeout: float = 10,
+) -> List[Diagnostic]:
+    """
+    Run the BootTraceHarness checks against repo_root and return each failed check as an
+    error Diagnostic with a "boottrace/<check>" rule id. An empty list means the trace passed.
+    """
+    harness = load_boottrace_module()
+    try:
+        trace = harness.trace_boot(
+            Path(repo_root), rev=rev, staged=staged, check_urls_enabled=check_urls, timeout=timeout
+        )
+    except harness.GitError as exc:
+        raise GitError(str(exc)) from exc
+    return [
+        Diagnostic(f"boottrace/{issue.rule}", "error", issue.path, None, None, issue.message, issue.message)
+        for issue in trace.issues
+    ]
+
+
+@dataclass
+class BundleSource:
+    label: str
+    path: Path
+    data: bytes
+    role: str = ""
+
+    @cached_property
+    def sha256(self) -> str:
+        return hashlib.sha256(self.data).hexdigest()
+
+
+def read_bundle_source(label: str, path: Path, role: str = "") -> BundleSource:
+    return BundleSource(label, path, path.read_bytes(), role)
+
+
+def sources_digest(sources: List[BundleSource]) -> str:
+    return hashlib.sha256("".join(f"{src.label} {src.sha256}\n" for src in sources).encode("utf-8")).hexdigest()
+
+
+def render_bundle(title: str, fields: List[Tuple[str, str]], sources: List[BundleSource]) -> str:
+    """
+    Deterministic bundle text: a header, then each source verbatim between BEGIN/END markers
+    that carry its content hash and byte size. No timestamps, so equal inputs give equal bytes.
+    """
+    digest = sources_digest(sources)
+    lines = [f"# {title}", ""]
+    lines.extend(f"{key}: {value}" for key, value in fields)
+    lines.append(f"Generated: modulemill build (compiler {COMPILER_VERSION}); do not edit, rebuild from `_CURRENT`.")
+    lines.append(f"SourcesSHA256: {digest}")
+    lines.append(f"Docs: {', '.join(src.label for src in sources)}")
+    lines.append("")
+    for src in sources:
+        body = src.data.decode("utf-8", errors="replace").replace("\r\n", "\n")
+        if not body.endswith("\n"):
+            body += "\n"
+        lines.append(f"<!-- BEGIN {src.label} sha256={src.sha256} bytes={len(src.data)} -->")
+        lines.append(body.rstrip("\n"))
+        lines.append(f"<!-- END {src.label} -->")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def module_bundle_sources(manifest_path: Path, errs: List[str]) -> Tuple[str, str, List[BundleSource]]:
+    """
+    Returns (module, version, sources) for one kit: the manifest, then its docs in BUNDLE_DOC_ORDER.
+    Template manifests yield no sources.
+    """
+    manifest_src = read_bundle_source(manifest_path.name, manifest_path, "manifest")
+    manifest = parse_manifest(manifest_src.data.decode("utf-8", errors="replace"))
+    module = str(manifest.get("module", "")).strip()
+    version = str(manifest.get("version", "")).strip()
+    if is_template_manifest(manifest_path, module):
+        return module, version, []
+    docs = manifest.get("docs", {})
+    if not isinstance(docs, dict):
+        docs = {}
+
+    sources = [manifest_src]
+    for doc_key in BUNDLE_DOC_ORDER:
+        rel = str(docs.get(doc_key, "")).strip()
+        doc_path = manifest_path.parent / rel
+        if not rel or not doc_path.is_file():
+            errs.append(f"{manifest_path}: docs.{doc_key} points to missing file '{rel}'")
+            continue
+        sources.append(read_bundle_source(doc_path.name, doc_path, doc_key))
+    return module, version, sources
+
+
+class BundleIndex:
+    """
+    Build record in the output directory: source hashes and output hash per bundle, so a
+    rebuild only re-emits bundles whose sources changed (or whose output was touched).
+    """
+
+    def __init__(self, out_dir: Path) -> None:
+        self.path = out_dir / BUNDLE_INDEX_FILENAME
+        self.entries: Dict[str, Dict[str, object]] = {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = {}
+        if isinstance(data, dict) and data.get("compiler") == COMPILER_VERSION:
+            bundles = data.get("bundles", {})
+            if isinstance(bundles, dict):
+                self.entries = bundles
+
+    def is_current(self, out_path: Path, sources: List[BundleSource]) -> bool:
+        entry = self.entries.get(out_path.name)
+        if not entry or entry.get("sources") != {src.label: src.sha256 for src in sources}:
+            return False
+        try:
+            return hashlib.sha256(out_path.read_bytes()).hexdigest() == entry.get("sha256")
+        except OSError:
+            return False
+
+    def record(self, out_path: Path, sources: List[BundleSource], data: bytes) -> None:
+        self.entries[out_path.name] = {
+            "sources": {src.label: src.sha256 for src in sources},
+            "sha256": hashlib.sha256(data).hexdigest(),
+            "bytes": len(data),
+        }
+
+    def save(self, keep: Set[str]) -> List[str]:
+        stale = sorted(name for name in self.entries if name not in keep)
+        for name in stale:
+            del self.entries[name]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"compiler": COMPILER_VERSION, "bundles": dict(sorted(self.entries.items()))}
+        replace_file(self.path, (json.dumps(payload, indent=2) + "\n").encode("utf-8"))
+        return stale
+
+
+def publish_artifact(index: BundleIndex, out_path: Path, sources: List[BundleSource], data: bytes) -> None:
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    replace_file(out_path, data)
+    index.record(out_path, sources, data)
+
+
+def emit_bundle(
+    index: BundleIndex, out_path: Path, title: str, fields: List[Tuple[str, str]], sources: List[BundleSource]
+) -> str:
+    if index.is_current(out_path, sources):
+        return f"unchanged {out_path}"
+    data = render_bundle(title, fields, sources).encode("utf-8")
+    publish_artifact(index, out_path, sources, data)
+    return f"wrote {out_path} ({len(data)} bytes, {len(sources)} docs)"
+
+
+def minify_manifest_text(text: str) -> str:
+    """
+    Drop YAML comments, blank lines, and trailing whitespace. parse_manifest() reads the
+    result exactly as it reads the source.
+    """
+    lines = [strip_inline_comment(raw) for raw in text.splitlines()]
+    return "\n".join(line for line in lines if line.strip()) + "\n"
+
+
+def compact_table_row(line: str) -> str:
+    if not line.endswith("|") or "\\|" in line or CODE_SPAN_PIPE_RE.search(line):
+        return line
+    cells = [c.strip() for c in line.strip().split("|")[1:-1]]
+    if cells and all(TABLE_SEPARATOR_CELL_RE.match(c) for c in cells):
+        cells = [re.sub(r"-+", "---", c) for c in cells]
+    return "|" + "|".join(cells) + "|"
+
+
+def minify_markdown_text(text: str) -> str:
+    """
+    Runtime variant of a markdown doc: trailing whitespace, blank-line runs, decorative
+    thematic breaks, whole-line HTML comments, and table cell padding are removed. Fenced
+    code blocks are copied verbatim; prose, emphasis, emoji, and hard line breaks (two
+    trailing spaces before a continuation line) are untouched.
+    """
+    out: List[str] = []
+    fence = ""
+    lines = text.splitlines()
+    for i, raw in enumerate(lines):
+        m = MARKDOWN_FENCE_RE.match(raw)
+        if fence:
+            out.append(raw)
+            if m and m.group(1) == fence:
+                fence = ""
+            continue
+        if m:
+            fence = m.group(1)
+            out.append(raw.rstrip())
+            continue
+        line = raw.rstrip()
+        if not line:
+            if out and out[-1]:
+                out.append("")
+            continue
+        # A break right under text would be a setext heading underline, and one on the first
+        # line opens front matter; only other standalone ones go.
+        if THEMATIC_BREAK_RE.match(line) and i > 0 and (not out or not out[-1]):
+            continue
+        if HTML_COMMENT_LINE_RE.match(line):
+            continue
+        if line.lstrip().startswith("|"):
+            line = compact_table_row(line)
+        elif raw.endswith("  ") and i + 1 < len(lines) and lines[i + 1].strip():
+            line += "  "
+        out.append(line)
+    while out and not out[-1]:
+        out.pop()
+    return "\n".join(out) + "\n"
+
+
+def verify_minified_runtime(
+    manifest_path: Path,
+    manifest: Dict[str, object],
+    docs: Dict[str, ParsedDoc],
+    min_manifest_text: str,
+    min_quickref: ParsedDoc,
+) -> List[str]:
+    """
+    Proof that minifying lost nothing the boot relies on: the manifest parses identically, every
+    emoji token and every must_preserve / must_preserve_runtime term present in the QuickRefCard
+    survives, and lint_manifest_contract_parity (strict) reports nothing new against the minified
+    pair. Returns the problems; an empty list means the variants may be published.
+    """
+    problems: List[str] = []
+    quickref = docs["quickref"]
+    if parse_manifest(min_manifest_text) != manifest:
+        problems.append(f"{manifest_path.name}: minified manifest does not parse to the same contract")
+
+    lost = Counter(emoji_sequence_tokens(quickref.text)) - Counter(emoji_sequence_tokens(min_quickref.text))
+    if lost:
+        problems.append(f"{quickref.path.name}: minified output lost emoji token(s): {''.join(sorted(lost.elements()))}")
+
+    for key in ("must_preserve", "must_preserve_runtime"):
+        items = manifest.get(key, [])
+        for item in items if isinstance(items, list) else []:
+            needle = item.strip().lower() if isinstance(item, str) else ""
+            if needle and needle in quickref.lower and needle not in min_quickref.lower:
+                problems.append(f"{quickref.path.name}: minified output lost {key} term '{item}'")
+
+    def parity_issues(parsed: Dict[str, object], role_docs: Dict[str, ParsedDoc]) -> Set[str]:
+        errs: List[str] = []
+        warns: List[str] = []
+        lint_manifest_contract_parity(manifest_path, parsed, role_docs, True, errs, warns)
+        # Positions legitimately move when bytes are removed; compare the findings themselves.
+        return {DOC_LOCATION_RE.sub("", issue) for issue in errs + warns}
+
+    before = parity_issues(manifest, docs)
+    after = parity_issues(parse_manifest(min_manifest_text), {**docs, "quickref": min_quickref})
+    problems.extend(f"{issue} (after minify)" for issue in sorted(after - before))
+    return problems
+
+
+def emit_minified_runtime(
+    index: BundleIndex, out_dir: Path, module: str, sources: List[BundleSource], errs: List[str]
+) -> Tuple[List[str], List[str]]:
+    """
+    Write <Module>_ModuleManifest.min.yaml and <Module>_QuickRefCard.min.md after
+    verify_minified_runtime() passes. Returns (report lines, published file names); a module
+    that fails verification publishes nothing and its problems go to errs.
+    """
+    by_role = {src.role: src for src in sources}
+    if "manifest" not in by_role or "quickref" not in by_role:
+        return [], []
+    targets = [
+        (out_dir / f"{module}_ModuleManifest.min.yaml", by_role["manifest"]),
+        (out_dir / f"{module}_QuickRefCard.min.md", by_role["quickref"]),
+    ]
+    # Parity depends on UserGuide / MachineManual too, so they key the outputs as well.
+    deps = [src for src in sources if src.role in BOOT_DOC_ROLES + ESCALATION_DOC_ROLES]
+    names = [out_path.name for out_path, _ in targets]
+    source_bytes = sum(len(src.data) for _, src in targets)
+    if all(index.is_current(out_path, deps) for out_path, _ in targets):
+        report = [f"unchanged {out_path}" for out_path, _ in targets]
+        min_bytes = sum(int(index.entries[name].get("bytes", 0)) for name in names)
+        report.append(format_minify_savings(module, source_bytes, min_bytes))
+        return report, names
+
+    manifest_text = by_role["manifest"].data.decode("utf-8", errors="replace")
+    min_manifest_text = minify_manifest_text(manifest_text)
+    docs = {
+        src.role: ParsedDoc(src.data.decode("utf-8", errors="replace"), src.path)
+        for src in sources
+        if src.role in ("quickref",) + ESCALATION_DOC_ROLES
+    }
+    min_quickref = ParsedDoc(minify_markdown_text(docs["quickref"].text), by_role["quickref"].path)
+    problems = verify_minified_runtime(
+        by_role["manifest"].path, parse_manifest(manifest_text), docs, min_manifest_text, min_quickref
+    )
+    if problems:
+        errs.extend(f"refusing to publish minified {module}: {problem}" for problem in problems)
+        return [], []
+
+    report: List[str] = []
+    min_bytes = 0
+    for (out_path, src), text in zip(targets, (min_manifest_text, min_quickref.text)):
+        data = text.encode("utf-8")
+        publish_artifact(index, out_path, deps, data)
+        min_bytes += len(data)
+        report.append(f"wrote {out_path} ({len(src.data)} -> {len(data)} bytes)")
+    report.append(format_minify_savings(module, source_bytes, min_bytes))
+    return report, names
+
+
+def format_minify_savings(module: str, source_bytes: int, min_bytes: int) -> str:
+    saved = source_bytes - min_bytes
+    return f"minified {module}: manifest + QuickRefCard {source_bytes} -> {min_bytes} bytes (saved {saved}, {saved * 100 / max(source_bytes, 1):.1f}%)"
+
+
+def default_registry_path(paths: List[Path]) -> Path:
+    return next((p for p in paths if p.is_dir()), Path(".")) / "KitRegistry" / "_CURRENT" / "KitRegistry.md"
+
+
+def collect_kit_sources(paths: List[Path], errs: List[str]) -> Dict[str, Tuple[str, List[BundleSource]]]:
+    """
+    Returns {module: (version, sources)} for every non-template _CURRENT kit under paths.
+    """
+    _, manifest_files = collect_files(paths, modulekit_only=True)
+    kits: Dict[str, Tuple[str, List[BundleSource]]] = {}
+    for mf in manifest_files:
+        module, version, sources = module_bundle_sources(mf, errs)
+        if is_template_manifest(mf, module):
+            continue
+        if not module:
+            errs.append(f"{mf}: missing 'module'")
+            continue
+        if module in kits:
+            errs.append(f"{mf}: duplicate module '{module}'")
+            continue
+        kits[module] = (version, sources)
+    return kits
+
+
+def load_boot_modules(
+    registry: Path, kits: Dict[str, Tuple[str, List[BundleSource]]], errs: List[str]
+) -> Tuple[Optional[BundleSource], List[str]]:
+    """
+    Returns (registry source, DefaultLoad=yes modules in registry order). Registry parsing is
+    BootTraceHarness's, so boot payloads agree with what the boot trace simulates.
+    """
+    if not registry.is_file():
+        errs.append(f"{registry}: KitRegistry not found (use --registry)")
+        return None, []
+    boottrace = load_boottrace_module()
+    registry_src = read_bundle_source(registry.name, registry, "registry")
+    modules: List[str] = []
+    for entry in boottrace.parse_registry_modules(registry_src.data.decode("utf-8", errors="replace")):
+        if entry.default_load != "yes":
+            continue
+        if entry.name not in kits:
+            errs.append(f"{registry.name}: DefaultLoad module '{entry.name}' has no local _CURRENT/ModuleManifest.yaml")
+            continue
+        modules.append(entry.name)
+    return registry_src, modules
+
+
+def cmd_build(
+    paths: List[Path], out_dir: Path, boot: bool = False, registry: Optional[Path] = None, minify: bool = False
+) -> int:
+    errs: List[str] = []
+    kits = collect_kit_sources(paths, errs)
+
+    boot_sources: List[BundleSource] = []
+    if boot:
+        registry_src, boot_modules = load_boot_modules(registry or default_registry_path(paths), kits, errs)
+        if registry_src is not None:
+            boot_sources.append(registry_src)
+        for module in boot_modules:
+            # Boot fetches only ModuleManifest + QuickRefCard (DevGuide 9.4).
+            for src in kits[module][1]:
+                if src.role in BOOT_DOC_ROLES:
+                    boot_sources.append(BundleSource(f"{module}/{src.label}", src.path, src.data, src.role))
+
+    if errs:
+        print("\n".join(errs))
+        return 1
+
+    index = BundleIndex(out_dir)
+    produced: Set[str] = set()
+    for module in sorted(kits):
+        version, sources = kits[module]
+        out_path = out_dir / f"{module}_BUNDLE.md"
+        print(emit_bundle(index, out_path, f"{module} Bundle", [("Bundle", module), ("Version", version)], sources))
+        produced.add(out_path.name)
+
+    if boot:
+        out_path = out_dir / BOOT_BUNDLE_FILENAME
+        print(emit_bundle(index, out_path, "Boot Bundle", [("Bundle", "Boot")], boot_sources))
+        produced.add(out_path.name)
+
+    if minify:
+        for module in sorted(kits):
+            report, names = emit_minified_runtime(index, out_dir, module, kits[module][1], errs)
+            if report:
+                print("\n".join(report))
+            produced.update(names)
+
+    # A refused minified variant is not kept around from an earlier build either.
+    for name in index.save(produced):
+        (out_dir / name).unlink(missing_ok=True)
+        print(f"removed stale {out_dir / name}")
+    if errs:
+        print("\n".join(errs))
+        return 1
+    return 0
+
+
+def approx_tokens(text: str) -> int:
+    """
+    Offline token estimate, no tokenizer dependency: one token per APPROX_CHARS_PER_TOKEN ASCII
+    characters, plus one per non-ASCII code point (emoji, variation selectors, arrows), which
+    BPE vocabularies rarely merge. Good for budgets and trends, not for exact billing.
+    """
+    ascii_chars = len(text.encode("ascii", errors="ignore"))
+    return -(-ascii_chars // APPROX_CHARS_PER_TOKEN) + (len(text) - ascii_chars)
+
+
+def payload_cost(sources: Iterable[BundleSource]) -> Tuple[int, int]:
+    nbytes = 0
+    tokens = 0
+    for src in sources:
+        nbytes += len(src.data)
+        tokens += approx_tokens(src.data.decode("utf-8", errors="replace"))
+    return nbytes, tokens
+
+
+def compute_boot_budget(
+    registry_src: BundleSource, boot_modules: List[str], kits: Dict[str, Tuple[str, List[BundleSource]]]
+) -> Dict[str, object]:
+    """
+    Payload sizes for the progressive-disclosure load path:
+    - boot set: KitRegistry plus ModuleManifest + QuickRefCard of every DefaultLoad module
+    - per module: its boot payload, its escalation payload (MachineManual + UserGuide), and the
+      peak context when it is escalated on top of the boot set
+    """
+    registry_bytes, registry_tokens = payload_cost([registry_src])
+    boot_set = set(boot_modules)
+    modules: List[Dict[str, object]] = []
+    boot_bytes, boot_tokens = registry_bytes, registry_tokens
+    for module in sorted(kits):
+        sources = kits[module][1]
+        b_bytes, b_tokens = payload_cost(src for src in sources if src.role in BOOT_DOC_ROLES)
+        e_bytes, e_tokens = payload_cost(src for src in sources if src.role in ESCALATION_DOC_ROLES)
+        if module in boot_set:
+            boot_bytes += b_bytes
+            boot_tokens += b_tokens
+        modules.append(
+            {
+                "module": module,
+                "default_load": module in boot_set,
+                "boot_bytes": b_bytes,
+                "boot_tokens": b_tokens,
+                "escalation_bytes": e_bytes,
+                "escalation_tokens": e_tokens,
+            }
+        )
+    for row in modules:
+        # A module outside the boot set is loaded (manifest + QuickRef) before it can escalate.
+        extra_bytes = 0 if row["default_load"] else row["boot_bytes"]
+        extra_tokens = 0 if row["default_load"] else row["boot_tokens"]
+        row["peak_bytes"] = boot_bytes + extra_bytes + row["escalation_bytes"]
+        row["peak_tokens"] = boot_tokens + extra_tokens + row["escalation_tokens"]
+    return {
+        "registry": {"path": str(registry_src.path), "bytes": registry_bytes, "tokens": registry_tokens},
+        "boot": {"modules": boot_modules, "bytes": boot_bytes, "tokens": boot_tokens},
+        "modules": modules,
+        "chars_per_token": APPROX_CHARS_PER_TOKEN,
+    }
+
+
+def check_budget_thresholds(
+    report: Dict[str, object],
+    max_boot_bytes: Optional[int],
+    max_boot_tokens: Optional[int],
+    max_module_tokens: Optional[int],
+    max_peak_tokens: Optional[int],
+) -> List[str]:
+    errs: List[str] = []
+    boot = report["boot"]
+    if max_boot_bytes is not None and boot["bytes"] > max_boot_bytes:
+        errs.append(f"boot set: {boot['bytes']} bytes exceeds budget {max_boot_bytes} (--max-boot-bytes)")
+    if max_boot_tokens is not None and boot["tokens"] > max_boot_tokens:
+        errs.append(f"boot set: ~{boot['tokens']} tokens exceeds budget {max_boot_tokens} (--max-boot-tokens)")
+    for row in report["modules"]:
+        if max_module_tokens is not None and row["boot_tokens"] > max_module_tokens:
+            errs.append(
+                f"{row['module']}: boot payload ~{row['boot_tokens']} tokens exceeds budget {max_module_tokens} (--max-module-tokens)"
+            )
+        if max_peak_tokens is not None and row["peak_tokens"] > max_peak_tokens:
+            errs.append(
+                f"{row['module']}: escalated context ~{row['peak_tokens']} tokens exceeds budget {max_peak_tokens} (--max-peak-tokens)"
+            )
+    return errs
+
+
+def format_budget_report(report: Dict[str, object]) -> str:
+    header = ("Module", "Boot", "bytes", "~tokens", "+Escalation", "~tokens", "Peak ~tokens")
+    rows = [
+        (
+            row["module"],
+            "yes" if row["default_load"] else "no",
+            str(row["boot_bytes"]),
+            str(row["boot_tokens"]),
+            str(row["escalation_bytes"]),
+            str(row["escalation_tokens"]),
+            str(row["peak_tokens"]),
+        )
+        for row in report["modules"]
+    ]
+    widths = [max(len(r[i]) for r in [header] + rows) for i in range(len(header))]
+    lines = []
+    for r in [header] + rows:
+        cells = [r[0].ljust(widths[0]), r[1].ljust(widths[1])] + [c.rjust(w) for c, w in zip(r[2:], widths[2:])]
+        lines.append("  ".join(cells).rstrip())
+    registry = report["registry"]
+    boot = report["boot"]
+    lines.append("")
+    lines.append(f"Registry: {registry['bytes']} bytes, ~{registry['tokens']} tokens ({registry['path']})")
+    lines.append(
+        f"Boot set: registry + {len(boot['modules'])} DefaultLoad module(s) = {boot['bytes']} bytes, ~{boot['tokens']} tokens"
+    )
+    lines.append(f"Tokens are approximate (~{report['chars_per_token']} ASCII chars/token, 1 per non-ASCII code point).")
+    return "\n".join(lines)
+
+
+def cmd_budget(
+    paths: List[Path],
+    registry: Optional[Path] = None,
+    fmt: str = "text",
+    max_boot_bytes: Optional[int] = None,
+    max_boot_tokens: Optional[int] = None,
+    max_module_tokens: Optional[int] = None,
+    max_peak_tokens: Optional[int] = None,
+) -> int:
+    errs: List[str] = []
+    kits = collect_kit_sources(paths, errs)
+    registry_src, boot_modules = load_boot_modules(registry or default_registry_path(paths), kits, errs)
+    if registry_src is None:
+        print("\n".join(errs))
+        return 1
+
+    report = compute_boot_budget(registry_src, boot_modules, kits)
+    errs.extend(check_budget_thresholds(report, max_boot_bytes, max_boot_tokens, max_module_tokens, max_peak_tokens))
+    if fmt == "json":
+        report["errors"] = errs
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print(format_budget_report(report))
+        if errs:
+            print("\n".join(errs))
+    return 1 if errs else 0
+
+
+@dataclass
+class GoldenPrompt:
+    module: str
+    id: str
+    kind: str
+    prompt: str
+    must_include: List[str]
+    must_not_include: List[str]
+    shape: Optional["re.Pattern[str]"]
+    context: str
+    line: int
+
+
+def load_golden_prompts(path: Path, module: str, errs: List[str]) -> List[GoldenPrompt]:
+    """
+    Parses a GoldenPrompts.jsonl corpus. Each line is one object:
+    {"id", "kind", "prompt", "must_include": [...], "must_not_include": [...], "shape": regex, "context": "boot"|"full"};
+    the constraint lists, shape, and context (default "full") are optional.
+    """
+    prompts: List[GoldenPrompt] = []
+    seen: Set[str] = set()
+    for line_no, raw in enumerate(read_text(path).splitlines(), start=1):
+        if not raw.strip():
+            continue
+        where = f"{path}:{line_no}"
+        try:
+            item = json.loads(raw)
+        except ValueError as exc:
+            errs.append(f"{where}: invalid JSON ({exc})")
+            continue
+        if not isinstance(item, dict):
+            errs.append(f"{where}: expected a JSON object")
+            continue
+        prompt_id = item.get("id")
+        kind = item.get("kind")
+        text = item.get("prompt")
+        context = item.get("context", "full")
+        lists = {key: item.get(key, []) for key in ("must_include", "must_not_include")}
+        if not isinstance(prompt_id, str) or not prompt_id.strip():
+            errs.append(f"{where}: missing 'id'")
+            continue
+        if prompt_id in seen:
+            errs.append(f"{where}: duplicate id '{prompt_id}'")
+            continue
+        seen.add(prompt_id)
+        if kind not in GOLDEN_PROMPT_MIN_KINDS:
+            errs.append(f"{where}: {prompt_id}: kind must be one of {', '.join(GOLDEN_PROMPT_MIN_KINDS)}")
+            continue
+        if not isinstance(text, str) or not text.strip():
+            errs.append(f"{where}: {prompt_id}: missing 'prompt'")
+            continue
+        if context not in GOLDEN_PROMPT_CONTEXTS:
+            errs.append(f"{where}: {prompt_id}: context must be one of {', '.join(GOLDEN_PROMPT_CONTEXTS)}")
+            continue
+        bad = [key for key, terms in lists.items() if not isinstance(terms, list) or not all(isinstance(t, str) for t in terms)]
+        if bad:
+            errs.append(f"{where}: {prompt_id}: {', '.join(bad)} must be a list of strings")
+            continue
+        shape = None
+        if item.get("shape") is not None:
+            try:
+                shape = re.compile(str(item["shape"]), re.MULTILINE)
+            except re.error as exc:
+                errs.append(f"{where}: {prompt_id}: invalid shape regex ({exc})")
+                continue
+        prompts.append(
+            GoldenPrompt(
+                module, prompt_id, kind, text, lists["must_include"], lists["must_not_include"], shape, context, line_no
+            )
+        )
+    return prompts
+
+
+def golden_corpus_coverage(path: Path, prompts: List[GoldenPrompt]) -> List[str]:
+    counts = Counter(prompt.kind for prompt in prompts)
+    short = [f"{kind} {counts[kind]}/{need}" for kind, need in GOLDEN_PROMPT_MIN_KINDS.items() if counts[kind] < need]
+    if not short:
+        return []
+    return [f"{path}: corpus below the DevGuide 10.3 minimum ({', '.join(short)})"]
+
+
+def normalize_regress_text(text: str) -> str:
+    # Same variation-selector equivalence as strict lint (`🖨️` == `🖨`), and case-insensitive.
+    return VARIATION_SELECTOR_RE.sub("", text).casefold()
+
+
+def evaluate_golden_response(prompt: GoldenPrompt, response: str) -> List[str]:
+    norm = normalize_regress_text(response)
+    failures = [f"missing must_include '{term}'" for term in prompt.must_include if normalize_regress_text(term) not in norm]
+    failures.extend(
+        f"contains must_not_include '{term}'" for term in prompt.must_not_include if normalize_regress_text(term) in norm
+    )
+    if prompt.shape is not None and not prompt.shape.search(response):
+        failures.append(f"output shape /{prompt.shape.pattern}/ not matched")
+    return failures
+
+
+def regress_cache_key(model: str, system_digest: str, prompt: str) -> str:
+    return hashlib.sha256(json.dumps([model, system_digest, prompt], ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class RegressCache:
+    """
+    Model responses keyed by (model id, digest of the system message, prompt text). The system
+    message is the rendered bundle, so it covers the docs in context as well as the compiler
+    version and bundle format; after a doc edit only prompts against that module are sent again.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.responses: Dict[str, str] = {}
+        self.touched: Set[str] = set()
+
+    @classmethod
+    def load(cls, path: Path) -> "RegressCache":
+        cache = cls(path)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cache
+        if isinstance(data, dict) and isinstance(data.get("responses"), dict):
+            cache.responses = data["responses"]
+        return cache
+
+    def get(self, key: str) -> Optional[str]:
+        hit = self.responses.get(key)
+        if hit is not None:
+            self.touched.add(key)
+        return hit
+
+    def put(self, key: str, response: str) -> None:
+        self.responses[key] = response
+        self.touched.add(key)
+
+    def save(self) -> None:
+        responses = {key: self.responses[key] for key in self.touched if key in self.responses}
+        for key, value in self.responses.items():
+            if len(responses) >= REGRESS_CACHE_MAX_ENTRIES:
+                break
+            responses.setdefault(key, value)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        replace_file(self.path, json.dumps({"responses": responses}, ensure_ascii=False).encode("utf-8"))
+
+
+def request_chat_completion(
+    endpoint: str, model: str, api_key: str, system: str, prompt: str, timeout: float, retries: int
+) -> str:
+    body = {
+        "model": model,
+        "temperature": 0,
+        "messages": [{"role": "system", "content": system}, {"role": "user", "content": prompt}],
+    }
+    headers = {"Content-Type": "application/json"}
+    if api_key:
+        headers["Authorization"] = f"Bearer {api_key}"
+    request = Request(
+        endpoint.rstrip("/") + "/chat/completions", data=json.dumps(body).encode("utf-8"), headers=headers, method="POST"
+    )
+    for attempt in range(retries + 1):
+        try:
+            with urlopen(request, timeout=timeout) as resp:
+                data = json.loads(resp.read().decode("utf-8"))
+            break
+        except HTTPError as exc:
+            if exc.code not in REGRESS_RETRY_STATUSES or attempt == retries:
+                raise
+            time.sleep(2**attempt)
+    content = data["choices"][0]["message"]["content"]
+    if not isinstance(content, str):
+        raise ValueError("response has no message content")
+    return content
+
+
+def cmd_regress(
+    paths: List[Path],
+    endpoint: str = REGRESS_DEFAULT_ENDPOINT,
+    model: str = REGRESS_DEFAULT_MODEL,
+    api_key: str = "",
+    jobs: int = 8,
+    cache_dir: Optional[Path] = None,
+    modules: Optional[List[str]] = None,
+    strict: bool = False,
+    timeout: float = 120.0,
+    retries: int = 2,
+    fmt: str = "text",
+) -> int:
+    start = time.perf_counter()
+    errs: List[str] = []
+    warns: List[str] = []
+    kits = collect_kit_sources(paths, errs)
+    wanted = set(modules or kits)
+    for module in sorted(wanted - set(kits)):
+        errs.append(f"{module}: no _CURRENT kit found under {', '.join(str(p) for p in paths)}")
+
+    # (prompt, corpus path, cache key, system text)
+    cases: List[Tuple[GoldenPrompt, Path, str, str]] = []
+    for module in sorted(wanted & set(kits)):
+        version, sources = kits[module]
+        corpus = sources[0].path.parent / GOLDEN_PROMPTS_FILENAME
+        if not corpus.is_file():
+            route_issue(f"{module}: no {GOLDEN_PROMPTS_FILENAME} golden-prompt corpus (DevGuide 10.3)", strict, errs, warns)
+            continue
+        prompts = load_golden_prompts(corpus, module, errs)
+        for msg in golden_corpus_coverage(corpus, prompts):
+            route_issue(msg, strict, errs, warns)
+        contexts: Dict[str, Tuple[str, str]] = {}
+        for name, roles in GOLDEN_PROMPT_CONTEXTS.items():
+            selected = [src for src in sources if src.role in roles]
+            # The system message is the module bundle as `build` writes it, limited to the context's docs.
+            system = render_bundle(f"{module} Bundle", [("Bundle", module), ("Version", version)], selected)
+            # Key on exactly what the model sees: the docs digest plus the version and header format.
+            contexts[name] = (hashlib.sha256(system.encode("utf-8")).hexdigest(), system)
+        for prompt in prompts:
+            digest, system = contexts[prompt.context]
+            cases.append((prompt, corpus, regress_cache_key(model, digest, prompt.prompt), system))
+
+    cache = RegressCache.load(cache_dir / REGRESS_CACHE_FILENAME) if cache_dir is not None else None
+    responses: Dict[str, str] = {}
+    failed_requests: Dict[str, str] = {}
+    pending: Dict[str, Tuple[str, str]] = {}
+    for prompt, _, key, system in cases:
+        hit = cache.get(key) if cache is not None else None
+        if hit is not None:
+            responses[key] = hit
+        else:
+            pending.setdefault(key, (system, prompt.prompt))
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            futures = {
+                key: pool.submit(request_chat_completion, endpoint, model, api_key, system, text, timeout, retries)
+                for key, (system, text) in pending.items()
+            }
+            for key, future in futures.items():
+                try:
+                    responses[key] = future.result()
+                except (OSError, ValueError, LookupError, TypeError) as exc:
+                    failed_requests[key] = f"{type(exc).__name__}: {exc}"
+                    continue
+                if cache is not None:
+                    cache.put(key, responses[key])
+    if cache is not None:
+        cache.save()
+
+    results: List[Dict[str, object]] = []
+    failed = 0
+    for prompt, corpus, key, _ in cases:
+        where = f"{corpus}:{prompt.line}: {prompt.id} ({prompt.kind})"
+        if key in failed_requests:
+            failures = [f"request failed: {failed_requests[key]}"]
+        else:
+            failures = evaluate_golden_response(prompt, responses[key])
+        if failures:
+            failed += 1
+            errs.extend(f"{where}: {failure}" for failure in failures)
+        results.append(
+            {
+                "module": prompt.module,
+                "id": prompt.id,
+                "kind": prompt.kind,
+                "cached": key not in pending,
+                "passed": not failures,
+                "failures": failures,
+                "response": responses.get(key),
+            }
+        )
+
+    summary = {
+        "prompts": len(cases),
+        "modules": len({prompt.module for prompt, _, _, _ in cases}),
+        "cached": sum(1 for row in results if row["cached"]),
+        "sent": len(pending),
+        "failed": failed,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+    if fmt == "json":
+        print(json.dumps({"summary": summary, "results": results, "errors": errs, "warnings": warns}, ensure_ascii=False, indent=2))
+    else:
+        if warns:
+            print("\n".join(f"WARN: {w}" for w in warns))
+        if errs:
+            print("\n".join(errs))
+        print(
+            f"regress: {summary['prompts']} prompt(s) in {summary['modules']} module(s), "
+            f"{summary['cached']} cached, {summary['sent']} sent to {model}, {failed} failed ({summary['seconds']:.2f}s)"
+        )
+    return 1 if errs else 0
+
+
+def normalize_address_token(token: str) -> str:
+    # `🖨️` and `🖨` address the same module; names and ASCII aliases are case-insensitive.
+    return VARIATION_SELECTOR_RE.sub("", token).strip().lower()
+
+
+def registry_doc_local_path(url: str, root: Path) -> Optional[Path]:
+    """
+    Map a registry doc URL (`.../<Module>/_CURRENT/<DocFile>`) onto the local checkout at root.
+    """
+    parts = [part for part in urlsplit(url).path.split("/") if part]
+    if "_CURRENT" not in parts:
+        return None
+    i = parts.index("_CURRENT")
+    if i == 0:
+        return None
+    return root.joinpath(*parts[i - 1 :])
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as fh:
+        for chunk in iter(partial(fh.read, SCAN_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def registry_index_is_current(index: Dict[str, object], registry_sha: str, root: Path) -> bool:
+    if index.get("schema") != REGISTRY_INDEX_SCHEMA or index.get("compiler") != COMPILER_VERSION:
+        return False
+    if index.get("registry", {}).get("sha256") != registry_sha:
+        return False
+    for module in index.get("modules", {}).values():
+        for doc in module.get("docs", {}).values():
+            rel = doc.get("path")
+            local = root / rel if rel else None
+            current = file_sha256(local) if local and local.is_file() else None
+            if current != doc.get("sha256"):
+                return False
+    return True
+
+
+def compile_registry_index(registry: Path, root: Path) -> Dict[str, object]:
+    """
+    Full KitRegistry index: every §1 schema field per module, address maps keyed by
+    normalize_address_token (values list every module claiming the token, so collisions
+    stay visible), and sha256 of each referenced doc found in the local checkout.
+    """
+    boottrace = load_boottrace_module()
+    data = registry.read_bytes()
+    text = data.decode("utf-8", errors="replace")
+    entries = boottrace.parse_registry_modules(text)
+
+    modules: Dict[str, Dict[str, object]] = {}
+    emoji_map: Dict[str, List[str]] = {}
+    alias_map: Dict[str, List[str]] = {}
+    for entry in entries:
+        docs: Dict[str, Dict[str, Optional[str]]] = {}
+        for key in boottrace.DOC_KEYS:
+            url = entry.docs.get(key, "")
+            if not url:
+                continue
+            local = registry_doc_local_path(url, root)
+            found = local is not None and local.is_file()
+            docs[key] = {
+                "url": url,
+                "path": local.relative_to(root).as_posix() if found else None,
+                "sha256": file_sha256(local) if found else None,
+            }
+        modules[entry.name] = {
+            "module": entry.name,
+            "emoji": entry.emoji,
+            "aliases": entry.aliases,
+            "mission": entry.mission,
+            "engage_policy": entry.engage_policy,
+            "need_signals": entry.need_signals,
+            "auto_run_scope": entry.auto_run_scope,
+            "default_load": entry.default_load == "yes",
+            "single_emoji_activate": entry.single_emoji_activate == "yes",
+            "docs": docs,
+            "version": entry.version,
+            "compatibility": entry.compatibility,
+        }
+        if entry.emoji:
+            claims = emoji_map.setdefault(normalize_address_token(entry.emoji), [])
+            if entry.name not in claims:
+                claims.append(entry.name)
+        for token in [entry.name, entry.emoji] + entry.aliases:
+            if not token:
+                continue
+            claims = alias_map.setdefault(normalize_address_token(token), [])
+            if entry.name not in claims:
+                claims.append(entry.name)
+
+    return {
+        "schema": REGISTRY_INDEX_SCHEMA,
+        "compiler": COMPILER_VERSION,
+        "registry": {
+            "path": registry.resolve().relative_to(root.resolve()).as_posix()
+            if registry.resolve().is_relative_to(root.resolve())
+            else str(registry),
+            "sha256": hashlib.sha256(data).hexdigest(),
+            "version": parse_meta(text).get("Version", ""),
+        },
+        "order": [entry.name for entry in entries],
+        "default_load": [entry.name for entry in entries if entry.default_load == "yes"],
+        "emoji": emoji_map,
+        "aliases": alias_map,
+        "modules": modules,
+    }
+
+
+def cmd_index(registry: Path, out_path: Path, root: Optional[Path] = None) -> int:
+    if not registry.is_file():
+        print(f"{registry}: KitRegistry not found")
+        return 1
+    # KitRegistry/_CURRENT/KitRegistry.md sits two levels below the kits root.
+    root = root or registry.resolve().parents[2]
+    registry_sha = file_sha256(registry)
+
+    try:
+        existing = json.loads(out_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        existing = None
+    if isinstance(existing, dict) and registry_index_is_current(existing, registry_sha, root):
+        print(f"unchanged {out_path}")
+        return 0
+
+    index = compile_registry_index(registry, root)
+    data = json.dumps(index, ensure_ascii=False, separators=(",", ":")) + "\n"
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    replace_file(out_path, data.encode("utf-8"))
+
+    for token, claims in index["emoji"].items():
+        if len(claims) > 1:
+            print(f"WARN: emoji {token} is claimed by {', '.join(claims)}")
+    missing = [
+        f"{name}.{key}" for name, module in index["modules"].items() for key, doc in module["docs"].items() if not doc["sha256"]
+    ]
+    if missing:
+        print(f"WARN: no local file for {', '.join(missing)}")
+    print(f"wrote {out_path} ({len(index['modules'])} modules, {len(data.encode('utf-8'))} bytes)")
+    return 0
+
+
+def add_git_source_args(parser: argparse.ArgumentParser) -> None:
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--staged", action="store_true", help="read inputs from the git index (what would be committed)")
+    group.add_argument("--rev", metavar="COMMIT", help="read inputs from this git commit instead of the working tree")
+
+
+def main() -> int:
+    # Library code raises GitError so importers can recover; the CLI reports it and exits.
+    try:
+        return run_cli()
+    except GitError as exc:
+        raise SystemExit(str(exc)) from None
+
+
+def run_cli() -> int:
+    ap = argparse.ArgumentParser(prog="modulemill")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    ap_lint = sub.add_parser("lint", help="lint ModuleKit docs")
+    ap_lint.add_argument("paths", nargs="+", help="file(s) or folder(s)")
+    ap_lint.add_argument(
+        "--strict",
+        action="store_true",
+        help="enforce metadata and stronger checks, including warning escalations",
     )
     ap_lint.add_argument(
         "--require-manifest",
@@ -961,22 +4538,340 @@ def main() -> int:
         action="store_true",
         help="lint only canonical ModuleKit artifacts under *_CURRENT (Install/QuickRefCard/MachineManual/UserGuide/ModuleManifest)",
     )
+    ap_lint.add_argument(
+        "--no-ignore",
+        action="store_true",
+        help="walk every directory, including .git, virtualenvs, node_modules, and .gitignore'd paths",
+    )
+    ap_lint.add_argument(
+        "--git-ls-files",
+        action="store_true",
+        help="take inputs from `git ls-files` (tracked plus untracked, non-ignored) under the given paths instead of walking",
+    )
+    add_git_source_args(ap_lint)
+    ap_lint.add_argument(
+        "--since",
+        metavar="REV",
+        help="lint only kits with files changed since the merge base of REV and HEAD (plus uncommitted and untracked "
+        "changes); a changed KitRegistry or global-instructions file also lints all of those",
+    )
+    ap_lint.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="lint kits in N worker processes (default: 1; 0 = one per CPU)",
+    )
+    ap_lint.add_argument(
+        "--cache",
+        action="store_true",
+        help="reuse results for unchanged files from an on-disk content-hash cache",
+    )
+    ap_lint.add_argument(
+        "--cache-dir",
+        default=LINT_CACHE_DEFAULT_DIR,
+        help=f"lint cache directory used with --cache (default: {LINT_CACHE_DEFAULT_DIR})",
+    )
+    ap_lint.add_argument(
+        "--watch",
+        action="store_true",
+        help="keep running and re-lint only files affected by each change, printing a diff of results",
+    )
+    ap_lint.add_argument(
+        "--watch-interval",
+        type=float,
+        default=1.0,
+        help="seconds between file polls in --watch mode (default: 1.0)",
+    )
+    ap_lint.add_argument(
+        "--format",
+        choices=("text", "ndjson"),
+        default="text",
+        help="report format: text lines, or one JSON diagnostic object per line (default: text)",
+    )
+    ap_lint.add_argument(
+        "--shard",
+        type=parse_lint_shard,
+        metavar="i/N",
+        help=f"lint only the kits a stable hash of their path assigns to shard i of N (KitRegistry and global "
+        f"instructions go to shard {LINT_SHARD_GLOBAL}) and write a result file for `modulemill merge`",
+    )
+    ap_lint.add_argument(
+        "--shard-result",
+        metavar="PATH",
+        help=f"--shard result file (default: {LINT_SHARD_RESULT_TEMPLATE.format(index='<i>', count='<N>')})",
+    )
+    stop = ap_lint.add_mutually_exclusive_group()
+    stop.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="stop at the first error (same as --max-errors 1)",
+    )
+    stop.add_argument(
+        "--max-errors",
+        type=int,
+        metavar="N",
+        help="stop after N errors; remaining files, including queued --jobs work, are skipped",
+    )
+    ap_lint.add_argument(
+        "--profile",
+        action="store_true",
+        help="report per-rule wall time, calls, and bytes scanned plus the slowest files (on stderr)",
+    )
+    ap_lint.add_argument(
+        "--profile-format",
+        choices=("text", "json"),
+        default="text",
+        help="--profile output format (default: text)",
+    )
+    ap_lint.add_argument(
+        "--profile-top",
+        type=int,
+        default=10,
+        help="number of slowest files listed by --profile (default: 10)",
+    )
+    ap_lint.add_argument(
+        "--profile-trace",
+        help="also write a Chrome trace-event JSON file (chrome://tracing, Perfetto) when profiling",
+    )
+
+    ap_merge = sub.add_parser("merge", help="combine `lint --shard` result files into one lint report")
+    ap_merge.add_argument("results", nargs="+", help="one result file per shard")
+    ap_merge.add_argument(
+        "--format",
+        choices=("text", "ndjson"),
+        default="text",
+        help="report format, as for lint (default: text)",
+    )
 
     ap_ext = sub.add_parser("extract", help="extract section by heading prefix")
-    ap_ext.add_argument("path", help="markdown file")
-    ap_ext.add_argument("--section", required=True, help="heading title prefix, e.g. '3.2'")
+    ap_ext.add_argument("path", nargs="?", help="markdown file")
+    ap_ext.add_argument("--section", help="heading title prefix, e.g. '3.2'")
+    ap_ext.add_argument(
+        "--batch",
+        action="store_true",
+        help='read JSONL {"path": ..., "section": ...} requests from stdin and write one JSON result per line',
+    )
+    ap_ext.add_argument(
+        "--serve",
+        metavar="ADDRESS",
+        help="run a local extract daemon speaking the --batch protocol on a Unix socket path or 127.0.0.1:PORT",
+    )
+    ap_ext.add_argument(
+        "--serve-root",
+        metavar="DIR",
+        default=".",
+        help="with --serve, refuse docs that resolve outside DIR (default: current directory)",
+    )
+    ap_ext.add_argument(
+        "--mmap",
+        action="store_true",
+        help=f"read only the section's byte range via mmap (default for docs >= {MMAP_EXTRACT_MIN_BYTES // (1024 * 1024)} MiB)",
+    )
+    ap_ext.add_argument(
+        "--sidecar",
+        action="store_true",
+        help=f"reuse or write a hash-validated <doc>{HEADING_SIDECAR_SUFFIX} heading offset index next to the doc (implies --mmap)",
+    )
+    add_git_source_args(ap_ext)
+
+    ap_lsp = sub.add_parser("lsp", help="run a Language Server Protocol server on stdio (lint diagnostics as you edit)")
+    ap_lsp.add_argument("--strict", action="store_true", help="same rules as lint --strict")
+    ap_lsp.add_argument("--require-manifest", action="store_true", help="same as lint --require-manifest")
+
+    ap_build = sub.add_parser("build", help="write deterministic per-module doc bundles (derived artifacts)")
+    ap_build.add_argument("paths", nargs="+", help="folder(s) containing <Module>/_CURRENT kits")
+    ap_build.add_argument(
+        "--out",
+        default=BUILD_DEFAULT_OUT_DIR,
+        help=f"output directory, outside any _CURRENT folder (default: {BUILD_DEFAULT_OUT_DIR})",
+    )
+    ap_build.add_argument(
+        "--boot",
+        action="store_true",
+        help=f"also write {BOOT_BUNDLE_FILENAME}: KitRegistry plus Manifest + QuickRefCard of every DefaultLoad=yes module",
+    )
+    ap_build.add_argument(
+        "--registry",
+        help="KitRegistry.md used by --boot (default: <first path>/KitRegistry/_CURRENT/KitRegistry.md)",
+    )
+    ap_build.add_argument(
+        "--minify",
+        action="store_true",
+        help="also write <Module>_ModuleManifest.min.yaml and <Module>_QuickRefCard.min.md runtime variants, "
+        "published only if parity, invariant, and emoji checks still pass on them",
+    )
+
+    ap_budget = sub.add_parser("budget", help="report boot / escalation payload bytes and approximate tokens")
+    ap_budget.add_argument("paths", nargs="+", help="folder(s) containing <Module>/_CURRENT kits")
+    ap_budget.add_argument(
+        "--registry",
+        help="KitRegistry.md (default: <first path>/KitRegistry/_CURRENT/KitRegistry.md)",
+    )
+    ap_budget.add_argument("--format", choices=("text", "json"), default="text", help="report format (default: text)")
+    ap_budget.add_argument("--max-boot-bytes", type=int, help="fail when the boot set exceeds this many bytes")
+    ap_budget.add_argument("--max-boot-tokens", type=int, help="fail when the boot set exceeds this many approximate tokens")
+    ap_budget.add_argument(
+        "--max-module-tokens",
+        type=int,
+        help="fail when one module's boot payload (ModuleManifest + QuickRefCard) exceeds this many approximate tokens",
+    )
+    ap_budget.add_argument(
+        "--max-peak-tokens",
+        type=int,
+        help="fail when boot set + one escalated module (MachineManual + UserGuide) exceeds this many approximate tokens",
+    )
+
+    ap_regress = sub.add_parser("regress", help="run golden-prompt corpora against an OpenAI-compatible endpoint")
+    ap_regress.add_argument("paths", nargs="+", help="folder(s) containing <Module>/_CURRENT kits")
+    ap_regress.add_argument(
+        "--endpoint",
+        default=REGRESS_DEFAULT_ENDPOINT,
+        help=f"OpenAI-compatible base URL; /chat/completions is appended (default: {REGRESS_DEFAULT_ENDPOINT})",
+    )
+    ap_regress.add_argument("--model", default=REGRESS_DEFAULT_MODEL, help=f"model id (default: {REGRESS_DEFAULT_MODEL})")
+    ap_regress.add_argument(
+        "--api-key-env",
+        default=REGRESS_API_KEY_ENV,
+        help=f"environment variable holding the bearer token, if any (default: {REGRESS_API_KEY_ENV})",
+    )
+    ap_regress.add_argument("--module", action="append", help="only run this module's corpus (repeatable)")
+    ap_regress.add_argument("--jobs", "-j", type=int, default=8, help="concurrent requests (default: 8)")
+    ap_regress.add_argument("--timeout", type=float, default=120.0, help="seconds per request (default: 120)")
+    ap_regress.add_argument(
+        "--retries", type=int, default=2, help="retries on HTTP 429/5xx, with backoff (default: 2)"
+    )
+    ap_regress.add_argument(
+        "--cache-dir",
+        default=LINT_CACHE_DEFAULT_DIR,
+        help=f"response cache directory (default: {LINT_CACHE_DEFAULT_DIR})",
+    )
+    ap_regress.add_argument("--no-cache", action="store_true", help="send every prompt and do not update the cache")
+    ap_regress.add_argument(
+        "--strict",
+        action="store_true",
+        help="treat a missing corpus or one below the DevGuide 10.3 prompt mix as an error",
+    )
+    ap_regress.add_argument("--format", choices=("text", "json"), default="text", help="report format (default: text)")
+
+    ap_index = sub.add_parser("index", help="compile KitRegistry.md into a JSON lookup index")
+    ap_index.add_argument(
+        "registry",
+        nargs="?",
+        default=DEFAULT_REGISTRY_PATH,
+        help=f"KitRegistry.md path (default: {DEFAULT_REGISTRY_PATH})",
+    )
+    ap_index.add_argument(
+        "--out",
+        default=REGISTRY_INDEX_DEFAULT_PATH,
+        help=f"index JSON path (default: {REGISTRY_INDEX_DEFAULT_PATH})",
+    )
+    ap_index.add_argument(
+        "--root",
+        help="kits root used to resolve doc URLs to local files (default: two levels above the registry's folder)",
+    )
 
     args = ap.parse_args()
 
+    if args.cmd == "lint" and args.max_errors is not None and args.max_errors < 1:
+        ap_lint.error("--max-errors must be >= 1")
+    if args.cmd == "lint" and args.watch and (args.fail_fast or args.max_errors is not None or args.format != "text"):
+        ap_lint.error("--fail-fast, --max-errors, and --format ndjson cannot be combined with --watch")
+    if args.cmd == "lint" and args.shard_result and not args.shard:
+        ap_lint.error("--shard-result requires --shard")
+    if args.cmd == "lint" and args.watch and args.shard:
+        ap_lint.error("--shard cannot be combined with --watch")
+    if args.cmd == "lint" and args.watch and args.since:
+        ap_lint.error("--since cannot be combined with --watch")
+    if args.cmd == "lint" and (args.staged or args.rev) and (args.watch or args.since or args.git_ls_files):
+        ap_lint.error("--staged/--rev cannot be combined with --watch, --since, or --git-ls-files")
+    if args.cmd == "extract" and (args.staged or args.rev) and (args.batch or args.serve):
+        ap_ext.error("--staged/--rev cannot be combined with --batch or --serve")
+    if args.cmd == "lint" and args.watch:
+        return cmd_lint_watch(
+            [Path(x) for x in args.paths],
+            strict=args.strict,
+            require_manifest=args.require_manifest,
+            modulekit_only=args.modulekit_only,
+            jobs=args.jobs or os.cpu_count() or 1,
+            interval=args.watch_interval,
+            respect_ignores=not args.no_ignore,
+            git_ls_files=args.git_ls_files,
+        )
     if args.cmd == "lint":
         return cmd_lint(
             [Path(x) for x in args.paths],
             strict=args.strict,
             require_manifest=args.require_manifest,
             modulekit_only=args.modulekit_only,
+            jobs=args.jobs or os.cpu_count() or 1,
+            cache_dir=Path(args.cache_dir) if args.cache else None,
+            profile=args.profile or bool(args.profile_trace),
+            profile_format=args.profile_format,
+            profile_top=args.profile_top,
+            profile_trace=Path(args.profile_trace) if args.profile_trace else None,
+            respect_ignores=not args.no_ignore,
+            git_ls_files=args.git_ls_files,
+            since=args.since,
+            rev=args.rev,
+            staged=args.staged,
+            fmt=args.format,
+            max_errors=1 if args.fail_fast else args.max_errors or 0,
+            shard=args.shard,
+            shard_result=(
+                Path(args.shard_result or LINT_SHARD_RESULT_TEMPLATE.format(index=args.shard[0], count=args.shard[1]))
+                if args.shard
+                else None
+            ),
         )
+    if args.cmd == "merge":
+        return cmd_merge([Path(x) for x in args.results], fmt=args.format)
     if args.cmd == "extract":
-        return cmd_extract(Path(args.path), args.section)
+        if args.serve:
+            return cmd_extract_serve(args.serve, Path(args.serve_root))
+        if args.batch:
+            return cmd_extract_batch(sys.stdin)
+        if not args.path or args.section is None:
+            ap_ext.error("path and --section are required unless --batch or --serve is given")
+        return cmd_extract(
+            Path(args.path), args.section, use_mmap=args.mmap, sidecar=args.sidecar, rev=args.rev, staged=args.staged
+        )
+    if args.cmd == "lsp":
+        return cmd_lsp(strict=args.strict, require_manifest=args.require_manifest)
+    if args.cmd == "index":
+        return cmd_index(Path(args.registry), Path(args.out), root=Path(args.root) if args.root else None)
+    if args.cmd == "budget":
+        return cmd_budget(
+            [Path(x) for x in args.paths],
+            registry=Path(args.registry) if args.registry else None,
+            fmt=args.format,
+            max_boot_bytes=args.max_boot_bytes,
+            max_boot_tokens=args.max_boot_tokens,
+            max_module_tokens=args.max_module_tokens,
+            max_peak_tokens=args.max_peak_tokens,
+        )
+    if args.cmd == "regress":
+        return cmd_regress(
+            [Path(x) for x in args.paths],
+            endpoint=args.endpoint,
+            model=args.model,
+            api_key=os.environ.get(args.api_key_env, ""),
+            jobs=args.jobs,
+            cache_dir=None if args.no_cache else Path(args.cache_dir),
+            modules=args.module,
+            strict=args.strict,
+            timeout=args.timeout,
+            retries=args.retries,
+            fmt=args.format,
+        )
+    if args.cmd == "build":
+        return cmd_build(
+            [Path(x) for x in args.paths],
+            out_dir=Path(args.out),
+            boot=args.boot,
+            registry=Path(args.registry) if args.registry else None,
+            minify=args.minify,
+        )
 
     return 2
 